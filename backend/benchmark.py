@@ -0,0 +1,259 @@
+"""End-to-end load benchmark for the backend.
+
+Drives /api/schema, /api/eligibility, /api/grade, /api/evaluate or /api/resume-kickoffs
+at a fixed concurrency and reports throughput, latency percentiles and how
+many calls reached the upstream crew. Run it against the fake crew so no
+CrewAI credits are spent:
+
+    uvicorn fake_crew:app --port 8010
+    SCHEMA_API_URL=http://127.0.0.1:8010 SCHEMA_API_TOKEN=x ... python main.py
+    python benchmark.py grade --requests 200 --concurrency 20 --fake-crew-url http://127.0.0.1:8010
+
+Save a run with --output and compare later runs against it with --baseline.
+"""
+import argparse
+import asyncio
+import json
+import math
+import statistics
+import sys
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+SCENARIOS = ("schema", "eligibility", "grade", "evaluate", "resume")
+
+SAMPLE_RUBRIC = """Innovation (15 points)
+- Novel approach to the problem (10 points)
+- Creative use of technology (5 points)
+
+Technical Implementation (15 points)
+- Code quality (10 points)
+- Technical complexity (5 points)"""
+
+SAMPLE_REQUIREMENTS = "Projects must be built during the hackathon and include a working demo."
+
+SAMPLE_WRITEUP = "We built a tool that summarizes lecture recordings into study notes using speech-to-text and an LLM."
+
+SAMPLE_JSON_RUBRIC = {
+    "type": "object",
+    "properties": {
+        "innovation": {
+            "type": "object",
+            "properties": {
+                "novel_approach": {"type": "integer", "minimum": 0, "maximum": 10},
+                "creative_use_of_technology": {"type": "integer", "minimum": 0, "maximum": 5},
+            },
+        },
+        "technical_implementation": {
+            "type": "object",
+            "properties": {
+                "code_quality": {"type": "integer", "minimum": 0, "maximum": 10},
+                "technical_complexity": {"type": "integer", "minimum": 0, "maximum": 5},
+            },
+        },
+    },
+}
+
+
+def build_request(scenario: str, index: int, run_id: str, repeat_inputs: bool, grade_delay: Optional[float] = 0.0) -> Tuple[str, Dict[str, Any]]:
+    """Path and body for one request; inputs are unique unless repeat_inputs"""
+    suffix = "" if repeat_inputs else f"\n\n(benchmark {run_id}-{index})"
+    if scenario == "schema":
+        return "/api/schema", {"hackathon_rubric": SAMPLE_RUBRIC + suffix}
+    if scenario == "eligibility":
+        return "/api/eligibility", {
+            "project_writeup": SAMPLE_WRITEUP + suffix,
+            "hackathon_requirements": SAMPLE_REQUIREMENTS,
+        }
+    if scenario == "evaluate":
+        return "/api/evaluate", {
+            "hackathon_rubric": SAMPLE_RUBRIC,
+            "hackathon_requirements": SAMPLE_REQUIREMENTS,
+            "json_rubric": SAMPLE_JSON_RUBRIC,
+            "project_writeup": SAMPLE_WRITEUP + suffix,
+            "grade_delay": grade_delay,
+        }
+    return "/api/grade", {
+        "inputs": {
+            "hackathon_rubric": SAMPLE_RUBRIC,
+            "json_rubric": json.dumps(SAMPLE_JSON_RUBRIC),
+            "project_writeup": SAMPLE_WRITEUP + suffix,
+        }
+    }
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+async def fetch_upstream_calls(client: httpx.AsyncClient, fake_crew_url: Optional[str]) -> Optional[Dict[str, int]]:
+    """Call counters from the fake crew, or None when it isn't reachable"""
+    if not fake_crew_url:
+        return None
+    try:
+        response = await client.get(f"{fake_crew_url.rstrip('/')}/stats", timeout=10)
+        response.raise_for_status()
+        return response.json()["calls"]
+    except (httpx.HTTPError, KeyError, ValueError) as e:
+        print(f"⚠️ Could not read fake crew stats: {e}", file=sys.stderr)
+        return None
+
+
+async def stored_kickoff_ids(client: httpx.AsyncClient, backend_url: str, limit: int) -> List[str]:
+    """Collect up to ``limit`` stored kickoff IDs for the resume scenario"""
+    kickoff_ids: List[str] = []
+    cursor = None
+    while len(kickoff_ids) < limit:
+        params = {"fields": "status", "limit": min(1000, limit - len(kickoff_ids))}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get(f"{backend_url}/api/kickoff-status", params=params, timeout=60)
+        response.raise_for_status()
+        data = response.json()["data"]
+        kickoff_ids.extend(data["kickoffs"])
+        cursor = data.get("next_cursor")
+        if not cursor:
+            break
+    return kickoff_ids
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    backend_url = args.backend_url.rstrip("/")
+    run_id = uuid.uuid4().hex[:8]
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+
+    limits = httpx.Limits(max_connections=args.concurrency + 5, max_keepalive_connections=args.concurrency + 5)
+    async with httpx.AsyncClient(limits=limits, timeout=args.timeout) as client:
+        resume_ids: List[str] = []
+        if args.scenario == "resume":
+            resume_ids = await stored_kickoff_ids(client, backend_url, args.requests * args.resume_batch)
+            if not resume_ids:
+                raise SystemExit("No stored kickoffs to resume; run another scenario first")
+
+        upstream_before = await fetch_upstream_calls(client, args.fake_crew_url)
+
+        async def one_request(index: int):
+            if args.scenario == "resume":
+                start = index * args.resume_batch % len(resume_ids)
+                chunk = (resume_ids * 2)[start:start + min(args.resume_batch, len(resume_ids))]
+                path, body = "/api/resume-kickoffs", {"kickoff_ids": chunk}
+                params = {}
+            else:
+                path, body = build_request(args.scenario, index, run_id, args.repeat_inputs, args.grade_delay)
+                params = {"cache": args.cache}
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await client.post(f"{backend_url}{path}", json=body, params=params)
+                    ok = response.status_code == 200 and response.json().get("success", False)
+                    reason = f"HTTP {response.status_code}" if response.status_code != 200 else "success=false"
+                except httpx.HTTPError as e:
+                    ok, reason = False, type(e).__name__
+                latencies.append(time.perf_counter() - started)
+            if not ok:
+                errors[reason] = errors.get(reason, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one_request(i) for i in range(args.requests)))
+        elapsed = time.perf_counter() - started
+
+        upstream_after = await fetch_upstream_calls(client, args.fake_crew_url)
+
+    latencies.sort()
+    failed = sum(errors.values())
+    report: Dict[str, Any] = {
+        "scenario": args.scenario,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "succeeded": args.requests - failed,
+        "failed": failed,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(args.requests / elapsed, 3) if elapsed else 0.0,
+        "latency_seconds": {
+            "mean": round(statistics.fmean(latencies), 4) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50), 4),
+            "p95": round(percentile(latencies, 95), 4),
+            "p99": round(percentile(latencies, 99), 4),
+            "max": round(latencies[-1], 4) if latencies else 0.0,
+        },
+    }
+    if upstream_before is not None and upstream_after is not None:
+        upstream = {
+            name: upstream_after.get(name, 0) - upstream_before.get(name, 0)
+            for name in sorted(set(upstream_before) | set(upstream_after))
+        }
+        report["upstream_calls"] = upstream
+        report["upstream_calls_per_request"] = round(sum(upstream.values()) / args.requests, 3)
+    return report
+
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None):
+    def line(label: str, value: float, base: Optional[float], unit: str = ""):
+        text = f"  {label:<26}{value:>12g}{unit}"
+        if base:
+            text += f"   ({(value - base) / base * 100:+.1f}% vs baseline)"
+        print(text)
+
+    def base_value(*keys: str) -> Optional[float]:
+        value: Any = baseline
+        for key in keys:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        return value
+
+    print(f"📊 {report['scenario']}: {report['requests']} requests at concurrency {report['concurrency']}")
+    print(f"  succeeded / failed          {report['succeeded']} / {report['failed']}")
+    for reason, count in report["errors"].items():
+        print(f"    {reason}: {count}")
+    line("elapsed", report["elapsed_seconds"], base_value("elapsed_seconds"), "s")
+    line("throughput", report["throughput_rps"], base_value("throughput_rps"), " req/s")
+    for name in ("mean", "p50", "p95", "p99", "max"):
+        line(f"latency {name}", report["latency_seconds"][name], base_value("latency_seconds", name), "s")
+    if "upstream_calls" in report:
+        line("upstream calls / request", report["upstream_calls_per_request"], base_value("upstream_calls_per_request"))
+        for name, count in report["upstream_calls"].items():
+            line(f"  {name}", count, base_value("upstream_calls", name))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the hackathon backend")
+    parser.add_argument("scenario", choices=SCENARIOS)
+    parser.add_argument("--backend-url", default="http://127.0.0.1:8001")
+    parser.add_argument("--fake-crew-url", default=None, help="fake_crew base URL, for upstream call counts")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=600, help="per-request timeout in seconds")
+    parser.add_argument("--cache", choices=("use", "refresh", "bypass"), default="use")
+    parser.add_argument("--repeat-inputs", action="store_true", help="send identical inputs to measure cache hits")
+    parser.add_argument("--grade-delay", type=float, default=0.0, help="evaluate: seconds before speculative grading")
+    parser.add_argument("--sequential", dest="grade_delay", action="store_const", const=None, help="evaluate: grade only after eligibility passes")
+    parser.add_argument("--resume-batch", type=int, default=10, help="kickoff IDs per resume request")
+    parser.add_argument("--output", help="write the report as JSON")
+    parser.add_argument("--baseline", help="JSON report from an earlier run to compare against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+
+    report = asyncio.run(run_benchmark(args))
+    print_report(report, baseline)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
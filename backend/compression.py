@@ -0,0 +1,112 @@
+import asyncio
+import gzip
+import os
+from typing import Optional
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Response compression settings
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", 1024))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", 5))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", 4))
+# Bodies above this are compressed in a thread instead of on the event loop
+COMPRESSION_THREAD_BYTES = 256 * 1024
+
+# Streams are sent line by line as results land; an encoder would hold lines back
+STREAMING_TYPES = ("application/x-ndjson", "text/event-stream")
+
+ENCODINGS = ("br", "gzip")
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """The best encoding the client accepts, preferring brotli on equal q-values"""
+    weights = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip()] = weight
+    best = None
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > 0 and (best is None or weight > best[1]):
+            best = (encoding, weight)
+    return best[0] if best else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """Negotiated brotli/gzip compression of complete response bodies.
+
+    Only responses sent as one body (every JSON response) of at least
+    ``minimum_size`` bytes are compressed. Streaming responses such as the
+    NDJSON batch results pass through untouched as soon as they start, so
+    the client gets the headers at once and each line as it is written.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers or headers.get("content-type", "").startswith(STREAMING_TYPES):
+                    # Streams get their status and headers now, not when the first line is ready
+                    passthrough = True
+                    await send(message)
+                    return
+                # Held back until the body shows whether it is worth compressing
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            if len(body) > COMPRESSION_THREAD_BYTES:
+                compressed = await asyncio.to_thread(compress, body, encoding)
+            else:
+                compressed = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
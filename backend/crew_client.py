@@ -0,0 +1,35 @@
+import os
+from typing import Dict
+
+import httpx
+
+# Connection pool sizing per upstream crew
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", 100))
+UPSTREAM_MAX_KEEPALIVE = int(os.getenv("UPSTREAM_MAX_KEEPALIVE", 20))
+UPSTREAM_KEEPALIVE_EXPIRY = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", 60))
+
+# One pooled client per upstream base URL
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_client(base_url: str) -> httpx.AsyncClient:
+    """Get the shared keep-alive client for an upstream base URL"""
+    client = _clients.get(base_url)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            limits=httpx.Limits(
+                max_connections=UPSTREAM_MAX_CONNECTIONS,
+                max_keepalive_connections=UPSTREAM_MAX_KEEPALIVE,
+                keepalive_expiry=UPSTREAM_KEEPALIVE_EXPIRY,
+            ),
+        )
+        _clients[base_url] = client
+    return client
+
+
+async def close_clients():
+    """Close all pooled upstream clients"""
+    for client in _clients.values():
+        await client.aclose()
+    _clients.clear()
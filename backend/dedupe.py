@@ -0,0 +1,118 @@
+import re
+import zlib
+from array import array
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+# Jaccard similarity of word shingles above which writeups count as duplicates
+DEFAULT_THRESHOLD = 0.85
+
+_WORD = re.compile(r"[a-z0-9]+")
+_MASK = 0xFFFFFFFF
+_GAP = 0x9E3779B1
+
+
+def shingles(text: str, size: int = 3) -> Set[int]:
+    """Hashed word n-grams of a writeup, ignoring case and punctuation"""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode())} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + size]).encode()) for i in range(len(words) - size + 1)}
+
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class DuplicateIndex:
+    """MinHash + LSH index for finding near-duplicate writeups.
+
+    Each writeup is reduced to ``bands * rows`` MinHash values with
+    one-permutation hashing: a single pass spreads its shingle hashes over
+    that many bins and keeps the minimum of each (empty bins borrow from
+    their neighbour). Writeups that agree on every value of at least one
+    band become candidates, and candidates are confirmed with their exact
+    Jaccard similarity. Indexing is linear in the number of writeups, so
+    thousands are handled in about a second.
+
+    Memory is also linear: each writeup keeps its shingle hashes packed as
+    4-byte integers (about 1 KB for a 300-word writeup) for the exact check.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, bands: int = 8, rows: int = 4, shingle_size: int = 3):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.shingle_size = shingle_size
+        self.num_bins = bands * rows
+        self._buckets: List[Dict[Tuple[int, ...], List[Hashable]]] = [{} for _ in range(bands)]
+        self._shingles: Dict[Hashable, array] = {}
+
+    def __len__(self) -> int:
+        return len(self._shingles)
+
+    def _signature(self, hashes: Set[int]) -> List[Optional[int]]:
+        bins: List[Optional[int]] = [None] * self.num_bins
+        for value in hashes:
+            slot = value % self.num_bins
+            current = bins[slot]
+            if current is None or value < current:
+                bins[slot] = value
+        # Densify: an empty bin takes the next non-empty bin's value, offset
+        # by the distance so different gaps don't collide
+        if None in bins:
+            filled = bins[:]
+            for slot, value in enumerate(filled):
+                if value is None:
+                    distance = 1
+                    while filled[(slot + distance) % self.num_bins] is None:
+                        distance += 1
+                    bins[slot] = (filled[(slot + distance) % self.num_bins] + distance * _GAP) & _MASK
+        return bins
+
+    def _band_keys(self, signature: List[Optional[int]]) -> List[Tuple[int, ...]]:
+        return [tuple(signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+    def add(self, key: Hashable, text: str) -> Optional[Tuple[Hashable, float]]:
+        """Index a writeup and return its closest earlier near-duplicate.
+
+        Returns (key, similarity) of the most similar writeup already in the
+        index, or None. Empty writeups are never indexed or matched.
+        """
+        hashes = shingles(text, self.shingle_size)
+        if not hashes:
+            return None
+        band_keys = self._band_keys(self._signature(hashes))
+
+        candidates = set()
+        for buckets, band_key in zip(self._buckets, band_keys):
+            candidates.update(buckets.get(band_key, ()))
+        best = None
+        for candidate in candidates:
+            similarity = jaccard(hashes, set(self._shingles[candidate]))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (candidate, similarity)
+
+        self._shingles[key] = array("I", hashes)
+        for buckets, band_key in zip(self._buckets, band_keys):
+            buckets.setdefault(band_key, []).append(key)
+        return best
+
+
+def find_duplicates(items: Iterable[Tuple[Hashable, str]], threshold: float = DEFAULT_THRESHOLD) -> Dict[Hashable, Tuple[Hashable, float]]:
+    """Map each near-duplicate to the first writeup it duplicates.
+
+    ``items`` are (key, writeup) pairs in submission order. Chains of
+    duplicates all point at the earliest original.
+    """
+    index = DuplicateIndex(threshold)
+    duplicates: Dict[Hashable, Tuple[Hashable, float]] = {}
+    for key, text in items:
+        match = index.add(key, text)
+        if match is not None:
+            original, similarity = match
+            if original in duplicates:
+                original = duplicates[original][0]
+            duplicates[key] = (original, round(similarity, 4))
+    return duplicates
@@ -0,0 +1,206 @@
+"""Local stand-in for the CrewAI schema, eligibility and grader crews.
+
+Implements the /kickoff and /status/{kickoff_id} endpoints and fires the
+crewWebhookUrl callback when a kickoff finishes, so the backend can be
+exercised without spending CrewAI credits:
+
+    uvicorn fake_crew:app --port 8010
+
+Then point SCHEMA_API_URL, ELIGIBILITY_API_URL and GRADER_API_URL at
+http://127.0.0.1:8010 (any token is accepted).
+
+Behaviour is tuned through environment variables:
+
+    FAKE_CREW_LATENCY            mean seconds a kickoff runs (default 5)
+    FAKE_CREW_LATENCY_DIST       fixed, uniform or lognormal (default fixed)
+    FAKE_CREW_LATENCY_SPREAD     +/- seconds for uniform, sigma for lognormal
+    FAKE_CREW_503_RATE           fraction of requests answered with 503
+    FAKE_CREW_504_RATE           fraction of requests answered with 504
+    FAKE_CREW_FAILED_RATE        fraction of kickoffs that end FAILED
+    FAKE_CREW_INELIGIBLE_RATE    fraction of eligibility checks that fail
+    FAKE_CREW_RESULT_SHAPE       "string" (JSON string in result) or
+                                 "result_json" (parsed object)
+
+GET /stats reports how many calls the fake has served, and
+POST /stats/reset zeroes the counters between benchmark runs.
+"""
+import asyncio
+import json
+import math
+import os
+import random
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+import httpx
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
+
+from logs import get_logger
+
+log = get_logger("fake_crew")
+
+app = FastAPI(title="Fake CrewAI Crew", version="1.0.0")
+
+# Seconds a kickoff takes to finish
+FAKE_CREW_LATENCY = float(os.getenv("FAKE_CREW_LATENCY", 5))
+FAKE_CREW_LATENCY_DIST = os.getenv("FAKE_CREW_LATENCY_DIST", "fixed").lower()
+FAKE_CREW_LATENCY_SPREAD = float(os.getenv("FAKE_CREW_LATENCY_SPREAD", 0))
+
+# Fault injection
+FAKE_CREW_503_RATE = float(os.getenv("FAKE_CREW_503_RATE", 0))
+FAKE_CREW_504_RATE = float(os.getenv("FAKE_CREW_504_RATE", 0))
+FAKE_CREW_FAILED_RATE = float(os.getenv("FAKE_CREW_FAILED_RATE", 0))
+FAKE_CREW_INELIGIBLE_RATE = float(os.getenv("FAKE_CREW_INELIGIBLE_RATE", 0))
+
+# "string" mirrors crews that return result as a JSON string,
+# "result_json" mirrors crews with structured output
+FAKE_CREW_RESULT_SHAPE = os.getenv("FAKE_CREW_RESULT_SHAPE", "string").lower()
+
+DEFAULT_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "properties": {
+        "innovation": {
+            "type": "object",
+            "properties": {
+                "novel_approach": {"type": "integer", "minimum": 0, "maximum": 10},
+                "creative_use_of_technology": {"type": "integer", "minimum": 0, "maximum": 5},
+            },
+            "required": ["novel_approach", "creative_use_of_technology"],
+        },
+        "technical_implementation": {
+            "type": "object",
+            "properties": {
+                "code_quality": {"type": "integer", "minimum": 0, "maximum": 10},
+                "technical_complexity": {"type": "integer", "minimum": 0, "maximum": 5},
+            },
+            "required": ["code_quality", "technical_complexity"],
+        },
+    },
+    "required": ["innovation", "technical_implementation"],
+}
+
+kickoffs: Dict[str, Dict[str, Any]] = {}
+webhook_tasks = set()
+call_counts: Dict[str, int] = {}
+
+
+def count(name: str):
+    call_counts[name] = call_counts.get(name, 0) + 1
+
+
+def sample_latency() -> float:
+    """Draw how long a kickoff runs from the configured distribution"""
+    if FAKE_CREW_LATENCY_DIST == "uniform":
+        return max(0.0, random.uniform(FAKE_CREW_LATENCY - FAKE_CREW_LATENCY_SPREAD, FAKE_CREW_LATENCY + FAKE_CREW_LATENCY_SPREAD))
+    if FAKE_CREW_LATENCY_DIST == "lognormal" and FAKE_CREW_LATENCY > 0:
+        # Keep the mean at FAKE_CREW_LATENCY for any sigma
+        sigma = FAKE_CREW_LATENCY_SPREAD or 0.5
+        return random.lognormvariate(math.log(FAKE_CREW_LATENCY) - sigma ** 2 / 2, sigma)
+    return FAKE_CREW_LATENCY
+
+
+def injected_error(endpoint: str) -> Optional[JSONResponse]:
+    """Randomly answer with a 503 or 504 like an overloaded crew"""
+    roll = random.random()
+    for status_code, rate in ((503, FAKE_CREW_503_RATE), (504, FAKE_CREW_504_RATE)):
+        if roll < rate:
+            count(f"{endpoint}_{status_code}")
+            return JSONResponse(status_code=status_code, content={"detail": "Injected upstream error"})
+        roll -= rate
+    return None
+
+
+def score_from_schema(schema: Dict[str, Any]) -> Any:
+    """Produce a random grade that fits a generated JSON rubric"""
+    if schema.get("type") == "object" or "properties" in schema:
+        return {name: score_from_schema(child) for name, child in schema.get("properties", {}).items()}
+    if schema.get("enum"):
+        return random.choice(schema["enum"])
+    if schema.get("type") in ("integer", "number"):
+        return random.randint(int(schema.get("minimum", 0)), int(schema.get("maximum", 10)))
+    return None
+
+
+def build_result(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a crew result shaped like the real crew for these inputs"""
+    if "json_rubric" in inputs:
+        json_rubric = inputs["json_rubric"]
+        if isinstance(json_rubric, str):
+            json_rubric = json.loads(json_rubric)
+        return score_from_schema(json_rubric or DEFAULT_SCHEMA)
+    if "hackathon_requirements" in inputs:
+        if random.random() < FAKE_CREW_INELIGIBLE_RATE:
+            return {"valid": False, "explanation": "The project does not meet the hackathon requirements."}
+        return {"valid": True, "explanation": "The project meets the hackathon requirements."}
+    return DEFAULT_SCHEMA
+
+
+def status_payload(kickoff_id: str) -> Dict[str, Any]:
+    kickoff = kickoffs[kickoff_id]
+    if time.monotonic() < kickoff["finishes_at"]:
+        return {"state": "RUNNING", "status": "Crew is running"}
+    if kickoff["failed"]:
+        return {"state": "FAILED", "status": "Crew failed", "result": "Injected crew failure"}
+    if FAKE_CREW_RESULT_SHAPE == "result_json":
+        return {"state": "SUCCESS", "status": "Completed", "result": None, "result_json": kickoff["result"]}
+    return {"state": "SUCCESS", "status": "Completed", "result": json.dumps(kickoff["result"])}
+
+
+async def fire_webhook(kickoff_id: str, url: str):
+    """POST the finished kickoff to its crewWebhookUrl"""
+    await asyncio.sleep(max(0.0, kickoffs[kickoff_id]["finishes_at"] - time.monotonic()))
+    body = {"kickoff_id": kickoff_id, **status_payload(kickoff_id)}
+    try:
+        async with httpx.AsyncClient() as client:
+            await client.post(url, json=body, timeout=10)
+        count("webhooks")
+    except httpx.HTTPError as e:
+        log.warning("Webhook failed", extra={"kickoff_id": kickoff_id, "error": str(e)})
+
+
+@app.post("/kickoff")
+async def kickoff(payload: Dict[str, Any]):
+    count("kickoff")
+    error = injected_error("kickoff")
+    if error is not None:
+        return error
+    kickoff_id = str(uuid.uuid4())
+    failed = random.random() < FAKE_CREW_FAILED_RATE
+    if failed:
+        count("failed")
+    kickoffs[kickoff_id] = {
+        "finishes_at": time.monotonic() + sample_latency(),
+        "result": build_result(payload.get("inputs", {})),
+        "failed": failed,
+    }
+    if payload.get("crewWebhookUrl"):
+        task = asyncio.create_task(fire_webhook(kickoff_id, payload["crewWebhookUrl"]))
+        webhook_tasks.add(task)
+        task.add_done_callback(webhook_tasks.discard)
+    return {"kickoff_id": kickoff_id}
+
+
+@app.get("/status/{kickoff_id}")
+async def status(kickoff_id: str):
+    count("status")
+    error = injected_error("status")
+    if error is not None:
+        return error
+    if kickoff_id not in kickoffs:
+        raise HTTPException(status_code=404, detail="Kickoff not found")
+    return status_payload(kickoff_id)
+
+
+@app.get("/stats")
+async def stats():
+    """Calls served so far, for benchmark upstream call counts"""
+    return {"calls": dict(call_counts), "kickoffs": len(kickoffs)}
+
+
+@app.post("/stats/reset")
+async def reset_stats():
+    call_counts.clear()
+    return {"calls": {}}
@@ -0,0 +1,368 @@
+import codecs
+import csv
+import io
+import json
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from multipart.multipart import MultipartParser, parse_options_header
+
+# Submission file formats accepted by POST /api/ingest
+INGEST_FORMATS = ("json", "ndjson", "csv")
+
+_EXTENSIONS = {".json": "json", ".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv"}
+_CONTENT_TYPES = {
+    "application/json": "json",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+}
+
+# Alternative names of the submission fields, e.g. CSV exports from other tools
+_NAME_FIELDS = ("project_name", "name", "title", "project")
+_DESCRIPTION_FIELDS = ("description", "project_writeup", "writeup", "summary")
+_TEAM_FIELDS = ("team_members", "team", "members")
+_DEMO_FIELDS = ("demo_link", "demo", "url", "link")
+_ID_FIELDS = ("id", "submission_id")
+_TEAM_SEPARATOR = re.compile(r"[,;|\n]")
+
+# A parsed record: its 1-based position in the file and the record, or why it was rejected
+Record = Tuple[int, Union[Any, "IngestError"]]
+
+
+class IngestError(ValueError):
+    """An uploaded submissions file (or one of its records) can't be used"""
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str], head: bytes) -> str:
+    """Guess a file's format from its name, then its content type, then its first byte"""
+    name = (filename or "").lower()
+    for extension, file_format in _EXTENSIONS.items():
+        if name.endswith(extension):
+            return file_format
+    file_format = _CONTENT_TYPES.get((content_type or "").split(";")[0].strip().lower())
+    if file_format:
+        return file_format
+    first = head.lstrip(codecs.BOM_UTF8 + b" \t\r\n")[:1]
+    if first == b"[":
+        return "json"
+    if first == b"{":
+        return "ndjson"
+    return "csv"
+
+
+class _TextParser:
+    """Decodes UTF-8 chunks into a text buffer that a subclass parses records from"""
+
+    def __init__(self, max_record_bytes: int):
+        self.max_record_bytes = max_record_bytes
+        self.records = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buffer = ""
+        self._error: Optional[IngestError] = None
+
+    def feed(self, data: bytes) -> List[Record]:
+        """Parse the records completed by a chunk of the file"""
+        try:
+            self._buffer += self._decoder.decode(data)
+        except UnicodeDecodeError as e:
+            raise IngestError(f"The file is not valid UTF-8: {e.reason}")
+        return self._records(final=False)
+
+    def close(self) -> List[Record]:
+        """Parse whatever is left at the end of the file"""
+        try:
+            self._buffer += self._decoder.decode(b"", final=True)
+        except UnicodeDecodeError as e:
+            raise IngestError(f"The file is not valid UTF-8: {e.reason}")
+        return self._records(final=True)
+
+    def _records(self, final: bool) -> List[Record]:
+        if self._error is not None:
+            raise self._error
+        records: List[Record] = []
+        try:
+            self._parse(final, records)
+        except IngestError as e:
+            # Hand out the records read before the error first
+            if not records:
+                raise
+            self._error = e
+        return records
+
+    def _check_size(self, pending: int):
+        if pending > self.max_record_bytes:
+            raise IngestError(f"Record {self.records + 1} is larger than {self.max_record_bytes} bytes")
+
+    def _parse(self, final: bool, records: List[Record]):
+        raise NotImplementedError
+
+
+class JsonArrayParser(_TextParser):
+    """Reads the records of a JSON array one at a time.
+
+    Only the record being read is buffered: each complete element is
+    decoded with ``raw_decode`` as soon as its closing bracket arrives.
+    """
+
+    def __init__(self, max_record_bytes: int):
+        super().__init__(max_record_bytes)
+        self._json = json.JSONDecoder()
+        # start → first (after "[") → value (after ",") / next (after a value) → end (after "]")
+        self._state = "start"
+
+    def _parse(self, final: bool, records: List[Record]):
+        buffer = self._buffer
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n":
+                position += 1
+            if position == len(buffer):
+                break
+            char = buffer[position]
+            if self._state == "end":
+                raise IngestError("Unexpected data after the end of the JSON array")
+            if self._state == "start":
+                if char != "[":
+                    raise IngestError("A JSON submissions file must contain an array of submissions")
+                self._state = "first"
+                position += 1
+            elif self._state in ("first", "next") and char == "]":
+                self._state = "end"
+                position += 1
+            elif self._state == "next":
+                if char != ",":
+                    raise IngestError(f"Expected ',' or ']' after record {self.records}")
+                self._state = "value"
+                position += 1
+            else:
+                try:
+                    value, end = self._json.raw_decode(buffer, position)
+                except json.JSONDecodeError as e:
+                    if final:
+                        raise IngestError(f"Record {self.records + 1} is not valid JSON: {e.msg}")
+                    self._check_size(len(buffer) - position)
+                    break
+                if end == len(buffer) and not final:
+                    # A bare number may continue in the next chunk
+                    break
+                self.records += 1
+                records.append((self.records, value))
+                self._state = "next"
+                position = end
+        self._buffer = buffer[position:]
+        if final and self._state != "end":
+            raise IngestError("The JSON array is incomplete")
+
+
+class NdjsonParser(_TextParser):
+    """Reads newline-delimited JSON; a bad line rejects only that record"""
+
+    def __init__(self, max_record_bytes: int):
+        super().__init__(max_record_bytes)
+        self._line = 0
+
+    def _parse(self, final: bool, records: List[Record]):
+        lines = self._buffer.split("\n")
+        self._buffer = "" if final else lines.pop()
+        for line in lines:
+            self._line += 1
+            line = line.strip()
+            if not line:
+                continue
+            self.records += 1
+            try:
+                records.append((self._line, json.loads(line)))
+            except json.JSONDecodeError as e:
+                records.append((self._line, IngestError(f"Line {self._line} is not valid JSON: {e.msg}")))
+        self._check_size(len(self._buffer))
+
+
+class CsvParser(_TextParser):
+    """Reads CSV rows, with a header row, into dicts.
+
+    A row ends at a newline outside quotes, so quoted fields may span
+    lines; each complete row is handed to the csv module on its own.
+    """
+
+    def __init__(self, max_record_bytes: int):
+        super().__init__(max_record_bytes)
+        self._header: Optional[List[str]] = None
+        self._scanned = 0
+        self._quotes = 0
+
+    def _parse(self, final: bool, records: List[Record]):
+        buffer = self._buffer
+        start = 0
+        position = self._scanned
+        rows = []
+        while True:
+            newline = buffer.find("\n", position)
+            if newline == -1:
+                break
+            self._quotes += buffer.count('"', position, newline)
+            position = newline + 1
+            if self._quotes % 2 == 0:
+                rows.append(buffer[start:position])
+                start = position
+                self._quotes = 0
+        if final and start < len(buffer):
+            rows.append(buffer[start:])
+            start = len(buffer)
+            position = start
+        elif position < len(buffer):
+            self._quotes += buffer.count('"', position)
+            position = len(buffer)
+        self._buffer = buffer[start:]
+        self._scanned = position - start
+        self._check_size(len(self._buffer))
+
+        for text in rows:
+            try:
+                row = next(csv.reader(io.StringIO(text)), [])
+            except csv.Error as e:
+                self.records += 1
+                records.append((self.records, IngestError(f"Row {self.records} is not valid CSV: {e}")))
+                continue
+            if not any(cell.strip() for cell in row):
+                continue
+            if self._header is None:
+                self._header = [cell.strip().lower().replace(" ", "_") for cell in row]
+                continue
+            self.records += 1
+            if len(row) != len(self._header):
+                records.append((self.records, IngestError(f"Row {self.records} has {len(row)} columns, the header has {len(self._header)}")))
+                continue
+            records.append((self.records, dict(zip(self._header, row))))
+
+
+def make_parser(file_format: str, max_record_bytes: int) -> _TextParser:
+    parsers = {"json": JsonArrayParser, "ndjson": NdjsonParser, "csv": CsvParser}
+    if file_format not in parsers:
+        raise IngestError(f"Unsupported format {file_format}; expected one of {', '.join(INGEST_FORMATS)}")
+    return parsers[file_format](max_record_bytes)
+
+
+def _first(record: Dict[str, Any], fields: Tuple[str, ...]) -> Any:
+    for field in fields:
+        value = record.get(field)
+        if value is not None and value != "":
+            return value
+    return None
+
+
+def _text(value: Any, field: str) -> str:
+    if isinstance(value, (dict, list, bool)):
+        raise IngestError(f"{field} must be text")
+    return str(value).strip()
+
+
+def normalize_submission(record: Any) -> Dict[str, Any]:
+    """Validate a parsed record and map it to the submission fields the pipeline uses"""
+    if not isinstance(record, dict):
+        raise IngestError("A submission must be an object")
+    description = _first(record, _DESCRIPTION_FIELDS)
+    description = _text(description, "description") if description is not None else ""
+    if not description:
+        raise IngestError("A submission needs a description")
+
+    submission: Dict[str, Any] = {"description": description}
+    name = _first(record, _NAME_FIELDS)
+    if name is not None:
+        submission["project_name"] = _text(name, "project_name")
+    submission_id = _first(record, _ID_FIELDS)
+    if submission_id is not None:
+        submission["id"] = _text(submission_id, "id")
+    demo_link = _first(record, _DEMO_FIELDS)
+    if demo_link is not None:
+        submission["demo_link"] = _text(demo_link, "demo_link")
+
+    team = _first(record, _TEAM_FIELDS)
+    if isinstance(team, str):
+        team = _TEAM_SEPARATOR.split(team)
+    elif team is not None and not isinstance(team, list):
+        raise IngestError("team_members must be a list or a separated string")
+    submission["team_members"] = [member for member in (_text(item, "team_members") for item in team or []) if member]
+    return submission
+
+
+class MultipartReader:
+    """Incremental multipart/form-data parser.
+
+    ``events`` yields ("field", name, value) for each form field,
+    ("file", name, filename, content_type) when a file part starts,
+    ("data", chunk) for its content as it arrives and ("end",) after it,
+    so a file can be processed while it is still uploading.
+    """
+
+    def __init__(self, content_type: str, max_field_bytes: int):
+        _, options = parse_options_header(content_type)
+        boundary = options.get(b"boundary")
+        if not boundary:
+            raise IngestError("Expected a multipart/form-data upload with a boundary")
+        self.max_field_bytes = max_field_bytes
+        self._events: List[tuple] = []
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+        self._headers: Dict[bytes, bytes] = {}
+        self._name = ""
+        self._file = False
+        self._value = bytearray()
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+        })
+
+    def _on_part_begin(self):
+        self._headers = {}
+        self._value = bytearray()
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[bytes(self._header_field).lower()] = bytes(self._header_value)
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._name = options.get(b"name", b"").decode("latin-1")
+        self._file = b"filename" in options
+        if self._file:
+            filename = options[b"filename"].decode("utf-8", "replace")
+            self._events.append(("file", self._name, filename, self._headers.get(b"content-type", b"").decode("latin-1")))
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        if self._file:
+            self._events.append(("data", bytes(data[start:end])))
+            return
+        self._value += data[start:end]
+        if len(self._value) > self.max_field_bytes:
+            raise IngestError(f"Form field {self._name} is larger than {self.max_field_bytes} bytes")
+
+    def _on_part_end(self):
+        if self._file:
+            self._events.append(("end",))
+        else:
+            self._events.append(("field", self._name, self._value.decode("utf-8", "replace")))
+
+    async def events(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple]:
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            self._parser.write(chunk)
+            events, self._events = self._events, []
+            for event in events:
+                yield event
+        self._parser.finalize()
+        for event in self._events:
+            yield event
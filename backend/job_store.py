@@ -0,0 +1,157 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from logs import get_logger
+
+log = get_logger("jobs")
+
+# Job states; SUCCESS and FAILED are final
+JOB_STATES = ("RUNNING", "SUCCESS", "FAILED")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    worker_id TEXT,
+    result TEXT,
+    request TEXT,
+    cache_mode TEXT,
+    lease_expires REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status);
+"""
+
+# Columns added after the jobs table was first created
+ADDED_COLUMNS = (("request", "TEXT"), ("cache_mode", "TEXT"), ("lease_expires", "REAL"))
+
+
+class JobStore:
+    """SQLite table of asynchronous evaluation jobs.
+
+    A job runs in the worker that accepted it; keeping its state in the
+    shared database lets any worker answer status requests. The running
+    worker keeps a lease on the job, so if it dies (crash, redeploy) the
+    job can be claimed and rerun from its stored request elsewhere.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(SCHEMA)
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, column_type in ADDED_COLUMNS:
+            if column not in existing:
+                try:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+                except sqlite3.OperationalError as e:
+                    # Another worker added it first
+                    if "duplicate column" not in str(e):
+                        raise
+
+    def create(self, kind: str, worker_id: str, request: Dict[str, Any], cache_mode: str, lease_seconds: float) -> Dict[str, Any]:
+        """Register a new RUNNING job leased to ``worker_id`` and return it"""
+        job_id = str(uuid.uuid4())
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, kind, status, created_at, updated_at, worker_id, request, cache_mode, lease_expires) "
+                "VALUES (?, ?, 'RUNNING', ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, now, now, worker_id, json.dumps(request), cache_mode, time.time() + lease_seconds),
+            )
+        return {"job_id": job_id, "kind": kind, "status": "RUNNING", "created_at": now, "updated_at": now, "result": None}
+
+    def finish(self, job_id: str, result: Dict[str, Any]):
+        """Store a job's result; its status follows result["success"]"""
+        status = "SUCCESS" if result.get("success") else "FAILED"
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, updated_at = ?, result = ? WHERE job_id = ?",
+                    (status, datetime.now().isoformat(), json.dumps(result), job_id),
+                )
+        except sqlite3.Error as e:
+            log.warning("Error saving job", extra={"job_id": job_id, "error": str(e)})
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute(
+            "SELECT job_id, kind, status, created_at, updated_at, result FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        if job["result"] is not None:
+            job["result"] = json.loads(job["result"])
+        return job
+
+    def renew_leases(self, worker_id: str, job_ids: Sequence[str], lease_seconds: float):
+        """Extend the leases ``worker_id`` holds on its running jobs"""
+        expires = time.time() + lease_seconds
+        with self._lock:
+            for job_id in job_ids:
+                self._conn.execute(
+                    "UPDATE jobs SET lease_expires = ? WHERE job_id = ? AND worker_id = ? AND status = 'RUNNING'",
+                    (expires, job_id, worker_id),
+                )
+
+    def release_leases(self, worker_id: str):
+        """Let another worker take over this worker's running jobs right away"""
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET lease_expires = 0 WHERE worker_id = ? AND status = 'RUNNING'", (worker_id,))
+
+    def claim_orphaned(self, worker_id: str, lease_seconds: float) -> List[Dict[str, Any]]:
+        """Take over RUNNING jobs whose worker stopped renewing its lease.
+
+        Returns the claimed jobs with their stored request (None for jobs
+        created before requests were stored).
+        """
+        now = time.time()
+        candidates = self._conn.execute(
+            "SELECT job_id, kind, request, cache_mode FROM jobs WHERE status = 'RUNNING' AND (lease_expires IS NULL OR lease_expires < ?)",
+            (now,),
+        ).fetchall()
+        claimed = []
+        with self._lock:
+            for row in candidates:
+                taken = self._conn.execute(
+                    "UPDATE jobs SET worker_id = ?, lease_expires = ? WHERE job_id = ? AND status = 'RUNNING' "
+                    "AND (lease_expires IS NULL OR lease_expires < ?)",
+                    (worker_id, now + lease_seconds, row["job_id"], now),
+                ).rowcount
+                if taken:
+                    job = dict(row)
+                    job["request"] = json.loads(job["request"]) if job["request"] is not None else None
+                    claimed.append(job)
+        return claimed
+
+    def prune(self, max_age_seconds: float) -> int:
+        """Delete finished jobs not updated for ``max_age_seconds``"""
+        cutoff = datetime.fromtimestamp(datetime.now().timestamp() - max_age_seconds).isoformat()
+        # Runs in a thread during compaction: a connection of its own keeps the
+        # shared one on the event loop
+        conn = sqlite3.connect(self.path, isolation_level=None)
+        try:
+            conn.execute("PRAGMA busy_timeout=5000")
+            return conn.execute(
+                "DELETE FROM jobs WHERE status != 'RUNNING' AND updated_at < ?", (cutoff,)
+            ).rowcount
+        finally:
+            conn.close()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM jobs")
+
+    def close(self):
+        self._conn.close()
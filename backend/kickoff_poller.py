@@ -0,0 +1,316 @@
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from logs import get_logger
+from metrics import KICKOFF_POLLS, KICKOFF_TIME_TO_TERMINAL
+
+log = get_logger("poller")
+
+# CrewAI states that end a kickoff
+TERMINAL_STATES = ("SUCCESS", "FAILED", "COMPLETED")
+
+
+@dataclass
+class TrackedKickoff:
+    kickoff_id: str
+    api_type: str
+    base_url: str
+    headers: Dict[str, str]
+    interval: float
+    max_interval: float
+    next_poll_at: float
+    started_at: float
+    polls: int = 0
+    consecutive_errors: int = 0
+    in_flight: bool = False
+    owned: bool = False
+    webhook_nonce: Optional[str] = None
+    waiters: List[asyncio.Future] = field(default_factory=list)
+
+
+class StatusRateLimiter:
+    """Spaces status calls so each upstream sees at most ``max_qps``"""
+
+    def __init__(self, max_qps: float):
+        self.spacing = 1.0 / max_qps if max_qps > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+
+    async def wait(self, upstream: str):
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(upstream, now))
+        self._next_slot[upstream] = slot + self.spacing
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class KickoffPoller:
+    """Background scheduler that owns every PENDING kickoff.
+
+    Kickoffs are polled on an adaptive schedule: quickly at first, then
+    backing off geometrically (with jitter) for long-running crews. Status
+    calls are rate limited per upstream, and waiters are resolved with the
+    outcome returned by ``on_terminal`` once a kickoff settles.
+
+    When several worker processes share a kickoff store, ``claim_lease``
+    decides which worker polls a kickoff upstream. The other workers only
+    watch the store: every ``watch_interval`` seconds ``find_settled``
+    returns the outcomes of tracked kickoffs that were settled elsewhere
+    (by the lease holder or by a webhook delivered to another worker).
+    """
+
+    def __init__(
+        self,
+        fetch_status: Callable[..., Awaitable[Dict[str, Any]]],
+        on_terminal: Callable[[str, Dict[str, Any]], Dict[str, Any]],
+        on_expired: Callable[[str], Dict[str, Any]],
+        on_error: Callable[[str, Exception], Dict[str, Any]],
+        initial_interval: float = 2.0,
+        max_interval: float = 30.0,
+        backoff: float = 1.5,
+        jitter: float = 0.2,
+        max_status_qps: float = 5.0,
+        max_age_seconds: float = 6 * 3600,
+        max_consecutive_errors: int = 5,
+        claim_lease: Optional[Callable[[str], bool]] = None,
+        renew_leases: Optional[Callable[[List[str]], None]] = None,
+        release_leases: Optional[Callable[[], None]] = None,
+        find_settled: Optional[Callable[[List[str]], Dict[str, Dict[str, Any]]]] = None,
+        lease_seconds: float = 60.0,
+        watch_interval: float = 1.0,
+    ):
+        self.fetch_status = fetch_status
+        self.on_terminal = on_terminal
+        self.on_expired = on_expired
+        self.on_error = on_error
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.max_age_seconds = max_age_seconds
+        self.max_consecutive_errors = max_consecutive_errors
+        self.rate_limiter = StatusRateLimiter(max_status_qps)
+        self.claim_lease = claim_lease
+        self.renew_leases = renew_leases
+        self.release_leases = release_leases
+        self.find_settled = find_settled
+        self.lease_seconds = lease_seconds
+        self.watch_interval = watch_interval
+        self.tracked: Dict[str, TrackedKickoff] = {}
+        self._schedule: List[tuple] = []
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._loop_task: Optional[asyncio.Task] = None
+        self._watch_task: Optional[asyncio.Task] = None
+        self._poll_tasks = set()
+        # Webhook deliveries that arrived before their kickoff was tracked
+        self._early_deliveries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def _jittered(self, interval: float) -> float:
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _push(self, tracked: TrackedKickoff):
+        heapq.heappush(self._schedule, (tracked.next_poll_at, next(self._sequence), tracked.kickoff_id))
+
+    def track(self, kickoff_id: str, api_type: str, base_url: str, headers: Dict[str, str], webhook_nonce: Optional[str] = None, safety_interval: Optional[float] = None, age: float = 0.0) -> asyncio.Future:
+        """Start owning a kickoff and return a future for its outcome.
+
+        Kickoffs that report back through a webhook pass ``safety_interval``
+        so polling only runs as a slow fallback. ``age`` is how long the
+        kickoff has already been running, e.g. when recovered after a
+        restart; it counts towards ``max_age_seconds``.
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        tracked = self.tracked.get(kickoff_id)
+        if tracked is None:
+            now = time.monotonic()
+            interval = safety_interval or self.initial_interval
+            tracked = TrackedKickoff(
+                kickoff_id=kickoff_id,
+                api_type=api_type,
+                base_url=base_url,
+                headers=headers,
+                interval=interval,
+                max_interval=max(safety_interval or 0, self.max_interval),
+                next_poll_at=now + self._jittered(interval),
+                started_at=now - age,
+                webhook_nonce=webhook_nonce,
+            )
+            self.tracked[kickoff_id] = tracked
+            self._push(tracked)
+            self._wakeup.set()
+        tracked.waiters.append(future)
+
+        early = self._early_deliveries.pop(kickoff_id, None)
+        if early is not None and early[0] == tracked.webhook_nonce:
+            self.resolve(kickoff_id, self.on_terminal(kickoff_id, early[1]))
+        return future
+
+    def deliver(self, kickoff_id: str, webhook_nonce: str, status_data: Dict[str, Any]) -> bool:
+        """Settle a tracked kickoff from a webhook callback.
+
+        Returns False if the kickoff isn't tracked; the caller then settles
+        the stored record or, if there is none yet, calls ``hold``.
+        """
+        tracked = self.tracked.get(kickoff_id)
+        if tracked is None:
+            return False
+        if tracked.webhook_nonce != webhook_nonce:
+            raise ValueError("Webhook nonce does not match kickoff")
+        self.resolve(kickoff_id, self.on_terminal(kickoff_id, status_data))
+        return True
+
+    def hold(self, kickoff_id: str, webhook_nonce: str, status_data: Dict[str, Any]):
+        """Keep a webhook that beat its kickoff's record until ``track`` is called with the matching nonce"""
+        self._early_deliveries[kickoff_id] = (webhook_nonce, status_data)
+        while len(self._early_deliveries) > 1000:
+            self._early_deliveries.popitem(last=False)
+
+    def discard_held(self, kickoff_id: str):
+        """Drop a held webhook once its kickoff was settled some other way"""
+        self._early_deliveries.pop(kickoff_id, None)
+
+    def resolve(self, kickoff_id: str, outcome: Dict[str, Any], kind: Optional[str] = None):
+        """Stop tracking a kickoff and hand its outcome to every waiter"""
+        tracked = self.tracked.pop(kickoff_id, None)
+        if tracked is None:
+            return
+        kind = kind or ("success" if outcome.get("success") else "failed")
+        KICKOFF_TIME_TO_TERMINAL.labels(tracked.api_type, kind).observe(time.monotonic() - tracked.started_at)
+        KICKOFF_POLLS.labels(tracked.api_type).observe(tracked.polls)
+        for waiter in tracked.waiters:
+            if not waiter.done():
+                waiter.set_result(outcome)
+
+    def start(self):
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.get_running_loop().create_task(self._run())
+        if self.find_settled is not None and (self._watch_task is None or self._watch_task.done()):
+            self._watch_task = asyncio.get_running_loop().create_task(self._watch())
+
+    async def stop(self):
+        """Stop polling; tracked kickoffs stay PENDING in storage"""
+        for task in (self._loop_task, self._watch_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._loop_task = self._watch_task = None
+        for task in list(self._poll_tasks):
+            task.cancel()
+        # Let another worker take over our kickoffs straight away
+        if self.release_leases is not None:
+            self.release_leases()
+        for tracked in self.tracked.values():
+            for waiter in tracked.waiters:
+                waiter.cancel()
+        self.tracked.clear()
+        self._schedule.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        by_api_type: Dict[str, int] = {}
+        owned_by_api_type: Dict[str, int] = {}
+        for tracked in self.tracked.values():
+            by_api_type[tracked.api_type] = by_api_type.get(tracked.api_type, 0) + 1
+            if tracked.owned:
+                owned_by_api_type[tracked.api_type] = owned_by_api_type.get(tracked.api_type, 0) + 1
+        return {
+            "tracked": len(self.tracked),
+            "owned": sum(owned_by_api_type.values()),
+            "by_api_type": by_api_type,
+            "owned_by_api_type": owned_by_api_type,
+        }
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            now = time.monotonic()
+            while self._schedule and self._schedule[0][0] <= now:
+                _, _, kickoff_id = heapq.heappop(self._schedule)
+                tracked = self.tracked.get(kickoff_id)
+                if tracked is None or tracked.in_flight:
+                    continue
+                tracked.in_flight = True
+                task = asyncio.create_task(self._poll(tracked))
+                self._poll_tasks.add(task)
+                task.add_done_callback(self._poll_tasks.discard)
+
+            delay = self._schedule[0][0] - time.monotonic() if self._schedule else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _reschedule(self, tracked: TrackedKickoff):
+        # Back off for long-running crews
+        tracked.interval = min(tracked.interval * self.backoff, tracked.max_interval)
+        tracked.next_poll_at = time.monotonic() + self._jittered(tracked.interval)
+        self._push(tracked)
+        self._wakeup.set()
+
+    async def _watch(self):
+        """Resolve kickoffs settled elsewhere and keep our leases alive"""
+        last_renewal = time.monotonic()
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            try:
+                if self.tracked:
+                    for kickoff_id, outcome in self.find_settled(list(self.tracked)).items():
+                        self.resolve(kickoff_id, outcome, kind="elsewhere")
+                if self.renew_leases is not None and time.monotonic() - last_renewal > self.lease_seconds / 3:
+                    last_renewal = time.monotonic()
+                    owned = [kickoff_id for kickoff_id, tracked in self.tracked.items() if tracked.owned]
+                    if owned:
+                        self.renew_leases(owned)
+            except Exception as e:
+                log.warning("Error watching kickoff store", extra={"error": str(e)})
+
+    async def _poll(self, tracked: TrackedKickoff):
+        kickoff_id = tracked.kickoff_id
+        try:
+            # Another worker holds the lease: leave the upstream to it
+            if self.claim_lease is not None:
+                tracked.owned = self.claim_lease(kickoff_id)
+            else:
+                tracked.owned = True
+            if not tracked.owned:
+                self._reschedule(tracked)
+                return
+
+            if time.monotonic() - tracked.started_at > self.max_age_seconds:
+                log.warning("Kickoff still running, giving up", extra={"kickoff_id": kickoff_id, "api_type": tracked.api_type, "max_age_seconds": self.max_age_seconds})
+                self.resolve(kickoff_id, self.on_expired(kickoff_id), kind="timeout")
+                return
+
+            await self.rate_limiter.wait(tracked.base_url)
+            tracked.polls += 1
+            try:
+                status_data = await self.fetch_status(tracked.base_url, tracked.headers, kickoff_id, api_type=tracked.api_type)
+            except Exception as e:
+                tracked.consecutive_errors += 1
+                log.warning("Status check failed", extra={"kickoff_id": kickoff_id, "api_type": tracked.api_type, "errors": tracked.consecutive_errors, "max_errors": self.max_consecutive_errors, "error": str(e)})
+                if tracked.consecutive_errors >= self.max_consecutive_errors:
+                    self.resolve(kickoff_id, self.on_error(kickoff_id, e), kind="error")
+                    return
+            else:
+                tracked.consecutive_errors = 0
+                state = status_data.get("state")
+                log.debug("Polled kickoff", extra={"kickoff_id": kickoff_id, "api_type": tracked.api_type, "poll": tracked.polls, "state": state, "sample": True})
+                if state in TERMINAL_STATES:
+                    self.resolve(kickoff_id, self.on_terminal(kickoff_id, status_data))
+                    return
+
+            self._reschedule(tracked)
+        except Exception as e:
+            log.exception("Unexpected error polling kickoff", extra={"kickoff_id": kickoff_id, "api_type": tracked.api_type})
+            self.resolve(kickoff_id, self.on_error(kickoff_id, e), kind="error")
+        finally:
+            tracked.in_flight = False
@@ -0,0 +1,483 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from logs import get_logger
+from metrics import STORE_WRITE_LATENCY
+
+log = get_logger("kickoff_store")
+
+# Columns stored for every kickoff record
+KICKOFF_COLUMNS = (
+    "status",
+    "created_at",
+    "updated_at",
+    "api_type",
+    "submission_id",
+    "base_url",
+    "token",
+    "result",
+    "error",
+    "webhook_nonce",
+    "request_key",
+)
+
+# Cross-process ownership of PENDING kickoffs (not part of the record)
+LEASE_COLUMNS = (("lease_owner", "TEXT"), ("lease_expires", "REAL"))
+
+# Set when the result lives compressed in kickoff_results
+STORAGE_COLUMNS = (("result_offloaded", "INTEGER"),)
+
+# Upstream credentials are only needed while a kickoff can still be polled
+CREDENTIAL_COLUMNS = ("base_url", "token")
+SETTLED_STATES = ("SUCCESS", "FAILED")
+
+# Columns safe to return from the API (no upstream URLs or secrets)
+PUBLIC_COLUMNS = (
+    "status",
+    "created_at",
+    "updated_at",
+    "api_type",
+    "submission_id",
+    "result",
+    "error",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS kickoffs (
+    kickoff_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    api_type TEXT,
+    submission_id TEXT,
+    base_url TEXT,
+    token TEXT,
+    result TEXT,
+    error TEXT,
+    webhook_nonce TEXT,
+    request_key TEXT,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result_offloaded INTEGER
+);
+CREATE TABLE IF NOT EXISTS kickoff_results (
+    kickoff_id TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS settings (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_kickoffs_status ON kickoffs (status);
+CREATE INDEX IF NOT EXISTS idx_kickoffs_api_type ON kickoffs (api_type);
+CREATE INDEX IF NOT EXISTS idx_kickoffs_submission_id ON kickoffs (submission_id);
+CREATE INDEX IF NOT EXISTS idx_kickoffs_created_at ON kickoffs (created_at);
+CREATE INDEX IF NOT EXISTS idx_kickoffs_updated_at ON kickoffs (updated_at);
+"""
+
+
+def _chunks(items: Sequence[str], size: int = 500):
+    """Split IN (...) lists below SQLite's bound parameter limit"""
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class KickoffStore:
+    """SQLite-backed kickoff registry with per-record upserts.
+
+    The database runs in WAL mode so each state change is a small,
+    crash-safe transaction instead of a rewrite of the whole history.
+    Several worker processes can share one database: PENDING kickoffs are
+    leased so that only one worker polls each of them upstream.
+
+    Results larger than ``result_inline_bytes`` are zlib-compressed into a
+    side table and only read when a record's result is requested, and
+    settled kickoffs drop their upstream URL and token.
+    """
+
+    def __init__(self, path: str, result_inline_bytes: int = 4096):
+        self.path = path
+        self.result_inline_bytes = result_inline_bytes
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._add_missing_columns()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _add_missing_columns(self):
+        """Add columns introduced after a database was first created"""
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(kickoffs)")}
+        for column, column_type in [(column, "TEXT") for column in KICKOFF_COLUMNS] + list(LEASE_COLUMNS) + list(STORAGE_COLUMNS):
+            if column not in existing:
+                try:
+                    self._conn.execute(f"ALTER TABLE kickoffs ADD COLUMN {column} {column_type}")
+                except sqlite3.OperationalError as e:
+                    # Another worker added it first
+                    if "duplicate column" not in str(e):
+                        raise
+        # Indexes on added columns can only be created once they exist
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_kickoffs_request_key ON kickoffs (request_key, status)")
+
+    def migrate_json(self, json_path: str):
+        """Import records from the old kickoff_storage.json file once"""
+        if not os.path.exists(json_path):
+            return
+        try:
+            # The write lock serializes workers starting at the same time
+            self._conn.execute("BEGIN IMMEDIATE")
+            if not os.path.exists(json_path):
+                self._conn.execute("ROLLBACK")
+                return
+            with open(json_path, "r") as f:
+                legacy = json.load(f)
+            for kickoff_id, record in legacy.items():
+                self.upsert(kickoff_id, record)
+            os.replace(json_path, json_path + ".migrated")
+            self._conn.execute("COMMIT")
+            log.info("Migrated legacy kickoff storage", extra={"kickoffs": len(legacy), "path": json_path})
+        except Exception as e:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            log.warning("Error migrating kickoff storage", extra={"path": json_path, "error": str(e)})
+
+    def _row_to_record(self, row: sqlite3.Row, columns: Sequence[str] = KICKOFF_COLUMNS) -> Dict[str, Any]:
+        record = {column: row[column] for column in columns}
+        if "result" in record and row["result_offloaded"]:
+            # Compressed results are only read when asked for
+            blob = self._conn.execute("SELECT data FROM kickoff_results WHERE kickoff_id = ?", (row["kickoff_id"],)).fetchone()
+            record["result"] = zlib.decompress(blob[0]).decode("utf-8") if blob else None
+        if record.get("result") is not None:
+            record["result"] = json.loads(record["result"])
+        return record
+
+    @contextmanager
+    def _atomic(self):
+        """Group statements into one transaction; nests inside an open one"""
+        self._conn.execute("SAVEPOINT kickoff_write")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK TO kickoff_write")
+            self._conn.execute("RELEASE kickoff_write")
+            raise
+        self._conn.execute("RELEASE kickoff_write")
+
+    def _store_result(self, kickoff_id: str, result: Any) -> Tuple[Optional[str], int]:
+        """Serialize a result, offloading it if large; returns the column values.
+
+        Call with the lock held, in the same _atomic() block as the row write.
+        """
+        encoded = json.dumps(result)
+        if len(encoded) <= self.result_inline_bytes:
+            self._conn.execute("DELETE FROM kickoff_results WHERE kickoff_id = ?", (kickoff_id,))
+            return encoded, 0
+        self._conn.execute(
+            "INSERT OR REPLACE INTO kickoff_results (kickoff_id, data) VALUES (?, ?)",
+            (kickoff_id, zlib.compress(encoded.encode("utf-8"))),
+        )
+        return None, 1
+
+    def get(self, kickoff_id: str) -> Optional[Dict[str, Any]]:
+        """Get a single kickoff record"""
+        row = self._conn.execute("SELECT * FROM kickoffs WHERE kickoff_id = ?", (kickoff_id,)).fetchone()
+        return self._row_to_record(row) if row else None
+
+    def __contains__(self, kickoff_id: str) -> bool:
+        row = self._conn.execute("SELECT 1 FROM kickoffs WHERE kickoff_id = ?", (kickoff_id,)).fetchone()
+        return row is not None
+
+    def upsert(self, kickoff_id: str, record: Dict[str, Any]):
+        """Insert or replace a full kickoff record"""
+        now = datetime.now().isoformat()
+        values = {column: record.get(column) for column in KICKOFF_COLUMNS}
+        values["created_at"] = values["created_at"] or now
+        values["updated_at"] = now
+        if values["status"] in SETTLED_STATES:
+            values.update(dict.fromkeys(CREDENTIAL_COLUMNS))
+        columns = ", ".join(KICKOFF_COLUMNS)
+        placeholders = ", ".join("?" for _ in KICKOFF_COLUMNS)
+        try:
+            with self._lock, STORE_WRITE_LATENCY.labels("upsert").time(), self._atomic():
+                offloaded = 0
+                if values["result"] is not None:
+                    values["result"], offloaded = self._store_result(kickoff_id, values["result"])
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO kickoffs (kickoff_id, {columns}, result_offloaded) VALUES (?, {placeholders}, ?)",
+                    (kickoff_id, *[values[column] for column in KICKOFF_COLUMNS], offloaded),
+                )
+        except sqlite3.Error as e:
+            log.warning("Error saving kickoff", extra={"kickoff_id": kickoff_id, "error": str(e)})
+
+    def update(self, kickoff_id: str, **fields: Any):
+        """Update selected fields of an existing kickoff record"""
+        unknown = set(fields) - set(KICKOFF_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown kickoff fields: {', '.join(sorted(unknown))}")
+        fields["updated_at"] = datetime.now().isoformat()
+        if fields.get("status") in SETTLED_STATES:
+            fields.update(dict.fromkeys(CREDENTIAL_COLUMNS))
+        try:
+            with self._lock, STORE_WRITE_LATENCY.labels("update").time(), self._atomic():
+                if "result" in fields:
+                    if fields["result"] is None:
+                        fields["result_offloaded"] = 0
+                    else:
+                        fields["result"], fields["result_offloaded"] = self._store_result(kickoff_id, fields["result"])
+                assignments = ", ".join(f"{column} = ?" for column in fields)
+                self._conn.execute(
+                    f"UPDATE kickoffs SET {assignments} WHERE kickoff_id = ?",
+                    (*fields.values(), kickoff_id),
+                )
+        except sqlite3.Error as e:
+            log.warning("Error updating kickoff", extra={"kickoff_id": kickoff_id, "error": str(e)})
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        api_type: Optional[str] = None,
+        submission_id: Optional[str] = None,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        updated_after: Optional[str] = None,
+        order_by: str = "created_at",
+        after: Optional[Tuple[str, str]] = None,
+        limit: int = 100,
+        columns: Sequence[str] = PUBLIC_COLUMNS,
+    ) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Filtered page of kickoff records in (order_by, kickoff_id) order.
+
+        ``after`` is the (order_by value, kickoff_id) of the last row of the
+        previous page. Only the requested columns are read.
+        """
+        if order_by not in ("created_at", "updated_at"):
+            raise ValueError(f"Cannot order kickoffs by {order_by}")
+        clauses, params = [], []
+        for column, value in (("status", status), ("api_type", api_type), ("submission_id", submission_id)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if created_after is not None:
+            clauses.append("created_at > ?")
+            params.append(created_after)
+        if created_before is not None:
+            clauses.append("created_at < ?")
+            params.append(created_before)
+        if updated_after is not None:
+            clauses.append("updated_at > ?")
+            params.append(updated_after)
+        if after is not None:
+            clauses.append(f"({order_by}, kickoff_id) > (?, ?)")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        selected = ", ".join(dict.fromkeys(["kickoff_id", order_by, *columns, "result_offloaded"]))
+        # Returned as (kickoff_id, order_by value, projected record)
+        rows = self._conn.execute(
+            f"SELECT {selected} FROM kickoffs {where} ORDER BY {order_by}, kickoff_id LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+        return [(row["kickoff_id"], row[order_by], self._row_to_record(row, columns)) for row in rows]
+
+    def find_pending(self, request_key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Newest PENDING kickoff started for the same request payload"""
+        row = self._conn.execute(
+            "SELECT * FROM kickoffs WHERE request_key = ? AND status = 'PENDING' ORDER BY created_at DESC LIMIT 1",
+            (request_key,),
+        ).fetchone()
+        return (row["kickoff_id"], self._row_to_record(row)) if row else None
+
+    def unleased_pending(self, updated_before: str) -> List[Dict[str, Any]]:
+        """PENDING kickoffs no worker holds a live lease on.
+
+        Only the columns needed to resume polling are read. Kickoffs updated
+        after ``updated_before`` are skipped: they were just started and
+        their worker hasn't claimed them yet.
+        """
+        rows = self._conn.execute(
+            "SELECT kickoff_id, created_at, api_type, base_url, token, webhook_nonce, request_key FROM kickoffs "
+            "WHERE status = 'PENDING' AND updated_at < ? AND (lease_owner IS NULL OR lease_expires < ?)",
+            (updated_before, time.time()),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def claim_lease(self, kickoff_id: str, owner: str, ttl: float) -> bool:
+        """Take or renew the polling lease on a PENDING kickoff.
+
+        Succeeds if the lease is free, expired or already held by ``owner``.
+        Kickoffs without a stored record have nothing to coordinate and can
+        always be polled.
+        """
+        now = time.time()
+        with self._lock:
+            claimed = self._conn.execute(
+                "UPDATE kickoffs SET lease_owner = ?, lease_expires = ? WHERE kickoff_id = ? AND status = 'PENDING' "
+                "AND (lease_owner IS NULL OR lease_owner = ? OR lease_expires < ?)",
+                (owner, now + ttl, kickoff_id, owner, now),
+            ).rowcount
+        return claimed == 1 or kickoff_id not in self
+
+    def renew_leases(self, owner: str, kickoff_ids: Sequence[str], ttl: float):
+        """Extend every lease ``owner`` still holds among ``kickoff_ids``"""
+        expires = time.time() + ttl
+        with self._lock:
+            for chunk in _chunks(kickoff_ids):
+                self._conn.execute(
+                    f"UPDATE kickoffs SET lease_expires = ? WHERE lease_owner = ? AND kickoff_id IN ({', '.join('?' for _ in chunk)})",
+                    (expires, owner, *chunk),
+                )
+
+    def release_leases(self, owner: str):
+        """Give up every lease held by ``owner`` so other workers can poll"""
+        with self._lock:
+            self._conn.execute("UPDATE kickoffs SET lease_owner = NULL, lease_expires = NULL WHERE lease_owner = ?", (owner,))
+
+    def settled(self, kickoff_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Records among ``kickoff_ids`` that are no longer PENDING"""
+        records = {}
+        for chunk in _chunks(kickoff_ids):
+            rows = self._conn.execute(
+                f"SELECT kickoff_id, {', '.join(KICKOFF_COLUMNS)}, result_offloaded FROM kickoffs "
+                f"WHERE status != 'PENDING' AND kickoff_id IN ({', '.join('?' for _ in chunk)})",
+                tuple(chunk),
+            ).fetchall()
+            records.update((row["kickoff_id"], self._row_to_record(row)) for row in rows)
+        return records
+
+    def setting(self, name: str, default: str) -> str:
+        """Read a shared setting, storing ``default`` if it isn't set yet"""
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO settings (name, value) VALUES (?, ?)", (name, default))
+        return self._conn.execute("SELECT value FROM settings WHERE name = ?", (name,)).fetchone()[0]
+
+    def version(self) -> Tuple[int, Optional[str]]:
+        """Cheap change marker: (row count, latest updated_at)"""
+        return tuple(self._conn.execute("SELECT COUNT(*), MAX(updated_at) FROM kickoffs").fetchone())
+
+    def count_by_status(self) -> Dict[str, int]:
+        rows = self._conn.execute("SELECT status, COUNT(*) FROM kickoffs GROUP BY status").fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM kickoffs").fetchone()[0]
+
+    @staticmethod
+    @contextmanager
+    def _transaction(conn: sqlite3.Connection):
+        """Write transaction that takes SQLite's write lock up front"""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _delete_batches(conn: sqlite3.Connection, where: str, params: Sequence[Any] = (), batch_size: int = 500) -> int:
+        """Delete matching records a batch at a time so other writers aren't blocked for long"""
+        deleted = 0
+        while True:
+            removed = conn.execute(
+                f"DELETE FROM kickoffs WHERE kickoff_id IN (SELECT kickoff_id FROM kickoffs WHERE {where} LIMIT ?)",
+                (*params, batch_size),
+            ).rowcount
+            deleted += removed
+            if removed < batch_size:
+                return deleted
+
+    def compact(
+        self,
+        max_age_seconds: Optional[float] = None,
+        max_count: Optional[int] = None,
+        status_ttls: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, int]:
+        """Apply retention policies and tidy up storage.
+
+        PENDING kickoffs are never deleted. Other records are deleted once
+        older than ``max_age_seconds`` (by created_at), once not updated for
+        their status's TTL in ``status_ttls``, or when they are not among
+        the newest ``max_count``. Also strips credentials from settled
+        records, offloads large inline results and drops orphaned results.
+        """
+        stats = {"expired": 0, "expired_by_status": 0, "over_count": 0, "credentials_stripped": 0, "results_offloaded": 0, "orphaned_results": 0}
+        now = datetime.now()
+        # Compaction runs in a thread: it uses a connection of its own so the
+        # shared one is never used from two threads at once
+        conn = self._connect()
+        try:
+            if max_age_seconds:
+                cutoff = datetime.fromtimestamp(now.timestamp() - max_age_seconds).isoformat()
+                stats["expired"] = self._delete_batches(conn, "status != 'PENDING' AND created_at < ?", (cutoff,))
+            for status, ttl in (status_ttls or {}).items():
+                if status != "PENDING" and ttl:
+                    cutoff = datetime.fromtimestamp(now.timestamp() - ttl).isoformat()
+                    stats["expired_by_status"] += self._delete_batches(conn, "status = ? AND updated_at < ?", (status, cutoff))
+            if max_count:
+                row = conn.execute(
+                    "SELECT created_at, kickoff_id FROM kickoffs WHERE status != 'PENDING' ORDER BY created_at DESC, kickoff_id DESC LIMIT 1 OFFSET ?",
+                    (max_count - 1,),
+                ).fetchone()
+                if row is not None:
+                    stats["over_count"] = self._delete_batches(
+                        conn, "status != 'PENDING' AND (created_at, kickoff_id) < (?, ?)", (row["created_at"], row["kickoff_id"])
+                    )
+
+            placeholders = ", ".join("?" for _ in SETTLED_STATES)
+            stats["credentials_stripped"] = conn.execute(
+                f"UPDATE kickoffs SET base_url = NULL, token = NULL WHERE status IN ({placeholders}) "
+                "AND (base_url IS NOT NULL OR token IS NOT NULL)",
+                SETTLED_STATES,
+            ).rowcount
+
+            # Results stored inline before offloading existed, or under a larger limit
+            while True:
+                with self._transaction(conn):
+                    # Read and rewrite in one transaction so no update lands in between
+                    rows = conn.execute(
+                        "SELECT kickoff_id, result FROM kickoffs WHERE result IS NOT NULL AND length(result) > ? LIMIT 100",
+                        (self.result_inline_bytes,),
+                    ).fetchall()
+                    for row in rows:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO kickoff_results (kickoff_id, data) VALUES (?, ?)",
+                            (row["kickoff_id"], zlib.compress(row["result"].encode("utf-8"))),
+                        )
+                        conn.execute(
+                            "UPDATE kickoffs SET result = NULL, result_offloaded = 1 WHERE kickoff_id = ?",
+                            (row["kickoff_id"],),
+                        )
+                if not rows:
+                    break
+                stats["results_offloaded"] += len(rows)
+
+            stats["orphaned_results"] = conn.execute(
+                "DELETE FROM kickoff_results WHERE kickoff_id NOT IN (SELECT kickoff_id FROM kickoffs WHERE result_offloaded = 1)"
+            ).rowcount
+            # Keep the write-ahead log from holding on to the freed pages
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            conn.close()
+        return stats
+
+    def clear(self):
+        """Delete every kickoff record"""
+        with self._lock:
+            self._conn.execute("DELETE FROM kickoffs")
+            self._conn.execute("DELETE FROM kickoff_results")
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,242 @@
+import json
+import math
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from sortedcontainers import SortedList
+
+from logs import get_logger
+from rubric import CompiledRubric, compile_rubric
+
+log = get_logger("leaderboard")
+
+# Percentiles of the total score reported for every leaderboard
+LEADERBOARD_PERCENTILES = (25, 50, 75, 90)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leaderboard_rubrics (
+    rubric_id TEXT PRIMARY KEY,
+    rubric TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leaderboard_entries (
+    rubric_id TEXT NOT NULL,
+    submission_id TEXT NOT NULL,
+    project_name TEXT,
+    total REAL NOT NULL,
+    percent REAL,
+    scores TEXT NOT NULL,
+    valid INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (rubric_id, submission_id)
+);
+CREATE INDEX IF NOT EXISTS idx_leaderboard_entries_seq ON leaderboard_entries (rubric_id, seq);
+"""
+
+
+class RunningStats:
+    """Count, mean and standard deviation updated in O(1) (Welford), with removal"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def remove(self, value: float):
+        if self.count <= 1:
+            self.count, self.mean, self._m2 = 0, 0.0, 0.0
+            return
+        old_mean = self.mean
+        self.count -= 1
+        self.mean = (old_mean * (self.count + 1) - value) / self.count
+        self._m2 = max(0.0, self._m2 - (value - old_mean) * (value - self.mean))
+
+    def summary(self) -> Dict[str, Any]:
+        stddev = math.sqrt(self._m2 / self.count) if self.count else 0.0
+        return {"count": self.count, "mean": round(self.mean, 4), "stddev": round(stddev, 4)}
+
+
+class Leaderboard:
+    """Ranked scores of one rubric's submissions.
+
+    Entries sit in a sorted list keyed by (-total, submission_id), so a new
+    or re-graded submission, a rank lookup and a percentile are each
+    O(log n), and top-N is O(N). Per-criterion statistics are updated
+    incrementally as entries come and go.
+    """
+
+    def __init__(self, rubric: CompiledRubric, created_at: float = 0.0):
+        self.rubric = rubric
+        self.created_at = created_at
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.seq = 0
+        self._ranking = SortedList()
+        self._totals = RunningStats()
+        self._criteria = {criterion.key: RunningStats() for criterion in rubric.criteria}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _discard(self, entry: Dict[str, Any]):
+        self._ranking.remove((-entry["total"], entry["submission_id"]))
+        self._totals.remove(entry["total"])
+        for key, value in entry["scores"].items():
+            if key in self._criteria:
+                self._criteria[key].remove(value)
+
+    def upsert(self, entry: Dict[str, Any]):
+        """Add a submission's score, replacing its previous one"""
+        previous = self.entries.get(entry["submission_id"])
+        if previous is not None:
+            self._discard(previous)
+        self.entries[entry["submission_id"]] = entry
+        self._ranking.add((-entry["total"], entry["submission_id"]))
+        self._totals.add(entry["total"])
+        for key, value in entry["scores"].items():
+            if key in self._criteria:
+                self._criteria[key].add(value)
+
+    def rank(self, submission_id: str) -> Optional[int]:
+        """1-based rank of a submission, or None if it isn't on the board"""
+        entry = self.entries.get(submission_id)
+        if entry is None:
+            return None
+        return self._ranking.index((-entry["total"], submission_id)) + 1
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Nearest-rank percentile of the totals (higher pct = better score)"""
+        if not self._ranking:
+            return None
+        count = len(self._ranking)
+        ascending_rank = max(0, min(count - 1, math.ceil(pct / 100 * count) - 1))
+        return -self._ranking[count - 1 - ascending_rank][0]
+
+    def top(self, limit: int) -> List[Dict[str, Any]]:
+        return [
+            {"rank": position + 1, **self.entries[submission_id]}
+            for position, (_, submission_id) in enumerate(self._ranking.islice(0, limit))
+        ]
+
+    def snapshot(self, limit: int) -> Dict[str, Any]:
+        criteria = {}
+        for criterion in self.rubric.criteria:
+            criteria[criterion.key] = {
+                **self._criteria[criterion.key].summary(),
+                "minimum": criterion.minimum,
+                "maximum": criterion.maximum,
+                "weight": criterion.weight,
+            }
+        return {
+            "rubric_id": self.rubric.rubric_id,
+            "entries": len(self.entries),
+            "max_total": self.rubric.max_total,
+            "top": self.top(limit),
+            "percentiles": {f"p{pct}": self.percentile(pct) for pct in LEADERBOARD_PERCENTILES},
+            "total": self._totals.summary(),
+            "criteria": criteria,
+        }
+
+
+class LeaderboardStore:
+    """Leaderboards per rubric, persisted to SQLite.
+
+    Every score write gets a sequence number, so a worker brings its
+    in-memory boards up to date by applying only the rows written since
+    it last looked, including those written by other workers.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(SCHEMA)
+        self._boards: Dict[str, Leaderboard] = {}
+
+    def record(self, rubric: CompiledRubric, submission_id: str, project_name: Optional[str], score: Dict[str, Any]):
+        """Store a submission's score on its rubric's leaderboard"""
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO leaderboard_rubrics (rubric_id, rubric, created_at) VALUES (?, ?, ?)",
+                    (rubric.rubric_id, json.dumps(rubric.schema), now),
+                )
+                self._conn.execute(
+                    """INSERT OR REPLACE INTO leaderboard_entries
+                       (rubric_id, submission_id, project_name, total, percent, scores, valid, updated_at, seq)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM leaderboard_entries))""",
+                    (rubric.rubric_id, submission_id, project_name, score["total"], score["percent"],
+                     json.dumps(score["scores"]), int(score["valid"]), now),
+                )
+        except sqlite3.Error as e:
+            log.warning("Error saving leaderboard entry", extra={"submission_id": submission_id, "error": str(e)})
+
+    def _sync(self, board: Leaderboard):
+        rows = self._conn.execute(
+            """SELECT submission_id, project_name, total, percent, scores, valid, updated_at, seq
+               FROM leaderboard_entries WHERE rubric_id = ? AND seq > ? ORDER BY seq""",
+            (board.rubric.rubric_id, board.seq),
+        ).fetchall()
+        for row in rows:
+            board.upsert({
+                "submission_id": row["submission_id"],
+                "project_name": row["project_name"],
+                "total": row["total"],
+                "percent": row["percent"],
+                "scores": json.loads(row["scores"]),
+                "valid": bool(row["valid"]),
+                "updated_at": row["updated_at"],
+            })
+            board.seq = row["seq"]
+
+    def get(self, rubric_id: str) -> Optional[Leaderboard]:
+        """A rubric's leaderboard with every stored score applied"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT rubric, created_at FROM leaderboard_rubrics WHERE rubric_id = ?", (rubric_id,)
+            ).fetchone()
+            if row is None:
+                self._boards.pop(rubric_id, None)
+                return None
+            board = self._boards.get(rubric_id)
+            # A board cleared and recreated (possibly by another worker) is rebuilt from scratch
+            if board is None or board.created_at != row["created_at"]:
+                board = self._boards[rubric_id] = Leaderboard(compile_rubric(row["rubric"]), row["created_at"])
+            self._sync(board)
+            return board
+
+    def rubrics(self) -> List[Dict[str, Any]]:
+        """Every rubric with a leaderboard, most recently updated first"""
+        rows = self._conn.execute(
+            """SELECT r.rubric_id, COUNT(e.submission_id) AS entries, MAX(e.updated_at) AS updated_at
+               FROM leaderboard_rubrics r LEFT JOIN leaderboard_entries e ON e.rubric_id = r.rubric_id
+               GROUP BY r.rubric_id ORDER BY updated_at DESC"""
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def clear(self, rubric_ids: Optional[Sequence[str]] = None):
+        """Drop the given leaderboards, or all of them"""
+        with self._lock:
+            if rubric_ids is None:
+                self._conn.execute("DELETE FROM leaderboard_entries")
+                self._conn.execute("DELETE FROM leaderboard_rubrics")
+                self._boards.clear()
+                return
+            for rubric_id in rubric_ids:
+                self._conn.execute("DELETE FROM leaderboard_entries WHERE rubric_id = ?", (rubric_id,))
+                self._conn.execute("DELETE FROM leaderboard_rubrics WHERE rubric_id = ?", (rubric_id,))
+                self._boards.pop(rubric_id, None)
+
+    def close(self):
+        self._conn.close()
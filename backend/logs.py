@@ -0,0 +1,156 @@
+import atexit
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional
+
+import orjson
+
+# Log settings shared by every backend module
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+# Fraction of hot-path records (logged with extra={"sample": True}) that are kept
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", 0.1))
+# Records waiting for the writer thread; beyond this new records are dropped, never waited on
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+
+APP_LOGGER = "hackreview"
+
+REDACTED = "[REDACTED]"
+_SECRET_KEY = re.compile(r"(^|_)(token|secret|password|authorization|api_?key|signature|sig)$", re.IGNORECASE)
+_SECRET_TEXT = re.compile(r"(bearer\s+|(?:token|secret|signature|sig|api[_-]?key)=)[^\s&,'\"]+", re.IGNORECASE)
+
+# LogRecord attributes that aren't structured fields passed through ``extra``
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "sample", "taskName"}
+
+
+def redact(value: Any) -> Any:
+    """Mask secrets in a log field: values under secret-looking keys and bearer tokens in text"""
+    if isinstance(value, str):
+        return _SECRET_TEXT.sub(lambda match: match.group(1) + REDACTED, value)
+    if isinstance(value, dict):
+        return {key: REDACTED if isinstance(key, str) and _SECRET_KEY.search(key) else redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value]
+    return value
+
+
+def _fields(record: logging.LogRecord) -> dict:
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and the record's extra fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": redact(record.getMessage()),
+            **redact(_fields(record)),
+        }
+        if record.exc_text:
+            entry["exc"] = redact(record.exc_text)
+        return orjson.dumps(entry, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local development: message followed by key=value fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = " ".join(f"{key}={value}" for key, value in redact(_fields(record)).items())
+        line = f"{time.strftime('%H:%M:%S', time.localtime(record.created))} {record.levelname:<7} {record.name} {redact(record.getMessage())}"
+        if fields:
+            line = f"{line} {fields}"
+        if record.exc_text:
+            line = f"{line}\n{redact(record.exc_text)}"
+        return line
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a ``rate`` fraction of records marked as sampled; other records always pass"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not getattr(record, "sample", False) or random.random() < self.rate
+
+
+class AccessLogRedactionFilter(logging.Filter):
+    """Masks secrets in the request paths of uvicorn's access log, e.g. a webhook's ?sig="""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.args, tuple) and len(record.args) >= 3:
+            # (client address, method, path with query string, HTTP version, status)
+            args = list(record.args)
+            args[2] = redact(str(args[2]))
+            record.args = tuple(args)
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Hands records to the writer thread, dropping them if it falls behind.
+
+    Formatting and writing happen on the listener thread, so logging on
+    the event loop costs a filter check and a queue put.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message now: its arguments may change before the writer gets to it
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging():
+    """Route the backend's loggers through a queue to a writer thread (once per process)"""
+    global _listener
+    if _listener is not None:
+        return
+    writer = logging.StreamHandler(sys.stdout)
+    writer.setFormatter(TextFormatter() if LOG_FORMAT == "text" else JsonFormatter())
+    log_queue: queue.Queue = queue.Queue(LOG_QUEUE_SIZE)
+    handler = NonBlockingQueueHandler(log_queue)
+    handler.addFilter(SamplingFilter(LOG_SAMPLE_RATE))
+
+    app_logger = logging.getLogger(APP_LOGGER)
+    app_logger.setLevel(LOG_LEVEL)
+    app_logger.addHandler(handler)
+    app_logger.propagate = False
+
+    # uvicorn writes its access log itself; the filter survives its logging config
+    logging.getLogger("uvicorn.access").addFilter(AccessLogRedactionFilter())
+
+    _listener = QueueListener(log_queue, writer)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger for a backend module, e.g. get_logger("poller")"""
+    configure_logging()
+    return logging.getLogger(f"{APP_LOGGER}.{name}")
@@ -1,58 +1,170 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Dict, Any, Optional, List
-import requests
-import time
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.requests import ClientDisconnect
+from pydantic import BaseModel, ValidationError
+from typing import Dict, Any, Optional, List, Literal, Union
+import httpx
+import orjson
 import os
+import time
 import asyncio
 import json
 import random
+import uuid
+import hmac
+import hashlib
+import base64
+import secrets
+import socket
+import math
+from contextvars import ContextVar
 from datetime import datetime
 from dotenv import load_dotenv
 import uvicorn
 from contextlib import asynccontextmanager
+from crew_client import get_client, close_clients
+from compression import CompressionMiddleware
+from logs import get_logger
+from kickoff_store import KickoffStore, PUBLIC_COLUMNS
+from job_store import JobStore
+from result_cache import ResultCache, CACHE_MODES, make_cache_key
+from kickoff_poller import KickoffPoller, TERMINAL_STATES
+from dedupe import DuplicateIndex, find_duplicates
+from ingest import IngestError, MultipartReader, detect_format, make_parser, normalize_submission
+from rubric import RubricError, compile_rubric
+from leaderboard import LeaderboardStore
+from upstream_limits import get_limiter, limiter_stats, UpstreamUnavailable, QueueFull, PRIORITY_CLASSES
+from metrics import KICKOFF_LATENCY, KICKOFF_RETRIES, UPSTREAM_RESPONSES, KICKOFFS_IN_FLIGHT, KICKOFFS_STORED, SPECULATIVE_GRADES, COALESCED_REQUESTS
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest, multiprocess
 
 load_dotenv()
 
-app = FastAPI(title="CrewAI Hackathon Backend", version="1.0.0")
+log = get_logger("api")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown"""
+    # One-time import of the kickoff_storage.json file used before SQLite
+    await asyncio.to_thread(kickoff_store.migrate_json, KICKOFF_STORAGE_FILE)
+    kickoff_poller.start()
+    # Re-attach kickoffs and jobs left behind by a restart or a dead worker
+    recovery_task = asyncio.create_task(recover_periodically())
+    compaction_task = asyncio.create_task(compact_periodically()) if STORAGE_COMPACT_INTERVAL_SECONDS > 0 else None
+    yield
+    for task in (recovery_task, compaction_task):
+        if task is not None:
+            task.cancel()
+    await kickoff_poller.stop()
+    job_store.release_leases(WORKER_ID)
+    # Release pooled upstream connections
+    await close_clients()
+    kickoff_store.close()
+    job_store.close()
+    leaderboard_store.close()
+    result_cache.close()
+
+# Scheduling class and tenant of the current request's upstream kickoffs
+request_priority: ContextVar[str] = ContextVar("request_priority", default="interactive")
+request_tenant: ContextVar[Optional[str]] = ContextVar("request_tenant", default=None)
+PRIORITY_BY_PATH = {"/api/batch": "batch", "/api/ingest": "batch"}
+
+async def assign_priority(request: Request):
+    """Set the request's priority class and tenant from X-Priority / X-Tenant-Id or its path"""
+    priority = request.headers.get("X-Priority") or PRIORITY_BY_PATH.get(request.url.path, "interactive")
+    if priority not in PRIORITY_CLASSES:
+        raise HTTPException(status_code=400, detail=f"X-Priority must be one of {', '.join(PRIORITY_CLASSES)}")
+    request_priority.set(priority)
+    tenant = request.headers.get("X-Tenant-Id")
+    if tenant:
+        request_tenant.set(tenant)
 
-# In-memory storage for kickoff IDs (in production, use a database)
-kickoff_storage = {}
+app = FastAPI(title="CrewAI Hackathon Backend", version="1.0.0", lifespan=lifespan, dependencies=[Depends(assign_priority)], default_response_class=ORJSONResponse)
+
+@app.exception_handler(QueueFull)
+async def queue_full_handler(request: Request, exc: QueueFull):
+    """Reject with 429 when the request's priority class is queued full"""
+    return ORJSONResponse(
+        status_code=429,
+        content=ApiResponse(success=False, error=str(exc)).model_dump(),
+        headers={"Retry-After": str(math.ceil(exc.retry_after))}
+    )
+
+# Persistent kickoff registry (SQLite, WAL mode)
+KICKOFF_DB_FILE = os.getenv("KICKOFF_DB_FILE", "kickoff_storage.db")
 KICKOFF_STORAGE_FILE = "kickoff_storage.json"
 
-def load_kickoff_storage():
-    """Load kickoff storage from file"""
-    global kickoff_storage
-    try:
-        if os.path.exists(KICKOFF_STORAGE_FILE):
-            with open(KICKOFF_STORAGE_FILE, 'r') as f:
-                kickoff_storage = json.load(f)
-                print(f"📁 Loaded {len(kickoff_storage)} kickoff IDs from storage")
-    except Exception as e:
-        print(f"⚠️ Error loading kickoff storage: {e}")
-        kickoff_storage = {}
+kickoff_store = KickoffStore(KICKOFF_DB_FILE, result_inline_bytes=int(os.getenv("KICKOFF_RESULT_INLINE_BYTES", 4096)))
 
-def save_kickoff_storage():
-    """Save kickoff storage to file"""
-    try:
-        with open(KICKOFF_STORAGE_FILE, 'w') as f:
-            json.dump(kickoff_storage, f, indent=2)
-    except Exception as e:
-        print(f"⚠️ Error saving kickoff storage: {e}")
+def parse_status_ttls(value: str) -> Dict[str, float]:
+    """Parse "FAILED=86400,TIMEOUT=3600" into {status: seconds}"""
+    ttls = {}
+    for item in value.split(","):
+        if item.strip():
+            status, _, seconds = item.partition("=")
+            ttls[status.strip().upper()] = float(seconds)
+    return ttls
+
+# Kickoff retention (0 = keep forever); PENDING kickoffs are never removed
+KICKOFF_RETENTION_MAX_AGE_SECONDS = float(os.getenv("KICKOFF_RETENTION_MAX_AGE_SECONDS", 0))
+KICKOFF_RETENTION_MAX_COUNT = int(os.getenv("KICKOFF_RETENTION_MAX_COUNT", 0))
+KICKOFF_RETENTION_STATUS_TTLS = parse_status_ttls(os.getenv("KICKOFF_RETENTION_STATUS_TTLS", ""))
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", 7 * 24 * 3600))
+STORAGE_COMPACT_INTERVAL_SECONDS = float(os.getenv("STORAGE_COMPACT_INTERVAL_SECONDS", 3600))
+
+# Identifies this worker process when leasing kickoffs in the shared store
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+KICKOFF_LEASE_SECONDS = float(os.getenv("KICKOFF_LEASE_SECONDS", 60))
+
+# Content-addressed cache of successful CrewAI results
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+result_cache = ResultCache(
+    os.getenv("RESULT_CACHE_DB_FILE", KICKOFF_DB_FILE),
+    max_memory_entries=int(os.getenv("RESULT_CACHE_MAX_MEMORY_ENTRIES", 1024)),
+    max_persistent_entries=int(os.getenv("RESULT_CACHE_MAX_PERSISTENT_ENTRIES", 20000)),
+    ttl_seconds=float(os.getenv("RESULT_CACHE_TTL_SECONDS", 7 * 24 * 3600)),
+)
+CACHE_MODE_PATTERN = "^(" + "|".join(CACHE_MODES) + ")$"
+
+# Asynchronous jobs (POST /api/jobs/{kind}, long-poll GET /api/jobs/{job_id})
+job_store = JobStore(os.getenv("JOB_DB_FILE", KICKOFF_DB_FILE))
+JOB_MAX_WAIT_SECONDS = float(os.getenv("JOB_MAX_WAIT_SECONDS", 60))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", 60))
+job_tasks = set()
+job_events: Dict[str, asyncio.Event] = {}
+
+# Ranked scores per rubric (GET /api/leaderboard)
+leaderboard_store = LeaderboardStore(os.getenv("LEADERBOARD_DB_FILE", KICKOFF_DB_FILE))
+LEADERBOARD_MAX_LIMIT = int(os.getenv("LEADERBOARD_MAX_LIMIT", 500))
 
 def clear_kickoff_storage():
     """Clear all kickoff storage"""
-    global kickoff_storage
-    kickoff_storage.clear()
     try:
-        if os.path.exists(KICKOFF_STORAGE_FILE):
-            os.remove(KICKOFF_STORAGE_FILE)
-        print("✅ Cleared all kickoff storage")
+        kickoff_store.clear()
+        log.info("Cleared all kickoff storage")
     except Exception as e:
-        print(f"⚠️ Error clearing kickoff storage: {e}")
+        log.warning("Error clearing kickoff storage", extra={"error": str(e)})
 
-load_kickoff_storage()
+def compact_storage() -> Dict[str, int]:
+    """Apply the retention policies to stored kickoffs and finished jobs"""
+    started = time.perf_counter()
+    stats = kickoff_store.compact(
+        max_age_seconds=KICKOFF_RETENTION_MAX_AGE_SECONDS,
+        max_count=KICKOFF_RETENTION_MAX_COUNT,
+        status_ttls=KICKOFF_RETENTION_STATUS_TTLS,
+    )
+    stats["jobs_pruned"] = job_store.prune(JOB_RETENTION_SECONDS) if JOB_RETENTION_SECONDS else 0
+    log.info("Storage compacted", extra={"seconds": round(time.perf_counter() - started, 2), **stats})
+    return stats
+
+async def compact_periodically():
+    """Compact storage at startup and then every STORAGE_COMPACT_INTERVAL_SECONDS"""
+    while True:
+        try:
+            await asyncio.to_thread(compact_storage)
+        except Exception as e:
+            log.warning("Error compacting storage", extra={"error": str(e)})
+        await asyncio.sleep(STORAGE_COMPACT_INTERVAL_SECONDS)
 
 # CORS middleware
 app.add_middleware(
@@ -72,6 +184,32 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
+# Negotiated brotli/gzip for JSON responses (NDJSON streams are left alone)
+app.add_middleware(CompressionMiddleware)
+
+# Batch evaluation settings
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", 10))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", 50))
+
+# Upload limits of POST /api/ingest (only one record is held in memory at a time)
+INGEST_MAX_RECORD_BYTES = int(os.getenv("INGEST_MAX_RECORD_BYTES", 1024 * 1024))
+INGEST_MAX_FIELD_BYTES = int(os.getenv("INGEST_MAX_FIELD_BYTES", 1024 * 1024))
+
+# Resume fan-out settings
+RESUME_CONCURRENCY = int(os.getenv("RESUME_CONCURRENCY", 50))
+RESUME_MAX_CONCURRENCY = int(os.getenv("RESUME_MAX_CONCURRENCY", 200))
+
+# Running batch tasks (kept referenced until they finish)
+batch_tasks = set()
+
+# Seconds after starting eligibility to speculatively start grading
+# (0 = both at once); "sequential" waits for eligibility to pass first
+_grade_delay = os.getenv("EVALUATE_GRADE_DELAY", "0")
+EVALUATE_GRADE_DELAY = None if _grade_delay.lower() == "sequential" else float(_grade_delay)
+
+# Writeup similarity above which submissions count as near-duplicates
+DEDUPE_THRESHOLD = float(os.getenv("DEDUPE_THRESHOLD", 0.85))
+
 # API Configuration
 API_CONFIG = {
     "schema": {
@@ -101,6 +239,8 @@ class EligibilityRequest(BaseModel):
 
 class GraderRequest(BaseModel):
     inputs: Dict[str, Any]
+    submission_id: Optional[str] = None
+    project_name: Optional[str] = None
     taskWebhookUrl: Optional[str] = ""
     stepWebhookUrl: Optional[str] = ""
     crewWebhookUrl: Optional[str] = ""
@@ -113,6 +253,8 @@ class ApiResponse(BaseModel):
     success: bool
     data: Optional[Any] = None
     error: Optional[str] = None
+    kickoff_id: Optional[str] = None
+    score: Optional[Dict[str, Any]] = None
 
 class KickoffStatus(BaseModel):
     kickoff_id: str
@@ -125,73 +267,331 @@ class KickoffStatus(BaseModel):
 
 class ResumeRequest(BaseModel):
     kickoff_ids: List[str]
+    concurrency: Optional[int] = None
+
+class BatchRequest(BaseModel):
+    hackathon_rubric: str
+    hackathon_requirements: str
+    json_rubric: Any
+    submissions: List[Dict[str, Any]]
+    concurrency: Optional[int] = None
+    cache: Literal["use", "refresh", "bypass"] = "use"
+    grade_delay: Optional[float] = EVALUATE_GRADE_DELAY
+    dedupe: Literal["off", "flag", "reuse"] = "flag"
+    dedupe_threshold: float = DEDUPE_THRESHOLD
+
+class DuplicatesRequest(BaseModel):
+    submissions: List[Dict[str, Any]]
+    threshold: float = DEDUPE_THRESHOLD
+
+class EvaluateRequest(BaseModel):
+    hackathon_rubric: str
+    hackathon_requirements: str
+    json_rubric: Any
+    project_writeup: str
+    grade_delay: Optional[float] = EVALUATE_GRADE_DELAY
+    submission_id: Optional[str] = None
+    project_name: Optional[str] = None
 
 
 # CrewAI API calls with kickoff persistence
-async def crew_ai_request(base_url: str, token: str, payload: Dict[str, Any], timeout: int = 30, api_type: str = "unknown", submission_id: str = None) -> Dict[str, Any]:
-    """Make a CrewAI API request using kickoff/status pattern with persistence"""
-    headers = {
+def parse_status_result(status_data: Dict[str, Any]) -> Any:
+    """Extract the result payload from a CrewAI status response"""
+    if status_data.get("result_json"):
+        return status_data["result_json"]
+    if status_data.get("result"):
+        try:
+            # Parse JSON if string
+            parsed_result = status_data["result"]
+            if isinstance(parsed_result, str):
+                parsed_result = json.loads(parsed_result)
+            return parsed_result
+        except (TypeError, ValueError):
+            return status_data["result"]
+    return status_data
+
+async def fetch_kickoff_status(base_url: str, headers: Dict[str, str], kickoff_id: str, timeout: int = 30, api_type: str = "unknown") -> Dict[str, Any]:
+    """Fetch the status of a kickoff, retrying on timeouts and 503/504"""
+    client = get_client(base_url)
+    status_retries = 2
+    for status_attempt in range(status_retries):
+        try:
+            status_response = await client.get(f"/status/{kickoff_id}", headers=headers, timeout=timeout)
+            UPSTREAM_RESPONSES.labels(api_type, "status", str(status_response.status_code)).inc()
+            status_response.raise_for_status()
+            return status_response.json()
+        except httpx.TimeoutException:
+            UPSTREAM_RESPONSES.labels(api_type, "status", "timeout").inc()
+            log.warning("Status request timed out", extra={"kickoff_id": kickoff_id, "api_type": api_type, "attempt": status_attempt + 1})
+            if status_attempt == status_retries - 1:
+                raise
+            await asyncio.sleep(2)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code in [504, 503]:
+                log.warning("Status request overloaded, retrying", extra={"kickoff_id": kickoff_id, "api_type": api_type, "attempt": status_attempt + 1, "status_code": e.response.status_code})
+                if status_attempt == status_retries - 1:
+                    raise
+                wait_time = 8 if e.response.status_code == 503 else 5
+                await asyncio.sleep(wait_time)
+            else:
+                raise
+
+def crew_headers(token: str) -> Dict[str, str]:
+    return {
         "Authorization": f"Bearer {token}",
         "Content-Type": "application/json"
     }
+
+def finish_kickoff(kickoff_id: str, status_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Record the final state of a kickoff and build its outcome"""
+    log.info("Kickoff finished", extra={"kickoff_id": kickoff_id, "state": status_data.get("state")})
+    
+    if status_data.get("state") == "FAILED":
+        error_msg = f"CrewAI task failed: {status_data.get('status', 'Unknown error')}"
+        kickoff_store.update(kickoff_id, status="FAILED", error=error_msg)
+        return {"success": False, "error": error_msg}
+    
+    result_data = parse_status_result(status_data)
+    kickoff_store.update(kickoff_id, status="SUCCESS", result=result_data)
+    return {"success": True, "data": result_data}
+
+def expire_kickoff(kickoff_id: str) -> Dict[str, Any]:
+    """Mark a kickoff the poller gave up on for later resume"""
+    kickoff_store.update(kickoff_id, status="TIMEOUT")
+    return {"success": False, "error": "Kickoff did not finish in time, use resume to check again", "kickoff_id": kickoff_id}
+
+def fail_kickoff(kickoff_id: str, error: Exception) -> Dict[str, Any]:
+    """Mark a kickoff whose status could not be retrieved as failed"""
+    kickoff_store.update(kickoff_id, status="FAILED", error=str(error))
+    return {"success": False, "error": f"API request failed: {str(error)}"}
+
+def settled_outcomes(kickoff_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Outcomes of kickoffs another worker (or a webhook) already settled"""
+    outcomes = {}
+    for kickoff_id, record in kickoff_store.settled(kickoff_ids).items():
+        if record["status"] == "SUCCESS":
+            outcomes[kickoff_id] = {"success": True, "data": record["result"]}
+        elif record["status"] == "TIMEOUT":
+            outcomes[kickoff_id] = {"success": False, "error": "Kickoff did not finish in time, use resume to check again", "kickoff_id": kickoff_id}
+        else:
+            outcomes[kickoff_id] = {"success": False, "error": record["error"] or f"Kickoff {record['status'].lower()}"}
+    return outcomes
+
+# Webhook (push) completion mode, enabled when WEBHOOK_BASE_URL is set
+WEBHOOK_BASE_URL = (os.getenv("WEBHOOK_BASE_URL") or "").rstrip("/")
+WEBHOOK_SAFETY_POLL_INTERVAL = float(os.getenv("WEBHOOK_SAFETY_POLL_INTERVAL", 120))
+WEBHOOKS_ENABLED = bool(WEBHOOK_BASE_URL)
+# Without an explicit secret, workers share a random one kept in the kickoff store
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET") or kickoff_store.setting("webhook_secret", secrets.token_hex(32))
+if WEBHOOKS_ENABLED and not os.getenv("WEBHOOK_SECRET"):
+    log.warning("WEBHOOK_SECRET not set, using a random secret stored in the kickoff database", extra={"db_file": KICKOFF_DB_FILE})
+
+def sign_webhook_nonce(nonce: str) -> str:
+    return hmac.new(WEBHOOK_SECRET.encode(), nonce.encode(), hashlib.sha256).hexdigest()
+
+def crew_webhook_url(nonce: str) -> str:
+    """Signed callback URL handed to the crew for one kickoff"""
+    return f"{WEBHOOK_BASE_URL}/api/webhooks/crew/{nonce}?sig={sign_webhook_nonce(nonce)}"
+
+def webhook_status_data(body: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a crew webhook body into the shape of a status response"""
+    state = body.get("state")
+    if state not in TERMINAL_STATES:
+        state = "FAILED" if body.get("error") else "SUCCESS"
+    return {
+        "state": state,
+        "status": body.get("status") or body.get("error"),
+        "result": body.get("result"),
+        "result_json": body.get("result_json")
+    }
+
+# Background poller that owns every PENDING kickoff
+KICKOFF_WAIT_SECONDS = float(os.getenv("KICKOFF_WAIT_SECONDS", 200))
+kickoff_poller = KickoffPoller(
+    fetch_kickoff_status,
+    on_terminal=finish_kickoff,
+    on_expired=expire_kickoff,
+    on_error=fail_kickoff,
+    initial_interval=float(os.getenv("POLL_INITIAL_INTERVAL", 2)),
+    max_interval=float(os.getenv("POLL_MAX_INTERVAL", 30)),
+    backoff=float(os.getenv("POLL_BACKOFF", 1.5)),
+    jitter=float(os.getenv("POLL_JITTER", 0.2)),
+    max_status_qps=float(os.getenv("POLL_MAX_STATUS_QPS", 5)),
+    max_age_seconds=float(os.getenv("POLL_MAX_AGE_SECONDS", 6 * 3600)),
+    claim_lease=lambda kickoff_id: kickoff_store.claim_lease(kickoff_id, WORKER_ID, KICKOFF_LEASE_SECONDS),
+    renew_leases=lambda kickoff_ids: kickoff_store.renew_leases(WORKER_ID, kickoff_ids, KICKOFF_LEASE_SECONDS),
+    release_leases=lambda: kickoff_store.release_leases(WORKER_ID),
+    find_settled=settled_outcomes,
+    lease_seconds=KICKOFF_LEASE_SECONDS,
+)
+
+async def wait_for_kickoff(kickoff_id: str, api_type: str, base_url: str, token: str, wait_seconds: float = KICKOFF_WAIT_SECONDS, on_done=None, webhook_nonce: str = None) -> Dict[str, Any]:
+    """Hand a kickoff to the poller and wait for its outcome.
+
+    The poller keeps owning the kickoff if the wait runs out, so the
+    result is still stored once the crew finishes. Kickoffs started in
+    webhook mode are only polled as a slow safety net.
+    """
+    outcome = kickoff_poller.track(
+        kickoff_id,
+        api_type,
+        base_url,
+        crew_headers(token),
+        webhook_nonce=webhook_nonce,
+        safety_interval=WEBHOOK_SAFETY_POLL_INTERVAL if webhook_nonce else None
+    )
+    if on_done is not None:
+        outcome.add_done_callback(on_done)
+    try:
+        return dict(await asyncio.wait_for(asyncio.shield(outcome), timeout=wait_seconds))
+    except asyncio.TimeoutError:
+        log.info("Kickoff still running, poller keeps tracking it", extra={"kickoff_id": kickoff_id, "api_type": api_type, "waited_seconds": wait_seconds})
+        return {"success": False, "error": f"Still processing after {wait_seconds:g} seconds, the result will be stored when it completes", "kickoff_id": kickoff_id}
+
+def cache_when_done(cache_key: str, api_type: str):
+    """Done callback that caches a kickoff's successful outcome"""
+    def cache_outcome(outcome: asyncio.Future):
+        if not outcome.cancelled() and outcome.result()["success"]:
+            result_cache.set(cache_key, api_type, outcome.result()["data"])
+    return cache_outcome
+
+# Identical requests share one kickoff (single flight)
+COALESCE_REQUESTS = os.getenv("COALESCE_REQUESTS", "true").lower() == "true"
+# Leaders still waiting for the crew to accept their kickoff, by request key
+starting_kickoffs: Dict[str, asyncio.Future] = {}
+
+async def join_identical_request(request_key: str, api_type: str, base_url: str, token: str, wait_seconds: float) -> Optional[Dict[str, Any]]:
+    """Share the kickoff of an identical request that is already in flight.
+
+    Joins a request in this process that is still starting its kickoff,
+    or a PENDING kickoff in the store (started by any worker, possibly for
+    a client that has since given up). Returns None if there is nothing
+    to join and the caller should start its own kickoff.
+    """
+    while request_key in starting_kickoffs:
+        kickoff_id, webhook_nonce, failure = await asyncio.shield(starting_kickoffs[request_key])
+        if isinstance(failure, QueueFull):
+            # Rejected like the leader, so every caller gets the same 429
+            raise QueueFull(str(failure), failure.retry_after)
+        if failure is not None:
+            COALESCED_REQUESTS.labels(api_type, "starting").inc()
+            return dict(failure)
+        if kickoff_id is not None:
+            COALESCED_REQUESTS.labels(api_type, "starting").inc()
+            return await wait_for_kickoff(kickoff_id, api_type, base_url, token, wait_seconds=wait_seconds, webhook_nonce=webhook_nonce)
+        # The leader was cancelled before its kickoff was accepted
+    
+    pending = kickoff_store.find_pending(request_key)
+    if pending is None:
+        return None
+    kickoff_id, record = pending
+    log.info("Joining pending kickoff", extra={"kickoff_id": kickoff_id, "api_type": api_type, "sample": True})
+    COALESCED_REQUESTS.labels(api_type, "pending").inc()
+    return await wait_for_kickoff(kickoff_id, api_type, record["base_url"] or base_url, record["token"] or token, wait_seconds=wait_seconds, webhook_nonce=record["webhook_nonce"])
+
+async def crew_ai_request(base_url: str, token: str, payload: Dict[str, Any], timeout: int = 30, api_type: str = "unknown", submission_id: str = None, cache_mode: str = "use", wait_seconds: float = KICKOFF_WAIT_SECONDS) -> Dict[str, Any]:
+    """Make a CrewAI API request using kickoff/status pattern with persistence.
+
+    cache_mode is "use" (serve and store cached results), "refresh" (skip
+    the lookup but store the fresh result) or "bypass" (no caching).
+    wait_seconds bounds how long to wait for the kickoff to settle.
+    Identical concurrent requests share a single kickoff.
+    """
+    request_key = make_cache_key(api_type, payload.get("inputs", {}))
+    use_cache = RESULT_CACHE_ENABLED and cache_mode != "bypass"
+    cache_key = request_key if use_cache else None
+    if use_cache and cache_mode == "use":
+        cached = result_cache.get(cache_key, api_type)
+        if cached is not None:
+            log.info("Cache hit", extra={"api_type": api_type, "cache_key": cache_key[:12], "sample": True})
+            return {"success": True, "data": cached}
+    
+    if COALESCE_REQUESTS:
+        joined = await join_identical_request(request_key, api_type, base_url, token, wait_seconds)
+        if joined is not None:
+            return joined
+    
+    return await start_crew_kickoff(base_url, token, payload, timeout, api_type, submission_id, request_key, cache_key, wait_seconds)
+
+def hackathon_tenant(inputs: Dict[str, Any]) -> str:
+    """Fair-share tenant of a kickoff when the client didn't name one: its hackathon"""
+    hackathon = inputs.get("hackathon_rubric") or inputs.get("hackathon_requirements") or ""
+    return hashlib.sha256(str(hackathon).encode("utf-8")).hexdigest()[:12]
+
+async def start_crew_kickoff(base_url: str, token: str, payload: Dict[str, Any], timeout: int, api_type: str, submission_id: Optional[str], request_key: str, cache_key: Optional[str], wait_seconds: float) -> Dict[str, Any]:
+    """Kick off a crew run and wait for it, leading any identical requests"""
+    leader = asyncio.get_running_loop().create_future()
+    if COALESCE_REQUESTS:
+        starting_kickoffs[request_key] = leader
+    
+    def release_followers(failure: Optional[Union[Dict[str, Any], QueueFull]] = None):
+        # Followers wait on the kickoff once accepted, or share our failure or rejection
+        if starting_kickoffs.get(request_key) is leader:
+            del starting_kickoffs[request_key]
+        if not leader.done():
+            leader.set_result((kickoff_id, webhook_nonce, failure))
+    
+    headers = crew_headers(token)
+    client = get_client(base_url)
+    kickoff_id = None
+    
+    # Push mode: ask the crew to call us back instead of waiting on polls
+    webhook_nonce = None
+    if WEBHOOKS_ENABLED:
+        webhook_nonce = uuid.uuid4().hex
+        payload = {**payload, "crewWebhookUrl": crew_webhook_url(webhook_nonce)}
     
     try:
         # Kickoff request
-        print(f"🚀 [CrewAI] Sending kickoff request to {base_url}/kickoff")
-        print(f"🚀 [CrewAI] Payload: {payload}")
         
-        # Retry logic with circuit breaker
+        # Retry logic behind the shared per-upstream limiter and circuit breaker
+        limiter = get_limiter(api_type)
         max_retries = 8
-        consecutive_503_errors = 0
         
         for attempt in range(max_retries):
+            log.debug("Sending kickoff request", extra={"api_type": api_type, "attempt": attempt + 1, "max_retries": max_retries})
+            
+            # Exponential backoff with jitter; breaker waits happen in acquire()
+            if attempt > 0:
+                KICKOFF_RETRIES.labels(api_type, outcome).inc()
+                await asyncio.sleep(min(60, 2 ** attempt) * random.uniform(0.5, 1.5))
+            
+            await limiter.acquire(request_priority.get(), request_tenant.get() or hackathon_tenant(payload.get("inputs", {})))
+            outcome = "error"
             try:
-                print(f"🚀 [CrewAI] Kickoff attempt {attempt + 1}/{max_retries}")
-                
-                # Random jitter
-                if attempt > 0:
-                    jitter = random.uniform(1, 3)
-                    time.sleep(jitter)
-                
-                kickoff_response = requests.post(f"{base_url}/kickoff", headers=headers, json=payload, timeout=timeout)
+                kickoff_started = time.monotonic()
+                kickoff_response = await client.post("/kickoff", headers=headers, json=payload, timeout=timeout)
+                KICKOFF_LATENCY.labels(api_type).observe(time.monotonic() - kickoff_started)
+                UPSTREAM_RESPONSES.labels(api_type, "kickoff", str(kickoff_response.status_code)).inc()
                 kickoff_response.raise_for_status()
                 kickoff_data = kickoff_response.json()
                 kickoff_id = kickoff_data["kickoff_id"]
-                consecutive_503_errors = 0
+                outcome = "success"
                 break
                 
-            except requests.exceptions.Timeout:
-                print(f"⏰ [CrewAI] Kickoff timeout on attempt {attempt + 1}")
+            except httpx.TimeoutException:
+                outcome = "overload"
+                UPSTREAM_RESPONSES.labels(api_type, "kickoff", "timeout").inc()
+                log.warning("Kickoff request timed out", extra={"api_type": api_type, "attempt": attempt + 1})
                 if attempt == max_retries - 1:
                     raise
-                time.sleep(8 * (attempt + 1))
                 
-            except requests.exceptions.HTTPError as e:
+            except httpx.HTTPStatusError as e:
                 if e.response.status_code in [504, 503]:
-                    consecutive_503_errors += 1
-                    error_type = "Gateway timeout" if e.response.status_code == 504 else "Service unavailable"
-                    print(f"🔄 [CrewAI] {error_type} on attempt {attempt + 1} (consecutive 503s: {consecutive_503_errors})")
-                    
-                    # Circuit breaker
-                    if consecutive_503_errors >= 3:
-                        print(f"⚠️ [CrewAI] Circuit breaker: Too many 503 errors, waiting longer...")
-                        wait_time = 60 + (20 * consecutive_503_errors)
-                    else:
-                        wait_time = 30 * (attempt + 1)
-                    
+                    outcome = "overload"
+                    log.warning("Kickoff request overloaded", extra={"api_type": api_type, "attempt": attempt + 1, "status_code": e.response.status_code, "breaker": limiter.breaker.state})
                     if attempt == max_retries - 1:
-                        print(f"❌ [CrewAI] All retry attempts failed. Service overloaded.")
+                        log.error("All kickoff attempts failed, upstream overloaded", extra={"api_type": api_type})
                         raise
-                    
-                    print(f"⏳ [CrewAI] Waiting {wait_time} seconds before retry...")
-                    time.sleep(wait_time)
                 else:
                     raise
+            finally:
+                await limiter.release(outcome)
         
-        print(f"🎯 [CrewAI] Got kickoff_id: {kickoff_id}")
+        log.info("Kickoff accepted", extra={"kickoff_id": kickoff_id, "api_type": api_type, "submission_id": submission_id})
         
         # Store kickoff ID
-        kickoff_storage[kickoff_id] = {
+        kickoff_store.upsert(kickoff_id, {
             "status": "PENDING",
             "created_at": datetime.now().isoformat(),
             "api_type": api_type,
@@ -199,154 +599,76 @@ async def crew_ai_request(base_url: str, token: str, payload: Dict[str, Any], ti
             "base_url": base_url,
             "token": token,
             "result": None,
-            "error": None
-        }
-        save_kickoff_storage()
-        
-        # Poll for status
-        max_attempts = 20
-        for attempt in range(max_attempts):
-            print(f"⏳ [CrewAI] Polling attempt {attempt + 1}/{max_attempts}")
-            time.sleep(10)
-            
-            # Retry logic for status requests
-            status_retries = 2
-            for status_attempt in range(status_retries):
-                try:
-                    status_response = requests.get(f"{base_url}/status/{kickoff_id}", headers=headers, timeout=timeout)
-                    status_response.raise_for_status()
-                    status_data = status_response.json()
-                    break
-                except requests.exceptions.Timeout:
-                    print(f"⏰ [CrewAI] Status timeout on attempt {status_attempt + 1}")
-                    if status_attempt == status_retries - 1:
-                        raise
-                    time.sleep(2)
-                except requests.exceptions.HTTPError as e:
-                    if e.response.status_code in [504, 503]:
-                        error_type = "Gateway timeout" if e.response.status_code == 504 else "Service unavailable"
-                        print(f"🔄 [CrewAI] Status {error_type} on attempt {status_attempt + 1}, retrying...")
-                        if status_attempt == status_retries - 1:
-                            raise
-                        wait_time = 8 if e.response.status_code == 503 else 5
-                        time.sleep(wait_time)
-                    else:
-                        raise
-            
-            print(f"📊 [CrewAI] Status: {status_data.get('state')}")
-            
-            if status_data.get("state") in ("SUCCESS", "FAILED", "COMPLETED"):
-                print(f"✅ [CrewAI] Final state: {status_data.get('state')}")
-                
-                if status_data.get("state") == "FAILED":
-                    error_msg = f"CrewAI task failed: {status_data.get('status', 'Unknown error')}"
-                    kickoff_storage[kickoff_id]["status"] = "FAILED"
-                    kickoff_storage[kickoff_id]["error"] = error_msg
-                    save_kickoff_storage()
-                    return {"success": False, "error": error_msg}
-                
-                # Handle API response formats
-                result_data = None
-                if status_data.get("result_json"):
-                    result_data = status_data["result_json"]
-                elif status_data.get("result"):
-                    try:
-                        # Parse JSON if string
-                        parsed_result = status_data["result"]
-                        if isinstance(parsed_result, str):
-                            import json
-                            parsed_result = json.loads(parsed_result)
-                        result_data = parsed_result
-                    except:
-                        result_data = status_data["result"]
-                else:
-                    result_data = status_data
-                
-                # Update storage
-                kickoff_storage[kickoff_id]["status"] = "SUCCESS"
-                kickoff_storage[kickoff_id]["result"] = result_data
-                save_kickoff_storage()
-                
-                return {"success": True, "data": result_data}
+            "error": None,
+            "webhook_nonce": webhook_nonce,
+            "request_key": request_key
+        })
+        release_followers()
         
-        # Timeout - mark for later resume
-        print(f"⏰ [CrewAI] Request timed out, storing kickoff_id for later resume: {kickoff_id}")
-        kickoff_storage[kickoff_id]["status"] = "TIMEOUT"
-        save_kickoff_storage()
-        return {"success": False, "error": "Request timed out after 200 seconds", "kickoff_id": kickoff_id}
+        # Cache the result whenever it lands, even if this request stops waiting
+        return await wait_for_kickoff(kickoff_id, api_type, base_url, token, wait_seconds=wait_seconds, on_done=cache_when_done(cache_key, api_type) if cache_key else None, webhook_nonce=webhook_nonce)
         
-    except requests.exceptions.RequestException as e:
-        print(f"❌ [CrewAI] Request failed: {str(e)}")
-        if 'kickoff_id' in locals():
-            kickoff_storage[kickoff_id]["status"] = "FAILED"
-            kickoff_storage[kickoff_id]["error"] = str(e)
-            save_kickoff_storage()
-        return {"success": False, "error": f"API request failed: {str(e)}"}
+    except QueueFull as e:
+        log.warning("Kickoff rejected", extra={"api_type": api_type, "error": str(e)})
+        release_followers(e)
+        raise
+    except UpstreamUnavailable as e:
+        log.error("Upstream unavailable", extra={"api_type": api_type, "error": str(e)})
+        failure = {"success": False, "error": "CrewAI services are currently overloaded. Please try again later or use resume to retrieve completed results."}
+        release_followers(failure)
+        return failure
+    except httpx.HTTPError as e:
+        log.error("Kickoff request failed", extra={"api_type": api_type, "kickoff_id": kickoff_id, "error": str(e)})
+        if kickoff_id:
+            kickoff_store.update(kickoff_id, status="FAILED", error=str(e))
+        failure = {"success": False, "error": f"API request failed: {str(e)}"}
+        release_followers(failure)
+        return failure
     except Exception as e:
-        print(f"❌ [CrewAI] Unexpected error: {str(e)}")
-        if 'kickoff_id' in locals():
-            kickoff_storage[kickoff_id]["status"] = "FAILED"
-            kickoff_storage[kickoff_id]["error"] = str(e)
-            save_kickoff_storage()
+        log.exception("Unexpected kickoff error", extra={"api_type": api_type, "kickoff_id": kickoff_id})
+        if kickoff_id:
+            kickoff_store.update(kickoff_id, status="FAILED", error=str(e))
         error_msg = str(e)
         if "503" in error_msg or "Service Unavailable" in error_msg:
             error_msg = "CrewAI services are currently overloaded. The system will automatically retry with exponential backoff. You can also use the 'Retrieve Completed Results' button to get previously processed submissions."
         elif "timeout" in error_msg.lower():
             error_msg = "Request timed out due to service overload. The system will retry automatically."
         
-        return {"success": False, "error": f"API request failed: {error_msg}"}
+        failure = {"success": False, "error": f"API request failed: {error_msg}"}
+        release_followers(failure)
+        return failure
+    finally:
+        # Cancelled before the kickoff was accepted: followers start their own
+        release_followers()
 
 
-# API Endpoints
-@app.get("/")
-async def root():
-    return {"message": "CrewAI Hackathon Backend API", "version": "1.0.0"}
-
-@app.get("/api/test")
-async def test_endpoint():
-    """Test endpoint to verify CORS and backend connectivity"""
-    return {
-        "status": "success",
-        "message": "Backend is working!",
-        "cors_configured": True,
-        "timestamp": datetime.now().isoformat()
-    }
-
-@app.options("/api/{path:path}")
-async def options_handler(path: str):
-    """Handle CORS preflight requests"""
-    return {"message": "CORS preflight handled"}
-
-@app.post("/api/schema", response_model=ApiResponse)
-async def generate_schema(request: SchemaRequest):
-    """Generate JSON schema from hackathon rubric"""
-    
+# Evaluation pipeline steps shared by single and batch endpoints
+async def run_schema(hackathon_rubric: str, cache_mode: str = "use", wait_seconds: float = KICKOFF_WAIT_SECONDS) -> Dict[str, Any]:
+    """Run the schema crew for a hackathon rubric"""
     if not API_CONFIG["schema"]["base_url"] or not API_CONFIG["schema"]["token"]:
-        return ApiResponse(success=False, error="Schema API configuration missing")
+        return {"success": False, "error": "Schema API configuration missing"}
     
-    payload = {"inputs": {"hackathon_rubric": request.hackathon_rubric}}
-    result = await crew_ai_request(
+    payload = {"inputs": {"hackathon_rubric": hackathon_rubric}}
+    return await crew_ai_request(
         API_CONFIG["schema"]["base_url"],
         API_CONFIG["schema"]["token"],
         payload,
         timeout=120,
-        api_type="schema"
+        api_type="schema",
+        cache_mode=cache_mode,
+        wait_seconds=wait_seconds
     )
-    
-    return ApiResponse(**result)
 
-@app.post("/api/eligibility", response_model=ApiResponse)
-async def check_eligibility(request: EligibilityRequest):
-    """Check if a project is eligible for the hackathon"""
-    
+async def run_eligibility(project_writeup: str, hackathon_requirements: str, submission_id: str = None, cache_mode: str = "use", wait_seconds: float = KICKOFF_WAIT_SECONDS) -> Dict[str, Any]:
+    """Run the eligibility crew and normalize its response"""
     if not API_CONFIG["eligibility"]["base_url"] or not API_CONFIG["eligibility"]["token"]:
-        return ApiResponse(success=False, error="Eligibility API configuration missing")
+        return {"success": False, "error": "Eligibility API configuration missing"}
     
     # Eligibility API payload
     payload = {
         "inputs": {
-            "project_writeup": request.project_writeup,
-            "hackathon_requirements": request.hackathon_requirements
+            "project_writeup": project_writeup,
+            "hackathon_requirements": hackathon_requirements
         }
     }
     
@@ -355,7 +677,10 @@ async def check_eligibility(request: EligibilityRequest):
         API_CONFIG["eligibility"]["token"],
         payload,
         timeout=120,
-        api_type="eligibility"
+        api_type="eligibility",
+        submission_id=submission_id,
+        cache_mode=cache_mode,
+        wait_seconds=wait_seconds
     )
     
     # Transform the response to match frontend expectations
@@ -369,28 +694,20 @@ async def check_eligibility(request: EligibilityRequest):
             }
             result["data"] = transformed_data
     
-    return ApiResponse(**result)
+    return result
 
-@app.post("/api/grade", response_model=ApiResponse)
-async def grade_project(request: GraderRequest):
-    """Grade a project using the rubric and schema"""
-    
-    print(f"🔍 [Grade API] Received request: {request}")
-    print(f"🔍 [Grade API] Inputs: {request.inputs}")
-    print(f"🔍 [Grade API] API Config: {API_CONFIG}")
-    
+async def run_grade(hackathon_rubric: str, json_rubric: Any, project_writeup: str, submission_id: str = None, cache_mode: str = "use", wait_seconds: float = KICKOFF_WAIT_SECONDS) -> Dict[str, Any]:
+    """Run the grader crew for a single project"""
     if not API_CONFIG["grader"]["base_url"] or not API_CONFIG["grader"]["token"]:
-        print("⚠️ [Grade API] No grader API configuration")
-        print(f"⚠️ [Grade API] Base URL: {API_CONFIG['grader']['base_url']}")
-        print(f"⚠️ [Grade API] Token: {API_CONFIG['grader']['token']}")
-        return ApiResponse(success=False, error="Grader API configuration missing")
+        log.warning("No grader API configuration")
+        return {"success": False, "error": "Grader API configuration missing"}
     
     # Grader API payload
     payload = {
         "inputs": {
-            "hackathon_rubric": request.inputs.get("hackathon_rubric", ""),
-            "json_rubric": request.inputs.get("json_rubric", {}),
-            "project_writeup": request.inputs.get("project_writeup", "")
+            "hackathon_rubric": hackathon_rubric,
+            "json_rubric": json_rubric,
+            "project_writeup": project_writeup
         },
         "taskWebhookUrl": "", 
         "stepWebhookUrl": "",
@@ -399,123 +716,852 @@ async def grade_project(request: GraderRequest):
         "generateArtifact": False
     }
     
-    print(f"🚀 [Grade API] Sending payload to CrewAI: {payload}")
-    
     result = await crew_ai_request(
         API_CONFIG["grader"]["base_url"],
         API_CONFIG["grader"]["token"],
         payload,
         timeout=120,
-        api_type="grader"
+        api_type="grader",
+        submission_id=submission_id,
+        cache_mode=cache_mode,
+        wait_seconds=wait_seconds
     )
     
-    print(f"📊 [Grade API] CrewAI response: {result}")
+    if result["success"] and result.get("data") is not None:
+        # Clamp the grade to the rubric and total it
+        try:
+            rubric = compile_rubric(json_rubric)
+        except RubricError as e:
+            log.warning("Not scoring grade", extra={"submission_id": submission_id, "error": str(e)})
+        else:
+            if rubric.criteria:
+                result["data"], result["score"] = rubric.score(result["data"])
+                if not result["score"]["valid"]:
+                    log.info("Grade has rubric issues", extra={"submission_id": submission_id, "issues": len(result["score"]["issues"])})
+    
+    return result
+
+def record_score(json_rubric: Any, submission_id: Optional[str], project_name: Optional[str], score: Optional[Dict[str, Any]]):
+    """Put a scored grade on its rubric's leaderboard"""
+    if not submission_id or not score:
+        return
+    leaderboard_store.record(compile_rubric(json_rubric), submission_id, project_name, score)
+
+async def evaluate_project(
+    hackathon_rubric: str,
+    hackathon_requirements: str,
+    json_rubric: Any,
+    project_writeup: str,
+    submission_id: str = None,
+    cache_mode: str = "use",
+    grade_delay: Optional[float] = EVALUATE_GRADE_DELAY,
+    wait_seconds: float = KICKOFF_WAIT_SECONDS
+) -> Dict[str, Any]:
+    """Check eligibility and grade one project.
+
+    Grading starts speculatively ``grade_delay`` seconds after eligibility
+    (0 = in parallel) unless eligibility has settled by then, and is
+    discarded if the project turns out ineligible. With ``grade_delay``
+    None grading only starts once the project is known to be eligible.
+    Returns the eligibility result and the grade result (None if the
+    project was not graded).
+    """
+    eligibility_task = asyncio.create_task(run_eligibility(project_writeup, hackathon_requirements, submission_id=submission_id, cache_mode=cache_mode, wait_seconds=wait_seconds))
+    grade_task = None
+    
+    def start_grade():
+        return asyncio.create_task(run_grade(hackathon_rubric, json_rubric, project_writeup, submission_id=submission_id, cache_mode=cache_mode, wait_seconds=wait_seconds))
+    
+    try:
+        if grade_delay is not None:
+            done, _ = await asyncio.wait({eligibility_task}, timeout=max(0.0, grade_delay))
+            if not done:
+                grade_task = start_grade()
+        
+        eligibility = await eligibility_task
+        if not eligibility["success"] or not eligibility.get("data") or not eligibility["data"].get("eligible"):
+            if grade_task is not None:
+                # The grader kickoff keeps running upstream; its result is still cached
+                grade_task.cancel()
+                SPECULATIVE_GRADES.labels("discarded").inc()
+                log.info("Discarding speculative grade", extra={"submission_id": submission_id, "sample": True})
+            return {"eligibility": eligibility, "grade": None}
+        
+        if grade_task is None:
+            grade_task = start_grade()
+        else:
+            SPECULATIVE_GRADES.labels("used").inc()
+        return {"eligibility": eligibility, "grade": await grade_task}
+    finally:
+        for task in (eligibility_task, grade_task):
+            if task is not None and not task.done():
+                task.cancel()
+
+def record_evaluation_score(request: EvaluateRequest, outcome: Dict[str, Any]):
+    if outcome["grade"] is not None:
+        record_score(request.json_rubric, request.submission_id, request.project_name, outcome["grade"].get("score"))
+
+def submission_writeup(submission: Dict[str, Any]) -> str:
+    return submission.get("description") or submission.get("project_writeup") or ""
+
+def submission_summary(index: int, submission: Dict[str, Any]) -> Dict[str, Any]:
+    """Identifying fields reported for a batch submission"""
+    submission_id = submission.get("id")
+    return {
+        "index": index,
+        "submission_id": str(submission_id) if submission_id is not None and submission_id != "" else f"submission-{index}",
+        "project_name": submission.get("project_name") or submission.get("name") or f"Project {index + 1}"
+    }
+
+def leaderboard_id(submission: Dict[str, Any]) -> Optional[str]:
+    """The leaderboard key of a batch submission: its own ID only.
+
+    The submission-{index} fallback is positional, so it would collide
+    with other uploads that use the same rubric.
+    """
+    submission_id = submission.get("id")
+    return str(submission_id) if submission_id is not None and submission_id != "" else None
+
+def find_duplicate_submissions(submissions: List[Dict[str, Any]], threshold: float) -> Dict[int, tuple]:
+    """Map the index of each near-duplicate submission to (original index, similarity)"""
+    started = time.perf_counter()
+    duplicates = find_duplicates(((index, submission_writeup(submission)) for index, submission in enumerate(submissions)), threshold)
+    log.info("Indexed writeups for near-duplicates", extra={"writeups": len(submissions), "duplicates": len(duplicates), "seconds": round(time.perf_counter() - started, 2)})
+    return duplicates
+
+async def evaluate_submission(index: int, submission: Dict[str, Any], request: BatchRequest) -> Dict[str, Any]:
+    """Run the eligibility then grade pipeline for one batch submission"""
+    project_writeup = submission_writeup(submission)
+    evaluation = {
+        **submission_summary(index, submission),
+        "success": False,
+        "eligible": None,
+        "reason": None,
+        "grade": None,
+        "score": None,
+        "error": None
+    }
+    submission_id = evaluation["submission_id"]
+    
+    outcome = await evaluate_project(
+        request.hackathon_rubric,
+        request.hackathon_requirements,
+        request.json_rubric,
+        project_writeup,
+        submission_id=submission_id,
+        cache_mode=request.cache,
+        grade_delay=request.grade_delay
+    )
+    eligibility = outcome["eligibility"]
+    if not eligibility["success"] or not eligibility.get("data"):
+        evaluation["error"] = eligibility.get("error") or "Eligibility check failed"
+        return evaluation
+    
+    evaluation["eligible"] = eligibility["data"].get("eligible")
+    evaluation["reason"] = eligibility["data"].get("reason")
+    if not evaluation["eligible"]:
+        evaluation["success"] = True
+        return evaluation
+    
+    grade = outcome["grade"]
+    if not grade["success"] or not grade.get("data"):
+        evaluation["error"] = grade.get("error") or "Grading failed"
+        return evaluation
+    
+    evaluation["success"] = True
+    evaluation["grade"] = grade["data"]
+    evaluation["score"] = grade.get("score")
+    record_score(request.json_rubric, leaderboard_id(submission), evaluation["project_name"], evaluation["score"])
+    return evaluation
+
+async def evaluate_batch_entry(index: int, submission: Dict[str, Any], request: BatchRequest, semaphore: asyncio.Semaphore, evaluations: Dict[int, asyncio.Future], duplicate: Optional[tuple] = None) -> Dict[str, Any]:
+    """Evaluate one batch submission, or reuse its original's evaluation.
+
+    duplicate is (original index, original submission ID, similarity) for
+    a near-duplicate. The evaluation is also published in evaluations[index]
+    for duplicates that reuse it.
+    """
+    if duplicate is not None and request.dedupe == "reuse":
+        # No crew calls of our own: wait for the original's evaluation
+        original = await asyncio.shield(evaluations[duplicate[0]])
+        evaluation = {**original, **submission_summary(index, submission), "reused": True}
+        record_score(request.json_rubric, leaderboard_id(submission), evaluation["project_name"], evaluation.get("score"))
+    else:
+        async with semaphore:
+            try:
+                evaluation = await evaluate_submission(index, submission, request)
+            except Exception as e:
+                log.exception("Batch submission failed", extra={"index": index})
+                evaluation = {**submission_summary(index, submission), "success": False, "error": str(e)}
+    if duplicate is not None:
+        evaluation["duplicate_of"] = duplicate[1]
+        evaluation["similarity"] = duplicate[2]
+    if index in evaluations:
+        evaluations[index].set_result(evaluation)
+    return evaluation
+
+
+# API Endpoints
+@app.get("/")
+async def root():
+    return {"message": "CrewAI Hackathon Backend API", "version": "1.0.0"}
+
+@app.get("/api/test")
+async def test_endpoint():
+    """Test endpoint to verify CORS and backend connectivity"""
+    return {
+        "status": "success",
+        "message": "Backend is working!",
+        "cors_configured": True,
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.options("/api/{path:path}")
+async def options_handler(path: str):
+    """Handle CORS preflight requests"""
+    return {"message": "CORS preflight handled"}
+
+@app.post("/api/schema", response_model=ApiResponse)
+async def generate_schema(request: SchemaRequest, cache: str = Query("use", pattern=CACHE_MODE_PATTERN)):
+    """Generate JSON schema from hackathon rubric"""
+    result = await run_schema(request.hackathon_rubric, cache_mode=cache)
+    return ApiResponse(**result)
+
+@app.post("/api/eligibility", response_model=ApiResponse)
+async def check_eligibility(request: EligibilityRequest, cache: str = Query("use", pattern=CACHE_MODE_PATTERN)):
+    """Check if a project is eligible for the hackathon"""
+    result = await run_eligibility(request.project_writeup, request.hackathon_requirements, cache_mode=cache)
+    return ApiResponse(**result)
+
+@app.post("/api/grade", response_model=ApiResponse)
+async def grade_project(request: GraderRequest, cache: str = Query("use", pattern=CACHE_MODE_PATTERN)):
+    """Grade a project using the rubric and schema"""
     
+    result = await run_grade(
+        request.inputs.get("hackathon_rubric", ""),
+        request.inputs.get("json_rubric", {}),
+        request.inputs.get("project_writeup", ""),
+        submission_id=request.submission_id,
+        cache_mode=cache
+    )
+    record_score(request.inputs.get("json_rubric", {}), request.submission_id, request.project_name, result.get("score"))
     
     return ApiResponse(**result)
 
+JOB_REQUEST_MODELS = {
+    "schema": SchemaRequest,
+    "eligibility": EligibilityRequest,
+    "grade": GraderRequest,
+    "evaluate": EvaluateRequest,
+}
+
+async def run_job(job_id: str, kind: str, request: BaseModel, cache_mode: str, priority: Optional[str] = None):
+    """Run one job to completion and record its result"""
+    if priority:
+        request_priority.set(priority)
+    # Jobs have no client waiting on them, so wait as long as the poller tracks the kickoff
+    wait_seconds = kickoff_poller.max_age_seconds
+    try:
+        if kind == "schema":
+            result = await run_schema(request.hackathon_rubric, cache_mode=cache_mode, wait_seconds=wait_seconds)
+        elif kind == "eligibility":
+            result = await run_eligibility(request.project_writeup, request.hackathon_requirements, cache_mode=cache_mode, wait_seconds=wait_seconds)
+        elif kind == "evaluate":
+            outcome = await evaluate_project(
+                request.hackathon_rubric,
+                request.hackathon_requirements,
+                request.json_rubric,
+                request.project_writeup,
+                submission_id=request.submission_id,
+                cache_mode=cache_mode,
+                grade_delay=request.grade_delay,
+                wait_seconds=wait_seconds
+            )
+            record_evaluation_score(request, outcome)
+            result = {"success": True, "data": outcome}
+        else:
+            result = await run_grade(
+                request.inputs.get("hackathon_rubric", ""),
+                request.inputs.get("json_rubric", {}),
+                request.inputs.get("project_writeup", ""),
+                submission_id=request.submission_id,
+                cache_mode=cache_mode,
+                wait_seconds=wait_seconds
+            )
+            record_score(request.inputs.get("json_rubric", {}), request.submission_id, request.project_name, result.get("score"))
+    except Exception as e:
+        log.exception("Job failed", extra={"job_id": job_id, "kind": kind})
+        result = {"success": False, "error": str(e)}
+    job_store.finish(job_id, ApiResponse(**result).model_dump())
+    event = job_events.pop(job_id, None)
+    if event is not None:
+        event.set()
+
+def start_job(job_id: str, kind: str, request: BaseModel, cache_mode: str, priority: Optional[str] = None):
+    job_events[job_id] = asyncio.Event()
+    task = asyncio.create_task(run_job(job_id, kind, request, cache_mode, priority))
+    job_tasks.add(task)
+    task.add_done_callback(job_tasks.discard)
+
+@app.post("/api/jobs/{kind}", status_code=202)
+async def create_job(kind: Literal["schema", "eligibility", "grade", "evaluate"], body: Dict[str, Any], response: Response, cache: str = Query("use", pattern=CACHE_MODE_PATTERN)):
+    """Start a schema, eligibility, grade or evaluate request without waiting for it.
+
+    Takes the same body as the matching /api/{kind} endpoint and returns a
+    job ID to long-poll with GET /api/jobs/{job_id}?wait=30.
+    """
+    try:
+        request = JOB_REQUEST_MODELS[kind].model_validate(body)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+    
+    job = job_store.create(kind, WORKER_ID, body, cache, JOB_LEASE_SECONDS)
+    start_job(job["job_id"], kind, request, cache)
+    log.info("Job accepted", extra={"job_id": job["job_id"], "kind": kind})
+    
+    response.headers["Location"] = f"/api/jobs/{job['job_id']}"
+    return ApiResponse(success=True, data=job)
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str, wait: float = Query(0, ge=0)):
+    """Get a job, waiting up to ``wait`` seconds for it to finish"""
+    job = job_store.get(job_id)
+    if job is None:
+        return ApiResponse(success=False, error="Job not found")
+    
+    deadline = time.monotonic() + min(wait, JOB_MAX_WAIT_SECONDS)
+    while job["status"] == "RUNNING" and time.monotonic() < deadline:
+        event = job_events.get(job_id)
+        remaining = deadline - time.monotonic()
+        if event is not None:
+            try:
+                await asyncio.wait_for(event.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+        else:
+            # Running in another worker: watch the shared store
+            await asyncio.sleep(min(0.5, remaining))
+        job = job_store.get(job_id)
+    return ApiResponse(success=True, data=job)
+
+# Crash recovery
+RECOVERY_INTERVAL_SECONDS = float(os.getenv("RECOVERY_INTERVAL_SECONDS", 20))
+
+def recover_kickoffs() -> int:
+    """Poll PENDING kickoffs that no live worker is tracking.
+
+    Reads only an index of unleased PENDING kickoffs (no results) and
+    hands each to the poller, which claims its lease before polling.
+    """
+    # Kickoffs this fresh haven't had their first poll (and lease) yet
+    grace = KICKOFF_LEASE_SECONDS + (WEBHOOK_SAFETY_POLL_INTERVAL if WEBHOOKS_ENABLED else 0)
+    updated_before = datetime.fromtimestamp(time.time() - grace).isoformat()
+    recovered = 0
+    for record in kickoff_store.unleased_pending(updated_before):
+        kickoff_id = record["kickoff_id"]
+        api_type = record["api_type"]
+        config = API_CONFIG.get(api_type, {})
+        base_url = record["base_url"] or config.get("base_url")
+        token = record["token"] or config.get("token")
+        if kickoff_id in kickoff_poller.tracked or not base_url or not token:
+            continue
+        try:
+            age = max(0.0, (datetime.now() - datetime.fromisoformat(record["created_at"])).total_seconds())
+        except (TypeError, ValueError):
+            age = 0.0
+        outcome = kickoff_poller.track(
+            kickoff_id,
+            api_type,
+            base_url,
+            crew_headers(token),
+            webhook_nonce=record["webhook_nonce"],
+            safety_interval=WEBHOOK_SAFETY_POLL_INTERVAL if record["webhook_nonce"] else None,
+            age=age
+        )
+        if RESULT_CACHE_ENABLED and record["request_key"]:
+            outcome.add_done_callback(cache_when_done(record["request_key"], api_type))
+        recovered += 1
+    if recovered:
+        log.info("Re-attached pending kickoffs", extra={"kickoffs": recovered})
+    return recovered
+
+def recover_jobs() -> int:
+    """Rerun RUNNING jobs whose worker died.
+
+    A rerun joins the kickoffs its first run started (they are PENDING
+    in the store or already cached) instead of starting new ones.
+    """
+    recovered = 0
+    for job in job_store.claim_orphaned(WORKER_ID, JOB_LEASE_SECONDS):
+        try:
+            request = JOB_REQUEST_MODELS[job["kind"]].model_validate(job["request"])
+        except (KeyError, ValidationError):
+            job_store.finish(job["job_id"], ApiResponse(success=False, error="Job was interrupted by a server restart").model_dump())
+            continue
+        # Nobody is waiting on a rerun interactively, so it yields to live traffic
+        start_job(job["job_id"], job["kind"], request, job["cache_mode"] or "use", priority="background")
+        recovered += 1
+    if recovered:
+        log.info("Resumed interrupted jobs", extra={"jobs": recovered})
+    return recovered
+
+async def recover_periodically():
+    """Recover at startup, then keep our job leases alive and adopt orphans"""
+    while True:
+        try:
+            if job_events:
+                job_store.renew_leases(WORKER_ID, list(job_events), JOB_LEASE_SECONDS)
+            recover_kickoffs()
+            recover_jobs()
+        except Exception as e:
+            log.exception("Error recovering kickoffs and jobs")
+        await asyncio.sleep(RECOVERY_INTERVAL_SECONDS)
+
+@app.post("/api/evaluate", response_model=ApiResponse)
+async def evaluate(request: EvaluateRequest, cache: str = Query("use", pattern=CACHE_MODE_PATTERN)):
+    """Check eligibility and grade a project in one call, grading speculatively"""
+    outcome = await evaluate_project(
+        request.hackathon_rubric,
+        request.hackathon_requirements,
+        request.json_rubric,
+        request.project_writeup,
+        submission_id=request.submission_id,
+        cache_mode=cache,
+        grade_delay=request.grade_delay
+    )
+    record_evaluation_score(request, outcome)
+    return ApiResponse(success=True, data=outcome)
+
+@app.post("/api/batch")
+async def batch_evaluate(request: BatchRequest):
+    """Evaluate a list of submissions server-side, streaming results as NDJSON"""
+    concurrency = max(1, min(request.concurrency or BATCH_CONCURRENCY, BATCH_MAX_CONCURRENCY))
+    semaphore = asyncio.Semaphore(concurrency)
+    results_queue: asyncio.Queue = asyncio.Queue()
+    total = len(request.submissions)
+    started_at = time.monotonic()
+    
+    log.info("Batch started", extra={"submissions": total, "concurrency": concurrency})
+    
+    # Near-duplicate writeups are linked to (or, with "reuse", graded as) the first copy
+    duplicates = {}
+    if request.dedupe != "off":
+        duplicates = await asyncio.to_thread(find_duplicate_submissions, request.submissions, request.dedupe_threshold)
+    evaluations: Dict[int, asyncio.Future] = {index: asyncio.get_running_loop().create_future() for index in range(total)}
+    
+    async def worker(index: int, submission: Dict[str, Any]):
+        duplicate = None
+        if index in duplicates:
+            original, similarity = duplicates[index]
+            duplicate = (original, submission_summary(original, request.submissions[original])["submission_id"], similarity)
+        evaluation = await evaluate_batch_entry(index, submission, request, semaphore, evaluations, duplicate)
+        await results_queue.put(evaluation)
+    
+    # Tasks outlive the response so a closed client doesn't abort the batch
+    for index, submission in enumerate(request.submissions):
+        task = asyncio.create_task(worker(index, submission))
+        batch_tasks.add(task)
+        task.add_done_callback(batch_tasks.discard)
+    
+    async def stream_results():
+        completed = 0
+        failed = 0
+        while completed < total:
+            evaluation = await results_queue.get()
+            completed += 1
+            if not evaluation["success"]:
+                failed += 1
+            yield orjson.dumps({"type": "result", "completed": completed, "total": total, "data": evaluation}) + b"\n"
+        elapsed = round(time.monotonic() - started_at, 2)
+        log.info("Batch finished", extra={"submissions": total, "failed": failed, "seconds": elapsed})
+        yield orjson.dumps({"type": "done", "total": total, "failed": failed, "elapsed_seconds": elapsed}) + b"\n"
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+class UploadStreamingResponse(StreamingResponse):
+    """A StreamingResponse sent while the request body is still being read.
+
+    StreamingResponse watches ``receive`` for a client disconnect, which
+    would swallow the upload's body chunks, so this one only sends.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+@app.post("/api/ingest")
+async def ingest_submissions(request: Request):
+    """Evaluate an uploaded submissions file while it uploads, streaming results as NDJSON.
+
+    Takes multipart/form-data: the BatchRequest settings as form fields
+    (json_rubric as JSON text), followed by a ``file`` that is a JSON array,
+    NDJSON or CSV (``format`` overrides detection). Records are parsed,
+    validated and evaluated as they arrive; ingest and grading overlap.
+    """
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("multipart/form-data"):
+        raise HTTPException(status_code=415, detail="Upload the submissions file as multipart/form-data")
+    
+    # Settings fields come first; evaluation starts once the file does
+    try:
+        events = MultipartReader(content_type, INGEST_MAX_FIELD_BYTES).events(request.stream())
+        fields: Dict[str, str] = {}
+        upload = None
+        async for event in events:
+            if event[0] == "field":
+                fields[event[1]] = event[2]
+            elif event[0] == "file":
+                upload = event
+                break
+    except IngestError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if upload is None:
+        raise HTTPException(status_code=400, detail="No submissions file uploaded (send the settings fields before the file)")
+    
+    file_format = fields.pop("format", None)
+    if "json_rubric" in fields:
+        try:
+            fields["json_rubric"] = json.loads(fields["json_rubric"])
+        except ValueError:
+            pass
+    try:
+        settings = BatchRequest.model_validate({**fields, "submissions": []})
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+    
+    concurrency = max(1, min(settings.concurrency or BATCH_CONCURRENCY, BATCH_MAX_CONCURRENCY))
+    semaphore = asyncio.Semaphore(concurrency)
+    # Parsing pauses (and stops reading the upload) while this many records wait to be evaluated
+    slots = asyncio.Semaphore(concurrency * 2)
+    results_queue: asyncio.Queue = asyncio.Queue()
+    duplicate_index = DuplicateIndex(settings.dedupe_threshold) if settings.dedupe != "off" else None
+    originals: Dict[int, tuple] = {}
+    evaluations: Dict[int, asyncio.Future] = {}
+    pending = set()
+    counts = {"received": 0, "invalid": 0}
+    started_at = time.monotonic()
+    
+    log.info("Ingest started", extra={"upload": upload[2], "concurrency": concurrency})
+    
+    async def evaluate(index: int, submission: Dict[str, Any], duplicate: Optional[tuple]):
+        try:
+            await results_queue.put(("result", await evaluate_batch_entry(index, submission, settings, semaphore, evaluations, duplicate)))
+        finally:
+            slots.release()
+    
+    async def accept(number: int, record: Any):
+        if isinstance(record, IngestError):
+            raise record
+        submission = normalize_submission(record)
+        index = counts["received"]
+        counts["received"] += 1
+        duplicate = None
+        if duplicate_index is not None:
+            submission_id = submission_summary(index, submission)["submission_id"]
+            match = duplicate_index.add(index, submission["description"])
+            if match is not None:
+                # Chains of duplicates point at the earliest original
+                original, similarity = match
+                original_index, original_id = originals.get(original, (original, None))
+                duplicate = (original_index, original_id, similarity)
+                originals[index] = (original_index, original_id)
+            else:
+                originals[index] = (index, submission_id)
+        if settings.dedupe == "reuse" and duplicate is None:
+            # Only originals can be reused, so only theirs are kept
+            evaluations[index] = asyncio.get_running_loop().create_future()
+        await slots.acquire()
+        task = asyncio.create_task(evaluate(index, submission, duplicate))
+        for tasks in (pending, batch_tasks):
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    
+    async def ingest():
+        parser = None
+        try:
+            async for event in events:
+                if event[0] == "data":
+                    if parser is None:
+                        parser = make_parser(file_format or detect_format(upload[2], upload[3], event[1]), INGEST_MAX_RECORD_BYTES)
+                    records = parser.feed(event[1])
+                elif event[0] == "end":
+                    records = parser.close() if parser is not None else []
+                else:
+                    continue
+                for number, record in records:
+                    try:
+                        await accept(number, record)
+                    except IngestError as e:
+                        counts["invalid"] += 1
+                        await results_queue.put(("invalid", {"record": number, "error": str(e)}))
+                if event[0] == "end":
+                    break
+        except IngestError as e:
+            log.warning("Stopped reading upload", extra={"received": counts["received"], "error": str(e)})
+            await results_queue.put(("error", {"error": str(e)}))
+        except ClientDisconnect:
+            log.warning("Client disconnected during upload", extra={"received": counts["received"]})
+        except Exception as e:
+            log.exception("Unexpected error reading upload", extra={"received": counts["received"]})
+            await results_queue.put(("error", {"error": f"Upload failed: {str(e)}"}))
+        # Evaluations already started finish even if the client is gone
+        while pending:
+            await asyncio.wait(set(pending))
+        await results_queue.put(("done", None))
+    
+    task = asyncio.create_task(ingest())
+    batch_tasks.add(task)
+    task.add_done_callback(batch_tasks.discard)
+    
+    async def stream_results():
+        completed = 0
+        failed = 0
+        while True:
+            kind, data = await results_queue.get()
+            if kind == "result":
+                completed += 1
+                if not data["success"]:
+                    failed += 1
+                yield orjson.dumps({"type": "result", "completed": completed, "received": counts["received"], "data": data}) + b"\n"
+            elif kind == "done":
+                break
+            else:
+                yield orjson.dumps({"type": kind, **data}) + b"\n"
+        elapsed = round(time.monotonic() - started_at, 2)
+        log.info("Ingest finished", extra={"submissions": completed, "failed": failed, "invalid": counts["invalid"], "seconds": elapsed})
+        yield orjson.dumps({"type": "done", "total": completed, "failed": failed, "invalid": counts["invalid"], "elapsed_seconds": elapsed}) + b"\n"
+    
+    return UploadStreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+@app.post("/api/duplicates")
+async def detect_duplicates(request: DuplicatesRequest):
+    """List near-duplicate submissions by writeup similarity"""
+    duplicates = await asyncio.to_thread(find_duplicate_submissions, request.submissions, request.threshold)
+    return ApiResponse(success=True, data={
+        "duplicates": [
+            {
+                **submission_summary(index, request.submissions[index]),
+                "duplicate_of": submission_summary(original, request.submissions[original])["submission_id"],
+                "similarity": similarity
+            }
+            for index, (original, similarity) in sorted(duplicates.items())
+        ],
+        "count": len(duplicates)
+    })
+
+@app.get("/api/leaderboard")
+async def get_leaderboard(
+    rubric_id: Optional[str] = None,
+    limit: int = Query(10, ge=0),
+    submission_id: Optional[str] = None
+):
+    """Top-N, percentiles and per-criterion statistics of a rubric's scores.
+
+    Without ``rubric_id`` lists the rubrics that have leaderboards (the ID
+    is in every scored grade's ``score.rubric_id``). With ``submission_id``
+    also reports that submission's rank.
+    """
+    if rubric_id is None:
+        return ApiResponse(success=True, data={"leaderboards": leaderboard_store.rubrics()})
+    
+    board = leaderboard_store.get(rubric_id)
+    if board is None:
+        return ApiResponse(success=False, error="Leaderboard not found")
+    data = board.snapshot(min(limit, LEADERBOARD_MAX_LIMIT))
+    if submission_id is not None:
+        entry = board.entries.get(submission_id)
+        data["submission"] = {**entry, "rank": board.rank(submission_id)} if entry else None
+    return ApiResponse(success=True, data=data)
+
+@app.post("/api/leaderboard/clear")
+async def clear_leaderboard(rubric_id: Optional[str] = None):
+    """Drop one rubric's leaderboard, or all of them"""
+    leaderboard_store.clear([rubric_id] if rubric_id else None)
+    return ApiResponse(success=True, data={"cleared": True})
+
+def public_kickoff(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop upstream URLs and tokens from a kickoff record"""
+    return {column: record[column] for column in PUBLIC_COLUMNS if column in record}
+
+def encode_cursor(sort_value: str, kickoff_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([sort_value, kickoff_id]).encode()).decode()
+
+def decode_since(since: str) -> Optional[tuple]:
+    """The (updated_at, kickoff_id) position in a next_since token, or None for a plain timestamp"""
+    try:
+        sort_value, kickoff_id = json.loads(base64.urlsafe_b64decode(since.encode()))
+    except (ValueError, TypeError):
+        return None
+    return (sort_value, kickoff_id) if isinstance(sort_value, str) and isinstance(kickoff_id, str) else None
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        sort_value, kickoff_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return sort_value, kickoff_id
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 @app.get("/api/kickoff-status/{kickoff_id}")
 async def get_kickoff_status(kickoff_id: str):
     """Get the status of a specific kickoff ID"""
-    if kickoff_id not in kickoff_storage:
+    status_info = kickoff_store.get(kickoff_id)
+    if status_info is None:
         return ApiResponse(success=False, error="Kickoff ID not found")
     
-    status_info = kickoff_storage[kickoff_id]
-    return ApiResponse(success=True, data=status_info)
+    return ApiResponse(success=True, data=public_kickoff(status_info))
 
 @app.get("/api/kickoff-status")
-async def get_all_kickoff_status():
-    """Get status of all stored kickoff IDs"""
-    return ApiResponse(success=True, data=kickoff_storage)
+async def get_all_kickoff_status(
+    request: Request,
+    status: Optional[str] = None,
+    api_type: Optional[str] = None,
+    submission_id: Optional[str] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+    since: Optional[str] = None,
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """List stored kickoffs with filtering, cursor pagination and projection.
 
-@app.post("/api/resume-kickoffs")
-async def resume_kickoffs(request: ResumeRequest):
-    """Resume processing for specific kickoff IDs"""
-    results = {}
+    ``since`` (a timestamp) turns the listing into a change feed ordered by
+    updated_at; pass the returned ``next_since`` token on the next call. ``fields`` is a
+    comma-separated projection, e.g. ``fields=status,api_type`` to skip
+    result payloads. Responses carry an ETag for If-None-Match.
+    """
+    columns = PUBLIC_COLUMNS
+    if fields:
+        columns = tuple(field.strip() for field in fields.split(",") if field.strip())
+        unknown = set(columns) - set(PUBLIC_COLUMNS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
     
-    for kickoff_id in request.kickoff_ids:
-        if kickoff_id not in kickoff_storage:
-            results[kickoff_id] = {"success": False, "error": "Kickoff ID not found"}
-            continue
-        
-        status_info = kickoff_storage[kickoff_id]
-        
-        # Resume if pending or timeout
-        if status_info["status"] not in ["PENDING", "TIMEOUT"]:
-            results[kickoff_id] = {
-                "success": True, 
-                "data": status_info["result"],
-                "status": status_info["status"]
-            }
-            continue
-        
+    # Unchanged store + same query means the client already has this page
+    etag = '"' + hashlib.sha1(f"{kickoff_store.version()}|{request.url.query}".encode()).hexdigest() + '"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    order_by = "updated_at" if since is not None else "created_at"
+    after = decode_cursor(cursor) if cursor else None
+    updated_after = since
+    if since is not None:
+        # next_since resumes at the last row seen, so rows sharing its updated_at aren't skipped
+        since_position = decode_since(since)
+        if since_position is not None:
+            updated_after = None
+            after = after or since_position
+    rows = kickoff_store.query(
+        status=status,
+        api_type=api_type,
+        submission_id=submission_id,
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+        order_by=order_by,
+        after=after,
+        limit=limit + 1,
+        columns=columns
+    )
+    
+    page = rows[:limit]
+    data = {
+        "kickoffs": {kickoff_id: record for kickoff_id, _, record in page},
+        "count": len(page),
+        "next_cursor": encode_cursor(page[-1][1], page[-1][0]) if len(rows) > limit else None
+    }
+    if since is not None:
+        data["next_since"] = encode_cursor(page[-1][1], page[-1][0]) if page else since
+    
+    response = ORJSONResponse(ApiResponse(success=True, data=data).model_dump())
+    response.headers["ETag"] = etag
+    return response
+
+async def resume_kickoff(kickoff_id: str, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    """Resume a single stored kickoff, returning settled ones immediately"""
+    status_info = kickoff_store.get(kickoff_id)
+    if status_info is None:
+        return {"success": False, "error": "Kickoff ID not found"}
+    
+    # Resume if pending or timeout
+    if status_info["status"] not in ["PENDING", "TIMEOUT"]:
+        return {
+            "success": True, 
+            "data": status_info["result"],
+            "status": status_info["status"]
+        }
+    
+    async with semaphore:
         try:
-            # Resume polling
-            headers = {
-                "Authorization": f"Bearer {status_info['token']}",
-                "Content-Type": "application/json"
-            }
-            
-            # Poll status
-            max_attempts = 20
-            for attempt in range(max_attempts):
-                print(f"🔄 [Resume] Polling {kickoff_id} attempt {attempt + 1}/{max_attempts}")
-                time.sleep(10)
-                
-                status_response = requests.get(
-                    f"{status_info['base_url']}/status/{kickoff_id}", 
-                    headers=headers, 
-                    timeout=120
-                )
-                status_response.raise_for_status()
-                status_data = status_response.json()
-                
-                print(f"📊 [Resume] {kickoff_id} Status: {status_data.get('state')}")
-                
-                if status_data.get("state") in ("SUCCESS", "FAILED", "COMPLETED"):
-                    print(f"✅ [Resume] {kickoff_id} Final state: {status_data.get('state')}")
-                    
-                    if status_data.get("state") == "FAILED":
-                        error_msg = f"CrewAI task failed: {status_data.get('status', 'Unknown error')}"
-                        kickoff_storage[kickoff_id]["status"] = "FAILED"
-                        kickoff_storage[kickoff_id]["error"] = error_msg
-                        save_kickoff_storage()
-                        results[kickoff_id] = {"success": False, "error": error_msg}
-                        break
-                    
-                    # Handle API response formats
-                    result_data = None
-                    if status_data.get("result_json"):
-                        result_data = status_data["result_json"]
-                    elif status_data.get("result"):
-                        try:
-                            parsed_result = status_data["result"]
-                            if isinstance(parsed_result, str):
-                                import json
-                                parsed_result = json.loads(parsed_result)
-                            result_data = parsed_result
-                        except:
-                            result_data = status_data["result"]
-                    else:
-                        result_data = status_data
-                    
-                    # Update storage
-                    kickoff_storage[kickoff_id]["status"] = "SUCCESS"
-                    kickoff_storage[kickoff_id]["result"] = result_data
-                    save_kickoff_storage()
-                    
-                    results[kickoff_id] = {"success": True, "data": result_data}
-                    break
-            
-            else:
-                # Still pending
-                results[kickoff_id] = {"success": False, "error": "Still processing after max attempts"}
-                
+            if status_info["status"] == "TIMEOUT":
+                kickoff_store.update(kickoff_id, status="PENDING")
+            log.info("Re-attaching poller", extra={"kickoff_id": kickoff_id, "sample": True})
+            return await wait_for_kickoff(kickoff_id, status_info["api_type"], status_info["base_url"], status_info["token"], webhook_nonce=status_info.get("webhook_nonce"))
         except Exception as e:
-            print(f"❌ [Resume] Error resuming {kickoff_id}: {str(e)}")
-            results[kickoff_id] = {"success": False, "error": str(e)}
+            log.error("Error resuming kickoff", extra={"kickoff_id": kickoff_id, "error": str(e)})
+            return {"success": False, "error": str(e)}
+
+@app.post("/api/resume-kickoffs")
+async def resume_kickoffs(request: ResumeRequest, stream: bool = False):
+    """Resume processing for specific kickoff IDs concurrently.
+
+    With ?stream=true each kickoff is reported as an NDJSON line as soon
+    as it settles.
+    """
+    concurrency = max(1, min(request.concurrency or RESUME_CONCURRENCY, RESUME_MAX_CONCURRENCY))
+    semaphore = asyncio.Semaphore(concurrency)
+    kickoff_ids = list(dict.fromkeys(request.kickoff_ids))
+    
+    async def resume_with_id(kickoff_id: str):
+        return kickoff_id, await resume_kickoff(kickoff_id, semaphore)
+    
+    tasks = [asyncio.create_task(resume_with_id(kickoff_id)) for kickoff_id in kickoff_ids]
+    log.info("Resuming kickoffs", extra={"kickoffs": len(tasks), "concurrency": concurrency})
     
-    return ApiResponse(success=True, data=results)
+    if not stream:
+        results = dict(await asyncio.gather(*tasks))
+        return ApiResponse(success=True, data=results)
+    
+    async def stream_results():
+        completed = 0
+        for next_result in asyncio.as_completed(tasks):
+            kickoff_id, result = await next_result
+            completed += 1
+            yield orjson.dumps({"type": "result", "kickoff_id": kickoff_id, "completed": completed, "total": len(tasks), "data": result}) + b"\n"
+        yield orjson.dumps({"type": "done", "total": len(tasks)}) + b"\n"
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+@app.post("/api/webhooks/crew/{nonce}")
+async def crew_webhook(nonce: str, body: Dict[str, Any], sig: str = ""):
+    """Receive a signed completion callback from a crew"""
+    if not WEBHOOKS_ENABLED or not hmac.compare_digest(sig, sign_webhook_nonce(nonce)):
+        raise HTTPException(status_code=403, detail="Invalid webhook signature")
+    
+    kickoff_id = body.get("kickoff_id")
+    if not kickoff_id:
+        raise HTTPException(status_code=400, detail="Missing kickoff_id")
+    
+    status_data = webhook_status_data(body)
+    log.info("Webhook received", extra={"kickoff_id": kickoff_id, "state": status_data["state"]})
+    
+    try:
+        if kickoff_poller.deliver(kickoff_id, nonce, status_data):
+            return ApiResponse(success=True)
+    except ValueError:
+        raise HTTPException(status_code=403, detail="Webhook does not match kickoff")
+    
+    # Not tracked by this process: settle the stored record directly
+    record = kickoff_store.get(kickoff_id)
+    if record is None:
+        # The crew answered before its kickoff was stored; applied once tracked
+        kickoff_poller.hold(kickoff_id, nonce, status_data)
+        return ApiResponse(success=True)
+    if record["webhook_nonce"] != nonce:
+        raise HTTPException(status_code=403, detail="Webhook does not match kickoff")
+    kickoff_poller.discard_held(kickoff_id)
+    if record["status"] in ("PENDING", "TIMEOUT"):
+        finish_kickoff(kickoff_id, status_data)
+    return ApiResponse(success=True)
 
 @app.post("/api/clear-kickoff-storage")
 async def clear_kickoff_storage_endpoint():
@@ -526,6 +1572,42 @@ async def clear_kickoff_storage_endpoint():
     except Exception as e:
         return ApiResponse(success=False, error=f"Failed to clear storage: {str(e)}")
 
+@app.post("/api/compact-storage")
+async def compact_storage_endpoint():
+    """Apply the retention policies now instead of waiting for the next scheduled pass"""
+    stats = await asyncio.to_thread(compact_storage)
+    return ApiResponse(success=True, data=stats)
+
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Result cache hit/miss counters"""
+    return ApiResponse(success=True, data={"enabled": RESULT_CACHE_ENABLED, **result_cache.stats()})
+
+@app.post("/api/cache/clear")
+async def clear_cache():
+    """Drop all cached CrewAI results"""
+    result_cache.clear()
+    return ApiResponse(success=True, data={"cleared": True})
+
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus metrics for the kickoff pipeline"""
+    # Point-in-time gauges are refreshed on scrape
+    in_flight = kickoff_poller.stats()["owned_by_api_type"]
+    for api_type in set(API_CONFIG) | set(in_flight):
+        KICKOFFS_IN_FLIGHT.labels(api_type).set(in_flight.get(api_type, 0))
+    stored = kickoff_store.count_by_status()
+    for status in set(stored) | {"PENDING", "SUCCESS", "FAILED", "TIMEOUT"}:
+        KICKOFFS_STORED.labels(status).set(stored.get(status, 0))
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        # Aggregate every worker's samples when running several workers
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 
 @app.get("/api/health")
 async def health_check():
@@ -539,6 +1621,10 @@ async def health_check():
             "eligibility": bool(API_CONFIG["eligibility"]["base_url"] and API_CONFIG["eligibility"]["token"]),
             "grader": bool(API_CONFIG["grader"]["base_url"] and API_CONFIG["grader"]["token"])
         },
+        "worker_id": WORKER_ID,
+        "poller": kickoff_poller.stats(),
+        "webhooks_enabled": WEBHOOKS_ENABLED,
+        "upstreams": limiter_stats(),
         "cors_origins": [
             "https://crew-judge.vercel.app",
             "http://localhost:3000",
@@ -550,11 +1636,12 @@ if __name__ == "__main__":
     import uvicorn
     # Use PORT environment variable for Render deployment, fallback to 8001 for local development
     port = int(os.getenv("PORT", 8001))
+    # Workers share kickoff state through the SQLite store
     uvicorn.run(
-        app, 
+        "main:app", 
         host="0.0.0.0", 
         port=port,
-        workers=1,
+        workers=int(os.getenv("WEB_CONCURRENCY", 1)),
         loop="asyncio",
         timeout_keep_alive=300,
         timeout_graceful_shutdown=60
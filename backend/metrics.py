@@ -0,0 +1,81 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# Kickoff pipeline
+KICKOFF_LATENCY = Histogram(
+    "crew_kickoff_latency_seconds",
+    "Time for an upstream crew to accept a kickoff request",
+    ["api_type"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+KICKOFF_TIME_TO_TERMINAL = Histogram(
+    "crew_kickoff_time_to_terminal_seconds",
+    "Time from tracking a kickoff to its terminal state",
+    ["api_type", "outcome"],
+    buckets=(1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600, 1800, 3600, 7200, 21600),
+)
+KICKOFF_POLLS = Histogram(
+    "crew_kickoff_polls",
+    "Status polls needed per kickoff",
+    ["api_type"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+KICKOFF_RETRIES = Counter(
+    "crew_kickoff_retries_total",
+    "Kickoff attempts retried after a failed attempt",
+    ["api_type", "reason"],
+)
+COALESCED_REQUESTS = Counter(
+    "crew_coalesced_requests_total",
+    "Requests that joined an identical in-flight kickoff instead of starting one",
+    ["api_type", "stage"],
+)
+SPECULATIVE_GRADES = Counter(
+    "crew_speculative_grades_total",
+    "Grades started before eligibility settled, by whether they were used or discarded",
+    ["outcome"],
+)
+
+# Upstream HTTP
+UPSTREAM_RESPONSES = Counter(
+    "crew_upstream_responses_total",
+    "Upstream crew responses by endpoint and HTTP status (or timeout/error)",
+    ["api_type", "endpoint", "status"],
+)
+BREAKER_TRIPS = Counter(
+    "crew_circuit_breaker_trips_total",
+    "Times an upstream circuit breaker opened",
+    ["api_type"],
+)
+SCHEDULER_QUEUE_WAIT = Histogram(
+    "crew_scheduler_queue_wait_seconds",
+    "Time a kickoff waited for its turn at the upstream limiter",
+    ["api_type", "priority"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+SCHEDULER_REJECTIONS = Counter(
+    "crew_scheduler_rejections_total",
+    "Kickoffs rejected because their priority class's queue was full",
+    ["api_type", "priority"],
+)
+
+# Kickoff state
+KICKOFFS_IN_FLIGHT = Gauge(
+    "crew_kickoffs_in_flight",
+    "Kickoffs currently polled by this worker's background poller",
+    ["api_type"],
+    multiprocess_mode="livesum",
+)
+KICKOFFS_STORED = Gauge(
+    "crew_kickoffs_stored",
+    "Stored kickoff records by status",
+    ["status"],
+    multiprocess_mode="mostrecent",
+)
+
+# Persistence
+STORE_WRITE_LATENCY = Histogram(
+    "kickoff_store_write_seconds",
+    "Latency of kickoff store writes",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
@@ -0,0 +1,176 @@
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from logs import get_logger
+
+log = get_logger("result_cache")
+
+# Cache modes accepted by the evaluation endpoints
+CACHE_MODES = ("use", "refresh", "bypass")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS result_cache (
+    cache_key TEXT PRIMARY KEY,
+    api_type TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_result_cache_last_access ON result_cache (last_access);
+"""
+
+
+def _normalize(value: Any) -> Any:
+    """Normalize an inputs payload so cosmetic differences hash the same"""
+    if isinstance(value, str):
+        return value.replace("\r\n", "\n").strip()
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def make_cache_key(api_type: str, inputs: Dict[str, Any]) -> str:
+    """Content hash of (api_type, normalized inputs)"""
+    canonical = json.dumps(
+        {"api_type": api_type, "inputs": _normalize(inputs)},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Content-addressed cache for successful CrewAI results.
+
+    Lookups hit an in-memory LRU first and fall back to a SQLite table
+    that survives restarts. Entries expire after ``ttl_seconds`` and the
+    least recently used ones are evicted once a tier is full.
+    """
+
+    def __init__(self, path: str, max_memory_entries: int = 1024, max_persistent_entries: int = 20000, ttl_seconds: float = 7 * 24 * 3600):
+        self.max_memory_entries = max_memory_entries
+        self.max_persistent_entries = max_persistent_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(SCHEMA)
+        self._writes_since_prune = 0
+        self.counters = {
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "memory_evictions": 0,
+            "persistent_evictions": 0,
+            "expirations": 0,
+        }
+        self.by_api_type: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, api_type: str, outcome: str):
+        per_type = self.by_api_type.setdefault(api_type, {"hits": 0, "misses": 0})
+        per_type[outcome] += 1
+
+    def get(self, key: str, api_type: str) -> Optional[Any]:
+        """Look up a cached result, or None on a miss"""
+        now = time.time()
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            value, created_at = entry
+            if now - created_at <= self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                self._count(api_type, "hits")
+                return copy.deepcopy(value)
+            del self._memory[key]
+            self.counters["expirations"] += 1
+
+        row = self._conn.execute(
+            "SELECT value, created_at FROM result_cache WHERE cache_key = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            if now - row[1] <= self.ttl_seconds:
+                value = json.loads(row[0])
+                with self._lock:
+                    self._conn.execute("UPDATE result_cache SET last_access = ? WHERE cache_key = ?", (now, key))
+                self._remember(key, value, row[1])
+                self.counters["persistent_hits"] += 1
+                self._count(api_type, "hits")
+                return copy.deepcopy(value)
+            with self._lock:
+                self._conn.execute("DELETE FROM result_cache WHERE cache_key = ?", (key,))
+            self.counters["expirations"] += 1
+
+        self.counters["misses"] += 1
+        self._count(api_type, "misses")
+        return None
+
+    def set(self, key: str, api_type: str, value: Any):
+        """Store a successful result in both tiers"""
+        now = time.time()
+        self._remember(key, copy.deepcopy(value), now)
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO result_cache (cache_key, api_type, value, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                    (key, api_type, json.dumps(value), now, now),
+                )
+                self._writes_since_prune += 1
+                if self._writes_since_prune >= 100:
+                    self._prune_persistent(now)
+        except sqlite3.Error as e:
+            log.warning("Error writing result cache", extra={"error": str(e)})
+        self.counters["stores"] += 1
+
+    def _remember(self, key: str, value: Any, created_at: float):
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.counters["memory_evictions"] += 1
+
+    def _prune_persistent(self, now: float):
+        """Drop expired rows and trim the table to its size limit"""
+        self._writes_since_prune = 0
+        expired = self._conn.execute(
+            "DELETE FROM result_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        evicted = self._conn.execute(
+            "DELETE FROM result_cache WHERE cache_key IN ("
+            "SELECT cache_key FROM result_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_persistent_entries,),
+        ).rowcount
+        self.counters["expirations"] += expired
+        self.counters["persistent_evictions"] += evicted
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.counters["memory_hits"] + self.counters["persistent_hits"]
+        lookups = hits + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "persistent_entries": self._conn.execute("SELECT COUNT(*) FROM result_cache").fetchone()[0],
+            "by_api_type": self.by_api_type,
+        }
+
+    def clear(self):
+        """Drop every cached result"""
+        self._memory.clear()
+        with self._lock:
+            self._conn.execute("DELETE FROM result_cache")
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,201 @@
+import copy
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+# Compiled rubrics kept in memory, keyed by rubric ID
+MAX_COMPILED_RUBRICS = 256
+
+_MISSING = object()
+
+
+class RubricError(ValueError):
+    """The json_rubric is not a usable JSON schema"""
+
+
+@dataclass(frozen=True)
+class Criterion:
+    """One scored leaf of a rubric schema, e.g. innovation → novel_approach"""
+    key: str
+    path: Tuple[str, ...]
+    minimum: Optional[float]
+    maximum: Optional[float]
+    weight: float
+    integer: bool
+    choices: Optional[Tuple[float, ...]] = None
+
+
+def rubric_id(schema: Dict[str, Any]) -> str:
+    """Content hash identifying a rubric schema"""
+    canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def _types(node: Dict[str, Any]) -> List[Any]:
+    node_type = node.get("type")
+    return node_type if isinstance(node_type, list) else [node_type]
+
+
+def _bound(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return None
+
+
+def _criteria(node: Dict[str, Any], path: Tuple[str, ...], weight: float) -> List[Criterion]:
+    """Walk the schema's properties down to its numeric leaves"""
+    weight *= _bound(node.get("weight")) or 1.0
+    properties = node.get("properties")
+    if isinstance(properties, dict):
+        criteria = []
+        for name, child in properties.items():
+            if isinstance(child, dict):
+                criteria.extend(_criteria(child, path + (str(name),), weight))
+        return criteria
+    types = _types(node)
+    if path and ("integer" in types or "number" in types):
+        # Bonus criteria are often an enum such as [0, 5] instead of a range
+        choices = None
+        if isinstance(node.get("enum"), list):
+            choices = tuple(sorted(value for value in map(_bound, node["enum"]) if value is not None)) or None
+        minimum, maximum = _bound(node.get("minimum")), _bound(node.get("maximum"))
+        if choices:
+            minimum = choices[0] if minimum is None else minimum
+            maximum = choices[-1] if maximum is None else maximum
+        return [Criterion(
+            key=".".join(path),
+            path=path,
+            minimum=minimum,
+            maximum=maximum,
+            weight=weight,
+            integer="number" not in types,
+            choices=choices,
+        )]
+    return []
+
+
+def _lookup(result: Any, path: Tuple[str, ...]) -> Any:
+    for name in path:
+        if not isinstance(result, dict) or name not in result:
+            return _MISSING
+        result = result[name]
+    return result
+
+
+def _store(result: Dict[str, Any], path: Tuple[str, ...], value: Any):
+    for name in path[:-1]:
+        child = result.get(name)
+        if not isinstance(child, dict):
+            child = result[name] = {}
+        result = child
+    result[path[-1]] = value
+
+
+class CompiledRubric:
+    """A json_rubric reduced to its scored criteria.
+
+    Criteria are the numeric leaves of the schema with their minimum and
+    maximum (or allowed values, for an ``enum``). A non-standard
+    ``weight`` keyword on any node multiplies the weight of every
+    criterion below it (default 1).
+    """
+
+    def __init__(self, schema: Dict[str, Any], key: Optional[str] = None):
+        self.rubric_id = key or rubric_id(schema)
+        self.schema = schema
+        self.criteria = _criteria(schema, (), 1.0)
+        self.max_total = sum(c.weight * c.maximum for c in self.criteria if c.maximum is not None)
+
+    def score(self, result: Any) -> Tuple[Any, Dict[str, Any]]:
+        """Validate a grader result against the rubric.
+
+        Returns (result with every criterion clamped to its range, score
+        summary). Out-of-range values are clamped, values outside an enum snap
+        to the nearest allowed one, and missing or non-numeric criteria
+        score their minimum; all of these are listed in ``issues``.
+        """
+        clamped = copy.deepcopy(result) if isinstance(result, dict) else {}
+        scores: Dict[str, float] = {}
+        issues: List[Dict[str, Any]] = []
+        total = 0.0
+        for criterion in self.criteria:
+            raw = _lookup(result, criterion.path)
+            value: Optional[float] = None
+            if raw is _MISSING:
+                issues.append({"criterion": criterion.key, "issue": "missing"})
+            elif isinstance(raw, bool):
+                issues.append({"criterion": criterion.key, "issue": "invalid", "value": raw})
+            else:
+                try:
+                    value = float(raw)
+                except (TypeError, ValueError):
+                    issues.append({"criterion": criterion.key, "issue": "invalid", "value": raw})
+                else:
+                    if not math.isfinite(value):
+                        issues.append({"criterion": criterion.key, "issue": "invalid", "value": str(raw)})
+                        value = None
+            if value is None:
+                value = criterion.minimum or 0.0
+            else:
+                bounded = value
+                if criterion.minimum is not None:
+                    bounded = max(bounded, criterion.minimum)
+                if criterion.maximum is not None:
+                    bounded = min(bounded, criterion.maximum)
+                if criterion.choices and bounded not in criterion.choices:
+                    bounded = min(criterion.choices, key=lambda choice: abs(choice - bounded))
+                if bounded != value:
+                    issues.append({"criterion": criterion.key, "issue": "clamped", "value": raw})
+                value = bounded
+            if criterion.integer:
+                value = float(round(value))
+            scores[criterion.key] = int(value) if criterion.integer else value
+            total += criterion.weight * value
+            _store(clamped, criterion.path, scores[criterion.key])
+
+        return clamped, {
+            "rubric_id": self.rubric_id,
+            "total": round(total, 4),
+            "max_total": round(self.max_total, 4),
+            "percent": round(total / self.max_total * 100, 2) if self.max_total else None,
+            "scores": scores,
+            "valid": not issues,
+            "issues": issues,
+        }
+
+
+_compiled: "OrderedDict[str, CompiledRubric]" = OrderedDict()
+_compiled_lock = threading.Lock()
+
+
+def parse_rubric(json_rubric: Any) -> Dict[str, Any]:
+    """The json_rubric as a schema dict; the frontend may send it as a string"""
+    if isinstance(json_rubric, str):
+        try:
+            json_rubric = json.loads(json_rubric)
+        except ValueError as e:
+            raise RubricError(f"json_rubric is not valid JSON: {e}")
+    if not isinstance(json_rubric, dict):
+        raise RubricError("json_rubric must be a JSON object")
+    return json_rubric
+
+
+def compile_rubric(json_rubric: Any) -> CompiledRubric:
+    """Compile a json_rubric, reusing an earlier compilation of the same schema"""
+    schema = parse_rubric(json_rubric)
+    key = rubric_id(schema)
+    with _compiled_lock:
+        rubric = _compiled.get(key)
+        if rubric is not None:
+            _compiled.move_to_end(key)
+            return rubric
+    rubric = CompiledRubric(schema, key)
+    with _compiled_lock:
+        _compiled[key] = rubric
+        while len(_compiled) > MAX_COMPILED_RUBRICS:
+            _compiled.popitem(last=False)
+    return rubric
@@ -0,0 +1,19 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+# The backend modules are flat files imported by name, e.g. "from logs import get_logger"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def main(tmp_path_factory):
+    """The app in webhook mode, with its stores in a temporary directory"""
+    patch = pytest.MonkeyPatch()
+    patch.setenv("KICKOFF_DB_FILE", str(tmp_path_factory.mktemp("app") / "kickoffs.db"))
+    patch.setenv("WEBHOOK_BASE_URL", "https://backend.example")
+    patch.setenv("WEBHOOK_SECRET", "test-secret")
+    yield importlib.import_module("main")
+    patch.undo()
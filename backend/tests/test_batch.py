@@ -0,0 +1,6 @@
+def test_submission_summary_keeps_falsy_ids(main):
+    assert main.submission_summary(3, {"id": 0, "project_name": "Zero"}) == {"index": 3, "submission_id": "0", "project_name": "Zero"}
+    assert main.submission_summary(3, {"id": ""})["submission_id"] == "submission-3"
+    assert main.submission_summary(3, {})["submission_id"] == "submission-3"
+    assert main.submission_summary(3, {"name": "Alt"})["project_name"] == "Alt"
+    assert main.submission_summary(3, {})["project_name"] == "Project 4"
@@ -0,0 +1,95 @@
+import asyncio
+import gzip
+
+import brotli
+
+from compression import CompressionMiddleware, choose_encoding
+
+GZIP_REQUEST = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+
+
+def run(app, scope=GZIP_REQUEST) -> list:
+    """Messages the middleware sends for one request"""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(CompressionMiddleware(app, minimum_size=100)(scope, receive, send))
+    return sent
+
+
+def start(content_type: bytes, *headers) -> dict:
+    return {"type": "http.response.start", "status": 200, "headers": [(b"content-type", content_type), *headers]}
+
+
+def test_choose_encoding():
+    assert choose_encoding("gzip, deflate, br") == "br"
+    assert choose_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+    assert choose_encoding("br;q=0, *") == "gzip"
+    assert choose_encoding("identity") is None
+    assert choose_encoding("") is None
+
+
+def test_large_json_is_compressed():
+    body = b'{"feedback": "' + b"great work " * 50 + b'"}'
+
+    async def app(scope, receive, send):
+        await send(start(b"application/json", (b"content-length", str(len(body)).encode())))
+        await send({"type": "http.response.body", "body": body})
+
+    for accept, decompress in ((b"gzip", gzip.decompress), (b"br", brotli.decompress)):
+        response_start, response_body = run(app, {"type": "http", "headers": [(b"accept-encoding", accept)]})
+        headers = dict(response_start["headers"])
+        assert headers[b"content-encoding"] == accept
+        assert headers[b"vary"] == b"Accept-Encoding"
+        assert int(headers[b"content-length"]) == len(response_body["body"]) < len(body)
+        assert decompress(response_body["body"]) == body
+
+
+def test_small_bodies_pass_through():
+    async def app(scope, receive, send):
+        await send(start(b"application/json"))
+        await send({"type": "http.response.body", "body": b'{"ok": true}'})
+
+    response_start, response_body = run(app)
+    assert b"content-encoding" not in dict(response_start["headers"])
+    assert response_body["body"] == b'{"ok": true}'
+
+
+def test_stream_headers_are_sent_before_the_first_line():
+    observed = []
+
+    async def app(scope, receive, send):
+        await send(start(b"application/x-ndjson"))
+        # The client must already have the headers while the first result is pending
+        observed.append([message["type"] for message in sent_so_far])
+        await send({"type": "http.response.body", "body": b'{"type": "result"}\n' * 20, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    sent_so_far = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent_so_far.append(message)
+
+    asyncio.run(CompressionMiddleware(app, minimum_size=100)(GZIP_REQUEST, receive, send))
+
+    assert observed == [["http.response.start"]]
+    assert b"content-encoding" not in dict(sent_so_far[0]["headers"])
+    assert sent_so_far[1]["body"] == b'{"type": "result"}\n' * 20
+
+
+def test_already_encoded_responses_pass_through():
+    async def app(scope, receive, send):
+        await send(start(b"application/json", (b"content-encoding", b"gzip")))
+        await send({"type": "http.response.body", "body": b"x" * 500})
+
+    response_start, response_body = run(app)
+    assert dict(response_start["headers"])[b"content-encoding"] == b"gzip"
+    assert response_body["body"] == b"x" * 500
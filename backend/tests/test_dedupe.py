@@ -0,0 +1,63 @@
+import random
+
+from dedupe import DuplicateIndex, find_duplicates, jaccard, shingles
+
+WORDS = "agent crew rubric grade hackathon model vector search pipeline latency cache stream judge score demo team".split()
+
+
+def writeup(seed: int, length: int = 120) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) + str(rng.randrange(50)) for _ in range(length))
+
+
+def test_shingles_ignore_case_and_punctuation():
+    assert shingles("A fast, RAG pipeline!") == shingles("a fast rag pipeline")
+    assert len(shingles("one two three four")) == 2
+    assert len(shingles("too short")) == 1
+    assert shingles("") == set()
+
+
+def test_jaccard():
+    assert jaccard({1, 2, 3}, {1, 2, 3}) == 1.0
+    assert jaccard({1, 2}, {2, 3}) == 1 / 3
+    assert jaccard(set(), {1}) == 0.0
+
+
+def test_index_finds_near_duplicates_with_their_exact_similarity():
+    original = writeup(1)
+    edited = original.replace(original.split()[60], "changed", 1)
+    index = DuplicateIndex(threshold=0.8)
+
+    assert index.add("original", original) is None
+    assert index.add("other", writeup(2)) is None
+    match = index.add("edited", edited)
+
+    assert match[0] == "original"
+    assert match[1] == jaccard(shingles(original), shingles(edited))
+    assert match[1] >= 0.8
+    assert len(index) == 3
+
+
+def test_index_never_matches_empty_writeups():
+    index = DuplicateIndex()
+    assert index.add("a", "") is None
+    assert index.add("b", "...") is None
+    assert len(index) == 0
+
+
+def test_find_duplicates_points_chains_at_the_earliest_original():
+    base = writeup(3)
+    words = base.split()
+    first_copy = " ".join(words[:-1] + ["tweak"])
+    second_copy = " ".join(words[:-2] + ["tweak", "again"])
+    items = [(0, base), (1, writeup(4)), (2, first_copy), (3, second_copy)]
+
+    duplicates = find_duplicates(items, threshold=0.9)
+
+    assert set(duplicates) == {2, 3}
+    assert duplicates[2][0] == 0
+    assert duplicates[3][0] == 0
+
+
+def test_find_duplicates_leaves_distinct_writeups_alone():
+    assert find_duplicates((index, writeup(100 + index)) for index in range(50)) == {}
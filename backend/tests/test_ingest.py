@@ -0,0 +1,122 @@
+import asyncio
+import json
+
+import pytest
+
+from ingest import IngestError, MultipartReader, detect_format, make_parser, normalize_submission
+
+
+def parse(file_format: str, data: bytes, chunk_size: int = 7, max_record_bytes: int = 1 << 20) -> list:
+    """Feed a file in small chunks and collect every record, like an upload would"""
+    parser = make_parser(file_format, max_record_bytes)
+    records = []
+    for start in range(0, len(data), chunk_size):
+        records.extend(parser.feed(data[start:start + chunk_size]))
+    records.extend(parser.close())
+    return records
+
+
+def test_detect_format():
+    assert detect_format("subs.JSONL", None, b"") == "ndjson"
+    assert detect_format(None, "text/csv; charset=utf-8", b"") == "csv"
+    assert detect_format(None, None, b"\xef\xbb\xbf  [") == "json"
+    assert detect_format(None, None, b'{"a": 1}') == "ndjson"
+    assert detect_format(None, None, b"name,description") == "csv"
+
+
+def test_json_array_records_survive_any_chunking():
+    submissions = [{"description": "A, with \"quotes\" ]"}, {"description": "B"}, 42]
+    data = json.dumps(submissions).encode()
+
+    for chunk_size in (1, 3, 1000):
+        assert parse("json", data, chunk_size) == [(1, submissions[0]), (2, submissions[1]), (3, 42)]
+
+
+def test_json_array_keeps_records_before_an_error():
+    parser = make_parser("json", 1 << 20)
+    assert parser.feed(b'[{"description": "A"}, {"description": ') == [(1, {"description": "A"})]
+    with pytest.raises(IngestError):
+        parser.close()
+
+    with pytest.raises(IngestError):
+        parse("json", b'{"description": "not an array"}')
+
+
+def test_json_array_limits_record_size():
+    with pytest.raises(IngestError, match="larger than"):
+        parse("json", b'[{"description": "' + b"x" * 100 + b'"}]', max_record_bytes=50)
+
+
+def test_ndjson_rejects_only_the_bad_line():
+    data = b'{"description": "A"}\n\nnot json\n{"description": "B"}'
+
+    records = parse("ndjson", data)
+
+    assert records[0] == (1, {"description": "A"})
+    assert records[1][0] == 3 and isinstance(records[1][1], IngestError)
+    assert records[2] == (4, {"description": "B"})
+
+
+def test_csv_rows_may_span_lines_and_chunks():
+    data = 'Project Name,Description\n"A","Line one\nline two, with ""quotes"""\r\nB,Plain\n\n'.encode()
+
+    for chunk_size in (1, 5, 1000):
+        records = parse("csv", data, chunk_size)
+        assert records == [
+            (1, {"project_name": "A", "description": 'Line one\nline two, with "quotes"'}),
+            (2, {"project_name": "B", "description": "Plain"}),
+        ]
+
+
+def test_csv_rejects_rows_with_the_wrong_column_count():
+    records = parse("csv", b"name,description\nA,one\nB\n")
+    assert records[0] == (1, {"name": "A", "description": "one"})
+    assert isinstance(records[1][1], IngestError)
+
+
+def test_parsers_reject_invalid_utf8():
+    with pytest.raises(IngestError, match="UTF-8"):
+        parse("ndjson", b'{"description": "\xff"}\n')
+
+
+def test_normalize_submission_maps_alternative_fields():
+    submission = normalize_submission({"title": "Demo", "writeup": " Text ", "team": "Ana; Bo|", "url": "http://x", "submission_id": 7})
+
+    assert submission == {"description": "Text", "project_name": "Demo", "id": "7", "demo_link": "http://x", "team_members": ["Ana", "Bo"]}
+    with pytest.raises(IngestError):
+        normalize_submission({"project_name": "No description"})
+    with pytest.raises(IngestError):
+        normalize_submission(["not", "an", "object"])
+
+
+def test_multipart_reader_streams_fields_and_file_parts():
+    body = (
+        b"--XyZ\r\n"
+        b'Content-Disposition: form-data; name="concurrency"\r\n\r\n'
+        b"4\r\n"
+        b"--XyZ\r\n"
+        b'Content-Disposition: form-data; name="file"; filename="subs.ndjson"\r\n'
+        b"Content-Type: application/x-ndjson\r\n\r\n"
+        b'{"description": "A"}\n'
+        b"\r\n--XyZ--\r\n"
+    )
+
+    async def chunks():
+        for start in range(0, len(body), 9):
+            yield body[start:start + 9]
+
+    async def read():
+        reader = MultipartReader("multipart/form-data; boundary=XyZ", max_field_bytes=1024)
+        return [event async for event in reader.events(chunks())]
+
+    events = asyncio.run(read())
+
+    assert events[0] == ("field", "concurrency", "4")
+    assert events[1] == ("file", "file", "subs.ndjson", "application/x-ndjson")
+    assert b"".join(event[1] for event in events if event[0] == "data") == b'{"description": "A"}\n'
+    assert events[-1] == ("end",)
+
+
+def test_multipart_reader_needs_a_boundary():
+    with pytest.raises(IngestError):
+        MultipartReader("multipart/form-data", max_field_bytes=1024)
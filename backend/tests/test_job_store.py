@@ -0,0 +1,22 @@
+import threading
+
+from job_store import JobStore
+
+
+def test_prune_deletes_only_old_finished_jobs(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    running = store.create("batch", "worker-a", {}, "use", lease_seconds=60)
+    finished = store.create("batch", "worker-a", {}, "use", lease_seconds=60)
+    store.finish(finished["job_id"], {"success": True})
+
+    assert store.prune(max_age_seconds=3600) == 0
+    # Pruned from a thread, as compaction does, while the shared connection stays usable
+    pruned = []
+    thread = threading.Thread(target=lambda: pruned.append(store.prune(max_age_seconds=-1)))
+    thread.start()
+    thread.join()
+
+    assert pruned == [1]
+    assert store.get(finished["job_id"]) is None
+    assert store.get(running["job_id"])["status"] == "RUNNING"
+    store.close()
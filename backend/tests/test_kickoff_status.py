@@ -0,0 +1,42 @@
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def client(main):
+    return TestClient(main.app)
+
+
+def test_change_feed_keeps_rows_that_share_a_timestamp_across_pages(main, client):
+    for index in range(5):
+        main.kickoff_store.upsert(f"feed{index}", {"status": "SUCCESS", "api_type": "feed"})
+    # Settled in the same instant, as happens when a batch finishes together
+    main.kickoff_store._conn.execute("UPDATE kickoffs SET updated_at = '2020-01-01T00:00:00' WHERE api_type = 'feed'")
+
+    seen = []
+    since = "2019-12-31T00:00:00"
+    for _ in range(5):
+        data = client.get("/api/kickoff-status", params={"api_type": "feed", "since": since, "limit": 2}).json()["data"]
+        seen.extend(data["kickoffs"])
+        since = data["next_since"]
+        if not data["kickoffs"]:
+            break
+
+    assert seen == [f"feed{index}" for index in range(5)]
+
+    # A later update shows up from the last token
+    main.kickoff_store.update("feed2", status="FAILED")
+    data = client.get("/api/kickoff-status", params={"api_type": "feed", "since": since}).json()["data"]
+    assert list(data["kickoffs"]) == ["feed2"]
+
+
+def test_listing_pages_by_cursor(main, client):
+    for index in range(3):
+        main.kickoff_store.upsert(f"list{index}", {"status": "PENDING", "api_type": "list", "created_at": f"2024-02-0{index + 1}T00:00:00"})
+
+    first = client.get("/api/kickoff-status", params={"api_type": "list", "limit": 2, "fields": "status"}).json()["data"]
+    assert list(first["kickoffs"]) == ["list0", "list1"]
+    assert first["kickoffs"]["list0"] == {"status": "PENDING"}
+    rest = client.get("/api/kickoff-status", params={"api_type": "list", "cursor": first["next_cursor"]}).json()["data"]
+    assert list(rest["kickoffs"]) == ["list2"]
+    assert rest["next_cursor"] is None
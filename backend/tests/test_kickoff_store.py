@@ -0,0 +1,136 @@
+import pytest
+
+from kickoff_store import KickoffStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = KickoffStore(str(tmp_path / "kickoffs.db"))
+    yield store
+    store.close()
+
+
+def test_upsert_round_trips_a_record(store):
+    store.upsert("k1", {"status": "PENDING", "api_type": "grader", "base_url": "http://crew", "token": "t", "result": None})
+
+    record = store.get("k1")
+    assert record["status"] == "PENDING"
+    assert record["api_type"] == "grader"
+    assert record["base_url"] == "http://crew"
+    assert record["created_at"] and record["updated_at"]
+    assert "k1" in store
+    assert store.get("missing") is None
+
+
+def test_upsert_replaces_the_whole_record(store):
+    store.upsert("k1", {"status": "PENDING", "api_type": "grader", "submission_id": "s1"})
+    store.upsert("k1", {"status": "TIMEOUT", "api_type": "grader"})
+
+    record = store.get("k1")
+    assert record["status"] == "TIMEOUT"
+    assert record["submission_id"] is None
+    assert store.count() == 1
+
+
+def test_settled_records_drop_credentials(store):
+    store.upsert("k1", {"status": "SUCCESS", "base_url": "http://crew", "token": "t", "result": {"score": 3}})
+    store.upsert("k2", {"status": "PENDING", "base_url": "http://crew", "token": "t"})
+    store.update("k2", status="FAILED", error="boom")
+
+    for kickoff_id in ("k1", "k2"):
+        record = store.get(kickoff_id)
+        assert record["base_url"] is None
+        assert record["token"] is None
+    assert store.get("k1")["result"] == {"score": 3}
+    assert store.get("k2")["error"] == "boom"
+
+
+def test_update_rejects_unknown_fields(store):
+    store.upsert("k1", {"status": "PENDING"})
+    with pytest.raises(ValueError):
+        store.update("k1", colour="red")
+
+
+def test_query_filters_and_pages(store):
+    for index in range(5):
+        store.upsert(f"k{index}", {"status": "SUCCESS" if index % 2 else "PENDING", "api_type": "grader", "created_at": f"2024-01-0{index + 1}T00:00:00"})
+
+    rows = store.query(status="PENDING", limit=2)
+    assert [kickoff_id for kickoff_id, _, _ in rows] == ["k0", "k2"]
+    assert set(rows[0][2]) == {"status", "created_at", "updated_at", "api_type", "submission_id", "result", "error"}
+
+    rest = store.query(status="PENDING", after=(rows[-1][1], rows[-1][0]))
+    assert [kickoff_id for kickoff_id, _, _ in rest] == ["k4"]
+    assert store.count_by_status() == {"PENDING": 3, "SUCCESS": 2}
+
+
+def test_claim_lease_is_exclusive_until_it_expires(store):
+    store.upsert("k1", {"status": "PENDING"})
+
+    assert store.claim_lease("k1", "worker-a", ttl=30)
+    assert store.claim_lease("k1", "worker-a", ttl=30)
+    assert not store.claim_lease("k1", "worker-b", ttl=30)
+
+    store.release_leases("worker-a")
+    assert store.claim_lease("k1", "worker-b", ttl=-1)
+    # worker-b's lease is already expired, so it can be taken over
+    assert store.claim_lease("k1", "worker-a", ttl=30)
+
+
+def test_claim_lease_only_coordinates_pending_records(store):
+    store.upsert("k1", {"status": "SUCCESS"})
+
+    assert not store.claim_lease("k1", "worker-a", ttl=30)
+    # Nothing stored: nothing to coordinate
+    assert store.claim_lease("unknown", "worker-a", ttl=30)
+
+
+def test_unleased_pending_skips_live_leases(store):
+    store.upsert("k1", {"status": "PENDING", "created_at": "2024-01-01T00:00:00"})
+    store.upsert("k2", {"status": "PENDING", "created_at": "2024-01-01T00:00:00"})
+    store.claim_lease("k1", "worker-a", ttl=30)
+
+    orphans = store.unleased_pending(updated_before="9999-01-01")
+    assert [record["kickoff_id"] for record in orphans] == ["k2"]
+
+
+def test_large_results_are_offloaded_compressed(tmp_path):
+    store = KickoffStore(str(tmp_path / "kickoffs.db"), result_inline_bytes=64)
+    result = {"feedback": "x" * 1000}
+    store.upsert("k1", {"status": "SUCCESS", "result": result})
+
+    row = store._conn.execute("SELECT result, result_offloaded FROM kickoffs WHERE kickoff_id = 'k1'").fetchone()
+    assert row["result"] is None and row["result_offloaded"] == 1
+    assert store.get("k1")["result"] == result
+    store.close()
+
+
+def test_compact_applies_retention_and_never_deletes_pending(store):
+    store.upsert("old", {"status": "SUCCESS", "created_at": "2000-01-01T00:00:00"})
+    store.upsert("old-pending", {"status": "PENDING", "created_at": "2000-01-01T00:00:00"})
+    for index in range(3):
+        store.upsert(f"new{index}", {"status": "FAILED", "created_at": f"2999-01-0{index + 1}T00:00:00"})
+
+    stats = store.compact(max_age_seconds=86400, max_count=2)
+
+    assert stats["expired"] == 1
+    assert stats["over_count"] == 1
+    remaining = {kickoff_id for kickoff_id, _, _ in store.query(limit=10)}
+    assert remaining == {"old-pending", "new1", "new2"}
+
+
+def test_compact_offloads_inline_results_and_drops_orphans(tmp_path):
+    path = str(tmp_path / "kickoffs.db")
+    legacy = KickoffStore(path, result_inline_bytes=10**6)
+    legacy.upsert("k1", {"status": "SUCCESS", "result": {"feedback": "x" * 1000}})
+    legacy._conn.execute("INSERT INTO kickoff_results (kickoff_id, data) VALUES ('gone', x'00')")
+    legacy.close()
+
+    store = KickoffStore(path, result_inline_bytes=64)
+    stats = store.compact()
+
+    assert stats["results_offloaded"] == 1
+    assert stats["orphaned_results"] == 1
+    assert store.get("k1")["result"] == {"feedback": "x" * 1000}
+    assert store.compact()["results_offloaded"] == 0
+    store.close()
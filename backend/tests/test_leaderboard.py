@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from leaderboard import Leaderboard, LeaderboardStore
+from rubric import compile_rubric
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "quality": {"type": "integer", "minimum": 0, "maximum": 10},
+        "impact": {"type": "integer", "minimum": 0, "maximum": 10},
+    },
+}
+
+
+def entry(submission_id: str, quality: int, impact: int = 0) -> dict:
+    return {"submission_id": submission_id, "project_name": submission_id.upper(), "total": float(quality + impact), "scores": {"quality": quality, "impact": impact}}
+
+
+@pytest.fixture
+def board():
+    return Leaderboard(compile_rubric(SCHEMA))
+
+
+def test_rank_orders_by_total_then_submission_id(board):
+    for submission in (entry("b", 5), entry("a", 5), entry("c", 9), entry("d", 1)):
+        board.upsert(submission)
+
+    assert [board.rank(submission_id) for submission_id in "cabd"] == [1, 2, 3, 4]
+    assert [row["submission_id"] for row in board.top(2)] == ["c", "a"]
+    assert board.top(2)[0]["rank"] == 1
+    assert board.rank("missing") is None
+
+
+def test_regrade_replaces_the_previous_score(board):
+    board.upsert(entry("a", 2))
+    board.upsert(entry("b", 6))
+    board.upsert(entry("a", 8))
+
+    assert len(board) == 2
+    assert board.rank("a") == 1
+    stats = board.snapshot(10)
+    assert stats["total"]["count"] == 2
+    assert stats["total"]["mean"] == 7.0
+    assert stats["criteria"]["quality"]["mean"] == 7.0
+
+
+def test_percentiles_use_nearest_rank(board):
+    for index in range(1, 11):
+        board.upsert(entry(f"s{index}", index))
+
+    assert board.percentile(50) == 5
+    assert board.percentile(90) == 9
+    assert board.percentile(100) == 10
+    assert board.percentile(0) == 1
+    assert board.snapshot(3)["percentiles"] == {"p25": 3, "p50": 5, "p75": 8, "p90": 9}
+
+
+def test_empty_board(board):
+    assert board.percentile(50) is None
+    assert board.snapshot(5)["top"] == []
+
+
+def test_store_shares_scores_between_workers(tmp_path):
+    path = str(tmp_path / "leaderboard.db")
+    rubric = compile_rubric(SCHEMA)
+    worker_a, worker_b = LeaderboardStore(path), LeaderboardStore(path)
+    _, score = rubric.score({"quality": 4, "impact": 4})
+    worker_a.record(rubric, "s1", "One", score)
+    assert worker_b.get(rubric.rubric_id).rank("s1") == 1
+
+    _, better = rubric.score({"quality": 9, "impact": 9})
+    worker_a.record(rubric, "s2", "Two", better)
+    board = worker_b.get(rubric.rubric_id)
+    assert [row["submission_id"] for row in board.top(5)] == ["s2", "s1"]
+
+    worker_b.clear([rubric.rubric_id])
+    assert worker_a.get(rubric.rubric_id) is None
+    worker_a.close()
+    worker_b.close()
+
+
+def test_batch_submissions_are_ranked_by_their_own_id(main, monkeypatch):
+    rubric = compile_rubric(SCHEMA)
+    grade = {"quality": 7, "impact": 3}
+    _, score = rubric.score(grade)
+
+    async def graded(*args, **kwargs):
+        return {"eligibility": {"success": True, "data": {"eligible": True}}, "grade": {"success": True, "data": grade, "score": score}}
+
+    monkeypatch.setattr(main, "evaluate_project", graded)
+    request = main.BatchRequest(hackathon_rubric="r", hackathon_requirements="q", json_rubric=SCHEMA, submissions=[])
+
+    for index, submission in enumerate([{"id": 0, "description": "Zero"}, {"description": "No id"}]):
+        evaluation = asyncio.run(main.evaluate_submission(index, submission, request))
+        assert evaluation["success"]
+
+    board = main.leaderboard_store.get(rubric.rubric_id)
+    # id 0 is a real id; the positional submission-1 fallback stays off the board
+    assert set(board.entries) == {"0"}
+    assert board.rank("0") == 1
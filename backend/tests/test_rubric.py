@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from rubric import RubricError, compile_rubric, rubric_id
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "innovation": {
+            "type": "object",
+            "weight": 2,
+            "properties": {
+                "novelty": {"type": "integer", "minimum": 0, "maximum": 10},
+                "impact": {"type": "number", "minimum": 0, "maximum": 5},
+            },
+        },
+        "bonus": {"type": "integer", "enum": [0, 5]},
+        "feedback": {"type": "string"},
+    },
+}
+
+
+def test_compile_finds_numeric_leaves_with_inherited_weights():
+    rubric = compile_rubric(SCHEMA)
+
+    criteria = {criterion.key: criterion for criterion in rubric.criteria}
+    assert set(criteria) == {"innovation.novelty", "innovation.impact", "bonus"}
+    assert criteria["innovation.novelty"].weight == 2
+    assert criteria["innovation.novelty"].integer
+    assert not criteria["innovation.impact"].integer
+    assert criteria["bonus"].choices == (0, 5)
+    assert (criteria["bonus"].minimum, criteria["bonus"].maximum) == (0, 5)
+    assert rubric.max_total == 2 * 10 + 2 * 5 + 5
+
+
+def test_compile_reuses_rubrics_by_content():
+    assert compile_rubric(SCHEMA) is compile_rubric(json.dumps(SCHEMA))
+    reordered = {"properties": SCHEMA["properties"], "type": "object"}
+    assert rubric_id(reordered) == rubric_id(SCHEMA)
+
+
+@pytest.mark.parametrize("json_rubric", ["not json", "[1, 2]", 42])
+def test_compile_rejects_non_object_rubrics(json_rubric):
+    with pytest.raises(RubricError):
+        compile_rubric(json_rubric)
+
+
+def test_score_totals_a_valid_grade():
+    grade = {"innovation": {"novelty": 8, "impact": 2.5}, "bonus": 5, "feedback": "Nice"}
+
+    clamped, score = compile_rubric(SCHEMA).score(grade)
+
+    assert clamped == grade
+    assert score["total"] == 2 * 8 + 2 * 2.5 + 5
+    assert score["percent"] == round(26 / 35 * 100, 2)
+    assert score["valid"] and score["issues"] == []
+
+
+def test_score_clamps_snaps_and_floors_bad_values():
+    grade = {"innovation": {"novelty": 14, "impact": "lots"}, "bonus": 3.9}
+
+    clamped, score = compile_rubric(SCHEMA).score(grade)
+
+    assert clamped["innovation"] == {"novelty": 10, "impact": 0.0}
+    assert clamped["bonus"] == 5
+    assert score["scores"] == {"innovation.novelty": 10, "innovation.impact": 0.0, "bonus": 5}
+    assert not score["valid"]
+    issues = {issue["criterion"]: issue["issue"] for issue in score["issues"]}
+    assert issues == {"innovation.novelty": "clamped", "innovation.impact": "invalid", "bonus": "clamped"}
+    # The grader's own result is left untouched
+    assert grade["innovation"]["novelty"] == 14
+
+
+def test_score_fills_in_missing_criteria():
+    clamped, score = compile_rubric(SCHEMA).score({"innovation": {"novelty": 3}})
+
+    assert clamped == {"innovation": {"novelty": 3, "impact": 0.0}, "bonus": 0}
+    assert [issue["issue"] for issue in score["issues"]] == ["missing", "missing"]
@@ -0,0 +1,166 @@
+import asyncio
+
+import pytest
+
+from upstream_limits import AdaptiveConcurrency, CircuitBreaker, FairQueue, QueueFull, TokenBucket, UpstreamLimiter, UpstreamUnavailable
+
+
+def make_limiter(concurrency: int = 2, rate: float = 0.0) -> UpstreamLimiter:
+    limiter = UpstreamLimiter("test")
+    limiter.concurrency = AdaptiveConcurrency(concurrency, 1, concurrency)
+    limiter.bucket = TokenBucket(rate, 1)
+    return limiter
+
+
+async def settle():
+    """Let queued tasks run until they block again"""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def test_token_bucket_reports_wait_once_empty():
+    bucket = TokenBucket(rate=2, burst=2)
+
+    assert bucket.try_take() == 0
+    assert bucket.try_take() == 0
+    assert bucket.try_take() == pytest.approx(0.5, abs=0.05)
+
+
+def test_breaker_opens_after_threshold_and_probes_once():
+    breaker = CircuitBreaker("test", failure_threshold=2, open_seconds=0, max_open_seconds=10)
+    breaker.record_failure()
+    assert breaker.retry_after() is None
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    # The open window has passed: one probe goes through, others wait for it
+    assert breaker.retry_after() is None
+    assert breaker.state == "half_open"
+    assert breaker.retry_after() == 1.0
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.retry_after() is None
+
+
+def test_adaptive_concurrency_halves_on_overload_and_grows_back():
+    concurrency = AdaptiveConcurrency(initial=8, minimum=1, maximum=8)
+    concurrency.in_flight = 2
+
+    concurrency.release(overloaded=True)
+    assert concurrency.limit == 4
+    # One overload episode only halves once
+    concurrency.release(overloaded=True)
+    assert concurrency.limit == 4
+
+    concurrency.in_flight = 1
+    concurrency.release(overloaded=False)
+    assert concurrency.limit == pytest.approx(4.25)
+
+
+def test_limiter_caps_concurrent_kickoffs():
+    async def scenario():
+        limiter = make_limiter(concurrency=2)
+        tasks = [asyncio.create_task(limiter.acquire()) for _ in range(3)]
+        await settle()
+        assert [task.done() for task in tasks] == [True, True, False]
+
+        await limiter.release("success")
+        await settle()
+        assert tasks[2].done()
+        assert limiter.concurrency.in_flight == 2
+
+    asyncio.run(scenario())
+
+
+def test_limiter_times_out_while_saturated():
+    async def scenario():
+        limiter = make_limiter(concurrency=1)
+        await limiter.acquire()
+        with pytest.raises(UpstreamUnavailable):
+            await limiter.acquire(timeout=0.05)
+        assert len(limiter.queue) == 0
+
+    asyncio.run(scenario())
+
+
+def served_order(queue: FairQueue, futures: dict) -> list:
+    names = {future: name for name, future in futures.items()}
+    order = []
+    while True:
+        future = queue.pop()
+        if future is None:
+            return order
+        order.append(names[future])
+
+
+def test_fair_queue_serves_priority_classes_strictly_in_order():
+    async def scenario():
+        queue = FairQueue({}, {})
+        futures = {
+            "background": queue.push("background", "a"),
+            "batch": queue.push("batch", "a"),
+            "interactive": queue.push("interactive", "a"),
+        }
+        assert served_order(queue, futures) == ["interactive", "batch", "background"]
+
+    asyncio.run(scenario())
+
+
+def test_fair_queue_interleaves_tenants_within_a_class():
+    async def scenario():
+        queue = FairQueue({}, {})
+        futures = {f"big{index}": queue.push("batch", "big") for index in range(4)}
+        futures.update({f"small{index}": queue.push("batch", "small") for index in range(2)})
+        # The small tenant takes turns instead of waiting behind the whole backlog
+        assert served_order(queue, futures) == ["big0", "small0", "big1", "small1", "big2", "big3"]
+
+    asyncio.run(scenario())
+
+
+def test_fair_queue_weights_tenant_shares():
+    async def scenario():
+        queue = FairQueue({}, {"heavy": 2.0})
+        futures = {f"heavy{index}": queue.push("batch", "heavy") for index in range(4)}
+        futures.update({f"light{index}": queue.push("batch", "light") for index in range(2)})
+        assert served_order(queue, futures) == ["heavy0", "heavy1", "light0", "heavy2", "heavy3", "light1"]
+
+    asyncio.run(scenario())
+
+
+def test_fair_queue_skips_discarded_waiters_and_rejects_when_full():
+    async def scenario():
+        queue = FairQueue({"interactive": 2}, {})
+        first = queue.push("interactive", "a")
+        second = queue.push("interactive", "a")
+        with pytest.raises(QueueFull):
+            queue.push("interactive", "a")
+
+        queue.discard(first)
+        assert queue.queued["interactive"] == 1
+        assert queue.pop() is second
+        assert queue.pop() is None
+        with pytest.raises(ValueError):
+            queue.push("urgent", "a")
+
+    asyncio.run(scenario())
+
+
+def test_limiter_lets_interactive_kickoffs_ahead_of_a_batch_backlog():
+    async def scenario():
+        limiter = make_limiter(concurrency=1)
+        await limiter.acquire()
+        batch = [asyncio.create_task(limiter.acquire("batch", "hackathon")) for _ in range(3)]
+        await settle()
+        interactive = asyncio.create_task(limiter.acquire("interactive", "hackathon"))
+        await settle()
+
+        await limiter.release("success")
+        await settle()
+        assert interactive.done()
+        assert not any(task.done() for task in batch)
+        assert limiter.stats()["queued"]["batch"] == 3
+        for task in batch:
+            task.cancel()
+
+    asyncio.run(scenario())
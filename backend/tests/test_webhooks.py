@@ -0,0 +1,73 @@
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+
+from logs import AccessLogRedactionFilter
+
+
+@pytest.fixture
+def client(main):
+    # No context manager: the lifespan (recovery, legacy JSON migration) stays off
+    return TestClient(main.app)
+
+
+def post_webhook(client, nonce: str, sig: str, kickoff_id: str = "k1", state: str = "SUCCESS"):
+    return client.post(f"/api/webhooks/crew/{nonce}", params={"sig": sig}, json={"kickoff_id": kickoff_id, "state": state, "result": '{"ok": true}'})
+
+
+def test_callback_url_carries_the_nonce_signature(main):
+    url = main.crew_webhook_url("abc")
+    assert url == f"https://backend.example/api/webhooks/crew/abc?sig={main.sign_webhook_nonce('abc')}"
+    assert main.sign_webhook_nonce("abc") != main.sign_webhook_nonce("abd")
+
+
+@pytest.mark.parametrize("sig", ["", "0" * 64])
+def test_unsigned_or_forged_webhooks_are_rejected(main, client, sig):
+    main.kickoff_store.upsert("forged", {"status": "PENDING", "webhook_nonce": "n-forged"})
+
+    response = post_webhook(client, "n-forged", sig, kickoff_id="forged")
+
+    assert response.status_code == 403
+    assert main.kickoff_store.get("forged")["status"] == "PENDING"
+
+
+def test_signed_webhook_settles_the_stored_kickoff(main, client):
+    main.kickoff_store.upsert("k1", {"status": "PENDING", "webhook_nonce": "n1"})
+
+    response = post_webhook(client, "n1", main.sign_webhook_nonce("n1"))
+
+    assert response.status_code == 200
+    record = main.kickoff_store.get("k1")
+    assert record["status"] == "SUCCESS"
+    assert record["result"] == {"ok": True}
+
+
+def test_signature_for_another_kickoffs_nonce_is_rejected(main, client):
+    main.kickoff_store.upsert("k2", {"status": "PENDING", "webhook_nonce": "n2"})
+
+    # A valid signature, but for a nonce that belongs to a different kickoff
+    response = post_webhook(client, "other", main.sign_webhook_nonce("other"), kickoff_id="k2")
+
+    assert response.status_code == 403
+    assert main.kickoff_store.get("k2")["status"] == "PENDING"
+
+
+def test_early_webhook_is_held_until_stored_and_then_discarded(main, client):
+    response = post_webhook(client, "n3", main.sign_webhook_nonce("n3"), kickoff_id="k3")
+    assert response.status_code == 200
+    assert "k3" in main.kickoff_poller._early_deliveries
+
+    # A retry after the record exists settles it directly; the held copy must not apply again
+    main.kickoff_store.upsert("k3", {"status": "PENDING", "webhook_nonce": "n3"})
+    post_webhook(client, "n3", main.sign_webhook_nonce("n3"), kickoff_id="k3")
+    assert main.kickoff_store.get("k3")["status"] == "SUCCESS"
+    assert "k3" not in main.kickoff_poller._early_deliveries
+
+
+def test_access_log_masks_the_signature():
+    record = logging.LogRecord("uvicorn.access", logging.INFO, "", 0, '%s - "%s %s HTTP/%s" %d', ("127.0.0.1:5000", "POST", "/api/webhooks/crew/n1?sig=abc123", "1.1", 200), None)
+
+    assert AccessLogRedactionFilter().filter(record)
+    assert "abc123" not in record.getMessage()
+    assert "sig=[REDACTED]" in record.getMessage()
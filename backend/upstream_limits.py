@@ -0,0 +1,337 @@
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+from logs import get_logger
+from metrics import BREAKER_TRIPS, SCHEDULER_QUEUE_WAIT, SCHEDULER_REJECTIONS
+
+log = get_logger("limits")
+
+# Limiter settings shared by every upstream crew
+UPSTREAM_MIN_CONCURRENCY = int(os.getenv("UPSTREAM_MIN_CONCURRENCY", 1))
+UPSTREAM_INITIAL_CONCURRENCY = int(os.getenv("UPSTREAM_INITIAL_CONCURRENCY", 8))
+UPSTREAM_MAX_CONCURRENCY = int(os.getenv("UPSTREAM_MAX_CONCURRENCY", 32))
+UPSTREAM_KICKOFF_RATE = float(os.getenv("UPSTREAM_KICKOFF_RATE", 2))
+UPSTREAM_KICKOFF_BURST = float(os.getenv("UPSTREAM_KICKOFF_BURST", 10))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", 5))
+BREAKER_OPEN_SECONDS = float(os.getenv("BREAKER_OPEN_SECONDS", 30))
+BREAKER_MAX_OPEN_SECONDS = float(os.getenv("BREAKER_MAX_OPEN_SECONDS", 300))
+UPSTREAM_ACQUIRE_TIMEOUT = float(os.getenv("UPSTREAM_ACQUIRE_TIMEOUT", 600))
+
+# Kickoff priority classes, most urgent first
+PRIORITY_CLASSES = ("interactive", "batch", "background")
+
+
+def _parse_mapping(value: str) -> Dict[str, float]:
+    """Parse "a=1,b=2" into {"a": 1.0, "b": 2.0}"""
+    mapping = {}
+    for item in value.split(","):
+        if item.strip():
+            name, _, number = item.partition("=")
+            mapping[name.strip()] = float(number)
+    return mapping
+
+
+# Most kickoffs allowed to wait per upstream and class before new ones are rejected
+SCHEDULER_MAX_QUEUED = {
+    "interactive": 200,
+    "batch": 20000,
+    "background": 5000,
+    **{name: int(limit) for name, limit in _parse_mapping(os.getenv("SCHEDULER_MAX_QUEUED", "")).items()},
+}
+# Fair-share weights of tenants (hackathons); unlisted tenants weigh 1
+SCHEDULER_TENANT_WEIGHTS = _parse_mapping(os.getenv("SCHEDULER_TENANT_WEIGHTS", ""))
+
+
+class UpstreamUnavailable(Exception):
+    """Raised when an upstream stays overloaded past the acquire timeout"""
+
+
+class QueueFull(UpstreamUnavailable):
+    """Raised when too many kickoffs of one priority class are already waiting"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second, up to ``burst``"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+
+    def try_take(self) -> float:
+        """Take a token if one is available (returns 0), else return the seconds until one is"""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class CircuitBreaker:
+    """Shared closed / open / half-open breaker for one upstream.
+
+    Opens after ``failure_threshold`` consecutive overload responses. While
+    open every caller waits; after the open window a single probe is let
+    through (half-open) and its outcome closes or re-opens the breaker,
+    doubling the open window each time up to ``max_open_seconds``.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, open_seconds: float, max_open_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.open_seconds = open_seconds
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.trips = 0
+
+    def retry_after(self) -> Optional[float]:
+        """Seconds a caller must wait, or None if it may proceed now"""
+        if self.state == "closed":
+            return None
+        if self.state == "open":
+            remaining = self.opened_at + self.open_seconds - time.monotonic()
+            if remaining > 0:
+                return remaining
+            self.state = "half_open"
+        if self.probe_in_flight:
+            return 1.0
+        self.probe_in_flight = True
+        return None
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self.probe_in_flight = False
+        if self.state != "closed":
+            log.info("Upstream recovered, closing circuit", extra={"api_type": self.name})
+        self.state = "closed"
+        self.open_seconds = self.base_open_seconds
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == "half_open":
+            self.probe_in_flight = False
+            self.open_seconds = min(self.open_seconds * 2, self.max_open_seconds)
+            self._open()
+        elif self.state == "closed" and self.consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        self.trips += 1
+        BREAKER_TRIPS.labels(self.name).inc()
+        log.warning("Circuit open", extra={"api_type": self.name, "open_seconds": self.open_seconds, "overload_errors": self.consecutive_failures})
+
+
+class AdaptiveConcurrency:
+    """AIMD concurrency limit: +1 per window of successes, halved on overload"""
+
+    def __init__(self, initial: int, minimum: int, maximum: int):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self.last_decrease = 0.0
+
+    def has_capacity(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+    def release(self, overloaded: bool):
+        self.in_flight -= 1
+        if overloaded:
+            # Concurrent failures from one overload episode only halve once
+            now = time.monotonic()
+            if now - self.last_decrease > 1.0:
+                self.limit = max(self.minimum, self.limit / 2)
+                self.last_decrease = now
+        else:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+
+class FairQueue:
+    """Kickoffs waiting for one upstream, by priority class and tenant.
+
+    Classes are served in strict priority order. Within a class, tenants
+    (hackathons) share the upstream by weighted fair queuing: a waiter's
+    virtual finish time is the later of the class clock and its tenant's
+    previous finish, plus 1/weight, and the smallest finish goes first.
+    A tenant with a thousand queued kickoffs and one with two take turns,
+    instead of the small one waiting behind the whole backlog.
+    """
+
+    def __init__(self, max_queued: Dict[str, int], weights: Dict[str, float]):
+        self.max_queued = max_queued
+        self.weights = weights
+        self._heaps: Dict[str, list] = {priority: [] for priority in PRIORITY_CLASSES}
+        self._clock = {priority: 0.0 for priority in PRIORITY_CLASSES}
+        self._last_finish: Dict[Tuple[str, str], float] = {}
+        self._sequence = itertools.count()
+        # Waiters still waiting, mapped to (priority, tenant); the heaps may hold abandoned ones
+        self._waiting: Dict[asyncio.Future, Tuple[str, str]] = {}
+        self.queued = {priority: 0 for priority in PRIORITY_CLASSES}
+
+    def __len__(self) -> int:
+        return len(self._waiting)
+
+    def push(self, priority: str, tenant: str) -> asyncio.Future:
+        """Queue a waiter; its future resolves when it may kick off"""
+        if priority not in self._heaps:
+            raise ValueError(f"Unknown priority class {priority}")
+        if self.queued[priority] >= self.max_queued.get(priority, math.inf):
+            raise QueueFull(f"Too many {priority} requests are waiting for this upstream", retry_after=self.queued[priority])
+        start = max(self._clock[priority], self._last_finish.get((priority, tenant), 0.0))
+        finish = start + 1.0 / self.weights.get(tenant, 1.0)
+        self._last_finish[(priority, tenant)] = finish
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heaps[priority], (finish, next(self._sequence), future))
+        self._waiting[future] = (priority, tenant)
+        self.queued[priority] += 1
+        return future
+
+    def discard(self, future: asyncio.Future):
+        """Forget a waiter that gave up"""
+        entry = self._waiting.pop(future, None)
+        if entry is not None:
+            self.queued[entry[0]] -= 1
+
+    def pop(self) -> Optional[asyncio.Future]:
+        """Remove and return the next waiter to serve"""
+        for priority, heap in self._heaps.items():
+            while heap:
+                finish, _, future = heapq.heappop(heap)
+                if future not in self._waiting:
+                    continue
+                self._clock[priority] = max(self._clock[priority], finish)
+                self.discard(future)
+                if len(self._last_finish) > 10000:
+                    # Tenants whose finish is in the past would start at the clock anyway
+                    self._last_finish = {key: value for key, value in self._last_finish.items() if value > self._clock[key[0]]}
+                return future
+        return None
+
+    def tenants(self) -> int:
+        return len({tenant for _, tenant in self._waiting.values()})
+
+
+class UpstreamLimiter:
+    """Process-wide admission control for kickoffs to one upstream crew.
+
+    Callers wait in a FairQueue; whenever a concurrency slot and a kickoff
+    token are both free, the next waiter by priority and fair share is
+    let through.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.concurrency = AdaptiveConcurrency(UPSTREAM_INITIAL_CONCURRENCY, UPSTREAM_MIN_CONCURRENCY, UPSTREAM_MAX_CONCURRENCY)
+        self.bucket = TokenBucket(UPSTREAM_KICKOFF_RATE, UPSTREAM_KICKOFF_BURST)
+        self.breaker = CircuitBreaker(name, BREAKER_FAILURE_THRESHOLD, BREAKER_OPEN_SECONDS, BREAKER_MAX_OPEN_SECONDS)
+        self.queue = FairQueue(SCHEDULER_MAX_QUEUED, SCHEDULER_TENANT_WEIGHTS)
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def _dispatch(self):
+        """Let waiters through while there is a free slot and a token"""
+        while len(self.queue) and self.concurrency.has_capacity():
+            wait = self.bucket.try_take()
+            if wait > 0:
+                if self._timer is None:
+                    self._timer = asyncio.get_running_loop().call_later(wait, self._on_timer)
+                return
+            self.concurrency.in_flight += 1
+            self.queue.pop().set_result(None)
+
+    def _on_timer(self):
+        self._timer = None
+        self._dispatch()
+
+    async def acquire(self, priority: str = "interactive", tenant: str = "default", timeout: float = UPSTREAM_ACQUIRE_TIMEOUT):
+        """Wait for the breaker, then for a turn to use a kickoff token and a concurrency slot"""
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = self.breaker.retry_after()
+            if wait is None:
+                break
+            if time.monotonic() + wait > deadline:
+                raise UpstreamUnavailable(f"{self.name} upstream is overloaded (circuit open)")
+            await asyncio.sleep(wait)
+
+        queued_at = time.monotonic()
+        try:
+            turn = self.queue.push(priority, tenant)
+        except QueueFull as e:
+            self.breaker.probe_in_flight = False
+            SCHEDULER_REJECTIONS.labels(self.name, priority).inc()
+            # Rough time for the queue ahead to drain at the kickoff rate
+            e.retry_after = max(1.0, e.retry_after / self.bucket.rate) if self.bucket.rate > 0 else 1.0
+            raise
+        self._dispatch()
+        try:
+            await asyncio.wait_for(turn, timeout=max(0.0, deadline - time.monotonic()))
+        except BaseException as e:
+            if turn.done() and not turn.cancelled():
+                # Let through just as we gave up: hand the slot on
+                self.concurrency.in_flight -= 1
+                self._dispatch()
+            else:
+                self.queue.discard(turn)
+            self.breaker.probe_in_flight = False
+            if isinstance(e, asyncio.TimeoutError):
+                raise UpstreamUnavailable(f"{self.name} upstream is saturated")
+            raise
+        SCHEDULER_QUEUE_WAIT.labels(self.name, priority).observe(time.monotonic() - queued_at)
+
+    async def release(self, outcome: str):
+        """Report how the call went: "success", "overload" or "error" """
+        overloaded = outcome == "overload"
+        if overloaded:
+            self.breaker.record_failure()
+        elif outcome == "success":
+            self.breaker.record_success()
+        else:
+            self.breaker.probe_in_flight = False
+        self.concurrency.release(overloaded)
+        self._dispatch()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "in_flight": self.concurrency.in_flight,
+            "kickoff_tokens": round(self.bucket.tokens, 2),
+            "breaker_state": self.breaker.state,
+            "breaker_trips": self.breaker.trips,
+            "queued": dict(self.queue.queued),
+            "queued_tenants": self.queue.tenants(),
+        }
+
+
+_limiters: Dict[str, UpstreamLimiter] = {}
+
+
+def get_limiter(api_type: str) -> UpstreamLimiter:
+    """Get the shared limiter for an upstream crew"""
+    limiter = _limiters.get(api_type)
+    if limiter is None:
+        limiter = _limiters[api_type] = UpstreamLimiter(api_type)
+    return limiter
+
+
+def limiter_stats() -> Dict[str, Dict[str, object]]:
+    return {name: limiter.stats() for name, limiter in _limiters.items()}
@@ -2,7 +2,12 @@ import React, { useState, useCallback } from "react";
 import { useNavigate } from "react-router-dom";
 import { useStore } from "../store/useStore";
 import { apiService } from "../services/api";
-import { HackathonReview, Submission } from "../types";
+import {
+  EligibilityResponse,
+  GradeResponse,
+  HackathonReview,
+  Submission,
+} from "../types";
 import FileUploader from "../components/FileUploader";
 import LoadingSpinner from "../components/LoadingSpinner";
 
@@ -227,14 +232,21 @@ const UploadPage: React.FC = () => {
         );
 
         try {
-          // Check eligibility
-          console.log(
-            `🔍 [${index + 1}] Checking eligibility for: ${submissionName}`
-          );
-          const eligibilityResponse = await apiService.checkEligibility(
+          // Check eligibility and grade together (grading runs speculatively)
+          console.log(`🔍 [${index + 1}] Evaluating: ${submissionName}`);
+          const evaluationResponse = await apiService.evaluateProject(
+            formData.rubric,
             formData.requirements,
+            schemaResponse.data,
             submission
           );
+          const eligibilityResponse: EligibilityResponse =
+            evaluationResponse.success && evaluationResponse.data
+              ? evaluationResponse.data.eligibility
+              : {
+                  success: false,
+                  error: evaluationResponse.error || "Evaluation failed",
+                };
 
           if (!eligibilityResponse.success || !eligibilityResponse.data) {
             console.error(
@@ -365,12 +377,9 @@ const UploadPage: React.FC = () => {
           );
 
           // Grade project
-          console.log(`📊 [${index + 1}] Grading project: ${submissionName}`);
-          const gradeResponse = await apiService.gradeProject(
-            formData.rubric,
-            schemaResponse.data,
-            submission
-          );
+          console.log(`📊 [${index + 1}] Grade for project: ${submissionName}`);
+          const gradeResponse: GradeResponse = evaluationResponse.data
+            ?.grade || { success: false, error: "Grading failed" };
 
           if (!gradeResponse.success || !gradeResponse.data) {
             console.error("Grading failed for submission:", submission);
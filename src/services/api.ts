@@ -55,6 +55,72 @@ class ApiService {
     }
   }
 
+  // Start a backend job and long-poll it until it finishes, so no single
+  // request has to stay open for the whole CrewAI run
+  private async runJob<T>(kind: string, data: any): Promise<ApiResponse<T>> {
+    const started = await this.makeRequest<{ job_id: string }>(
+      `/api/jobs/${kind}`,
+      data
+    );
+    if (!started.success || !started.data) {
+      return { success: false, error: started.error || "Failed to start job" };
+    }
+
+    const jobId = started.data.job_id;
+    console.log(`⏳ [ApiService] Waiting for ${kind} job ${jobId}`);
+    try {
+      while (true) {
+        const response = await fetch(
+          `${BACKEND_URL}/api/jobs/${jobId}?wait=30`
+        );
+        if (!response.ok) {
+          throw new Error(`Job status failed: ${response.status}`);
+        }
+        const job = await response.json();
+        if (!job.success) {
+          return { success: false, error: job.error };
+        }
+        if (job.data.status !== "RUNNING") {
+          console.log(`✅ [ApiService] Job ${jobId} finished:`, job.data.result);
+          return job.data.result;
+        }
+      }
+    } catch (error) {
+      console.error(`💥 [ApiService] Job error:`, error);
+      return {
+        success: false,
+        error: error instanceof Error ? error.message : "Unknown error",
+      };
+    }
+  }
+
+  // Ensure schema is JSON object
+  private toJsonRubric(schema: any): any {
+    let jsonRubric = schema;
+    if (typeof schema === "string") {
+      try {
+        jsonRubric = JSON.parse(schema);
+        console.log("🔧 [ApiService] Parsed schema string to JSON object");
+      } catch (e) {
+        console.error("❌ [ApiService] Failed to parse schema string:", e);
+        jsonRubric = {
+          type: "object",
+          properties: {
+            innovation: { type: "integer", minimum: 0, maximum: 25 },
+            technicalImplementation: {
+              type: "integer",
+              minimum: 0,
+              maximum: 30,
+            },
+            presentation: { type: "integer", minimum: 0, maximum: 20 },
+            impact: { type: "integer", minimum: 0, maximum: 25 },
+          },
+        };
+      }
+    }
+    return jsonRubric;
+  }
+
   // Generate schema
   async generateSchema(rubric: string): Promise<SchemaResponse> {
     console.log(
@@ -62,7 +128,7 @@ class ApiService {
       rubric.substring(0, 100) + "..."
     );
 
-    return await this.makeRequest("/api/schema", { hackathon_rubric: rubric });
+    return await this.runJob("schema", { hackathon_rubric: rubric });
   }
 
   // Check eligibility
@@ -81,7 +147,7 @@ class ApiService {
       hackathon_requirements: requirements,
     };
 
-    return await this.makeRequest("/api/eligibility", requestData);
+    return await this.runJob("eligibility", requestData);
   }
 
   // Grade project
@@ -95,29 +161,7 @@ class ApiService {
       submission.name || submission.project_name
     );
 
-    // Ensure schema is JSON object
-    let jsonRubric = schema;
-    if (typeof schema === "string") {
-      try {
-        jsonRubric = JSON.parse(schema);
-        console.log("🔧 [ApiService] Parsed schema string to JSON object");
-      } catch (e) {
-        console.error("❌ [ApiService] Failed to parse schema string:", e);
-        jsonRubric = {
-          type: "object",
-          properties: {
-            innovation: { type: "integer", minimum: 0, maximum: 25 },
-            technicalImplementation: {
-              type: "integer",
-              minimum: 0,
-              maximum: 30,
-            },
-            presentation: { type: "integer", minimum: 0, maximum: 20 },
-            impact: { type: "integer", minimum: 0, maximum: 25 },
-          },
-        };
-      }
-    }
+    const jsonRubric = this.toJsonRubric(schema);
 
     // Send required fields
     const requestData = {
@@ -133,7 +177,35 @@ class ApiService {
       generateArtifact: false,
     };
 
-    return await this.makeRequest("/api/grade", requestData);
+    return await this.runJob("grade", requestData);
+  }
+
+  // Check eligibility and grade in one call; the backend starts grading
+  // speculatively and discards the grade if the project is ineligible
+  async evaluateProject(
+    rubric: string,
+    requirements: string,
+    schema: any,
+    submission: any
+  ): Promise<
+    ApiResponse<{ eligibility: EligibilityResponse; grade: GradeResponse | null }>
+  > {
+    console.log(
+      "⚡ [ApiService] Evaluating project:",
+      submission.name || submission.project_name
+    );
+
+    return await this.runJob("evaluate", {
+      hackathon_rubric: rubric,
+      hackathon_requirements: requirements,
+      json_rubric: this.toJsonRubric(schema),
+      project_writeup: submission.description || "",
+      // Identifies the project on the backend leaderboard
+      submission_id: String(
+        submission.id || submission.project_name || submission.name || ""
+      ) || undefined,
+      project_name: submission.project_name || submission.name || "",
+    });
   }
 
   // Clear storage